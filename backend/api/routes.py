@@ -1,8 +1,16 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, Depends, Header, HTTPException, Request, Response
+from fastapi.responses import JSONResponse, StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
-from models.schemas import SearchRequest, SearchResponse, StatsResponse
+from models.schemas import Article, BatchSearchRequest, BatchSearchResponse, SearchRequest, SearchResponse, StatsResponse
 from services.search_service import SearchService
+from services.stats_service import StatsService
 from core.database import DatabaseManager
+from core.concurrency import iterate_io_bound, run_cpu_bound, run_io_bound
+from services.ranking import decode_cursor
+from core import config
+from typing import Optional
+import hmac
+import json
 import logging
 
 logger = logging.getLogger(__name__)
@@ -10,30 +18,118 @@ logger = logging.getLogger(__name__)
 router = APIRouter()
 search_service = SearchService()
 db_manager = DatabaseManager()
+stats_service = StatsService(db_manager)
+
+def require_admin(x_admin_token: Optional[str] = Header(None)):
+    """Guard admin endpoints with the ADMIN_TOKEN shared secret when one is configured."""
+    if config.ADMIN_TOKEN and not hmac.compare_digest(x_admin_token or "", config.ADMIN_TOKEN):
+        raise HTTPException(status_code=403, detail="Invalid admin token")
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Whether an If-None-Match header names this ETag (weak comparison)."""
+    if not if_none_match:
+        return False
+    tags = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in tags or etag in (tag[2:] if tag.startswith("W/") else tag for tag in tags)
+
+def cacheable_response(request: Request, payload: dict, etag: str) -> Response:
+    """JSON response that browsers may reuse for a while and then revalidate by ETag."""
+    headers = {"ETag": etag, "Cache-Control": f"public, max-age={config.STATS_MAX_AGE_SECONDS}"}
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+    return JSONResponse(payload, headers=headers)
+
+NDJSON = "application/x-ndjson"
+EVENT_STREAM = "text/event-stream"
+
+def stream_media_type(accept: Optional[str]) -> Optional[str]:
+    """The streaming format an Accept header asks for, or None for a plain JSON response."""
+    for media_type in (accept or "").split(","):
+        media_type = media_type.split(";")[0].strip()
+        if media_type in (NDJSON, EVENT_STREAM):
+            return media_type
+    return None
+
+def encode_event(media_type: str, event: str, data: str) -> str:
+    """One stream event carrying already serialized JSON: an NDJSON line or a server-sent event."""
+    if media_type == EVENT_STREAM:
+        return f"event: {event}\ndata: {data}\n\n"
+    return f'{{"event": "{event}", "data": {data}}}\n'
+
+async def stream_search_events(media_type: str, meta: dict, chunks):
+    """Stream a search as a meta event, one article event per result in rank order, and an end event.
+    
+    Articles are read from the database a chunk at a time on the database
+    executor; a failure after the first byte is reported as an error event.
+    """
+    yield encode_event(media_type, "meta", json.dumps(meta))
+    count = 0
+    try:
+        async for articles in iterate_io_bound(chunks):
+            yield "".join(encode_event(media_type, "article",
+                                       json.dumps(article) if isinstance(article, dict) else article.model_dump_json())
+                          for article in articles)
+            count += len(articles)
+    except Exception as e:
+        logger.error(f"Streaming search failed: {e}")
+        yield encode_event(media_type, "error", json.dumps({"detail": "An error occurred while searching articles"}))
+        return
+    yield encode_event(media_type, "end", json.dumps({"total_count": count}))
+
+def projected_response(result: dict) -> JSONResponse:
+    """A search result whose articles are projected dicts, serialized without building Article models."""
+    body = {name: field.default for name, field in SearchResponse.model_fields.items() if not field.is_required()}
+    body.update((key, value) for key, value in result.items() if key in SearchResponse.model_fields)
+    return JSONResponse(body)
 
 @router.get("/stats", response_model=StatsResponse)
-async def get_stats():
+async def get_stats(request: Request):
     """Get database statistics."""
     try:
-        stats = db_manager.get_stats()
-        return StatsResponse(**stats)
+        stats, etag = await run_io_bound(stats_service.get, "stats")
+        return cacheable_response(request, stats, etag)
     except Exception as e:
         logger.error(f"Failed to retrieve statistics: {e}")
         raise HTTPException(status_code=500, detail="Failed to retrieve statistics")
 
 @router.get("/years")
-async def get_years():
+async def get_years(request: Request):
     """Get available years."""
     try:
-        years = db_manager.get_years()
-        return {"years": years}
+        years, etag = await run_io_bound(stats_service.get, "years")
+        return cacheable_response(request, years, etag)
     except Exception as e:
         logger.error(f"Failed to retrieve years: {e}")
         raise HTTPException(status_code=500, detail="Failed to retrieve years")
 
+@router.get("/ready")
+async def get_ready():
+    """Readiness probe: 200 once semantic search is loaded, 503 while warming up."""
+    status = search_service.status()
+    return JSONResponse(status, status_code=200 if status["ready"] else 503)
+
+@router.get("/metrics")
+async def get_metrics():
+    """Get runtime performance metrics."""
+    return {
+        "startup": search_service.status(),
+        "db_pool": db_manager.pool.stats(),
+        "stats_cache": stats_service.stats(),
+        "encoder": search_service.encoder.stats() if search_service.encoder else None,
+        "index": search_service.index_info(),
+        "search_cache": search_service.cache_stats(),
+        "llm_cache": search_service.llm.cache.stats() if search_service.llm and search_service.llm.cache else None,
+    }
+
 @router.post("/search", response_model=SearchResponse)
-async def search_articles(request: SearchRequest):
-    """Search articles using manual or AI search."""
+async def search_articles(request: SearchRequest, accept: Optional[str] = Header(None)):
+    """Search articles using manual or AI search.
+    
+    With ``Accept: application/x-ndjson`` or ``text/event-stream`` the
+    results are streamed as they are read instead of sent as one document.
+    ``fields`` trims each article to the listed fields, such as a snippet
+    instead of the abstract; GET /articles/{id} returns the full record.
+    """
     try:
         filters = {
             "year_filter": request.year_filter,
@@ -49,12 +145,73 @@ async def search_articles(request: SearchRequest):
             # AI search will handle limit extraction from LLM response
             pass
         
+        try:
+            offset = decode_cursor(request.cursor) if request.cursor else request.offset
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid pagination cursor")
+        if offset < 0:
+            raise HTTPException(status_code=400, detail="Offset must not be negative")
+        
+        media_type = stream_media_type(accept)
+        if media_type:
+            llm_response = await search_service.interpret_query(request.query) if request.search_type == "ai" else None
+            meta, chunks = await run_cpu_bound(search_service.stream_search, request.search_type, request.query,
+                                               filters, limit, offset, llm_response, request.fields)
+            return StreamingResponse(stream_search_events(media_type, meta, chunks), media_type=media_type,
+                                     headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+        
         if request.search_type == "ai":
-            result = search_service.ai_search(request.query, filters, limit)
+            llm_response = await search_service.interpret_query(request.query)
+            result = await run_cpu_bound(search_service.ai_search, request.query, filters, limit, llm_response, offset,
+                                         request.fields)
         else:
-            result = search_service.manual_search(request.query, filters, limit)
+            result = await run_cpu_bound(search_service.manual_search, request.query, filters, limit, offset,
+                                         request.fields)
         
+        if request.fields:
+            return projected_response(result)
         return SearchResponse(**result)
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Search failed: {e}")
-        raise HTTPException(status_code=500, detail="An error occurred while searching articles")
\ No newline at end of file
+        raise HTTPException(status_code=500, detail="An error occurred while searching articles")
+
+@router.post("/search/batch", response_model=BatchSearchResponse)
+async def search_batch(request: BatchSearchRequest):
+    """Run many manual searches sharing the same filters in one round trip."""
+    if len(request.queries) > config.BATCH_SEARCH_MAX_QUERIES:
+        raise HTTPException(status_code=400,
+                            detail=f"At most {config.BATCH_SEARCH_MAX_QUERIES} queries per batch")
+    try:
+        filters = {
+            "year_filter": request.year_filter,
+            "category_filter": request.category_filter,
+            "author_filter": request.author_filter,
+            "title_filter": request.title_filter,
+            "abstract_filter": request.abstract_filter
+        }
+        results = await run_cpu_bound(search_service.batch_search, request.queries, filters, request.limit)
+        return BatchSearchResponse(results=[SearchResponse(**result) for result in results])
+    except Exception as e:
+        logger.error(f"Batch search failed: {e}")
+        raise HTTPException(status_code=500, detail="An error occurred while searching articles")
+
+@router.get("/articles/{article_id}", response_model=Article)
+async def get_article(article_id: int):
+    """Get the full record of one article, such as the abstract behind a search snippet."""
+    article = await run_io_bound(db_manager.get_article, article_id)
+    if article is None:
+        raise HTTPException(status_code=404, detail="Article not found")
+    return article
+
+@router.get("/admin/index", dependencies=[Depends(require_admin)])
+async def get_index_status():
+    """Inspect the loaded and published index versions and the last reload."""
+    return await run_io_bound(search_service.reload_status)
+
+@router.post("/admin/index/reload", status_code=202, dependencies=[Depends(require_admin)])
+async def reload_index(force: bool = False):
+    """Load the published index version in the background and swap it in when ready."""
+    started = search_service.request_reload(force=force)
+    return {"started": started, **await run_io_bound(search_service.reload_status)}
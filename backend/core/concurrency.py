@@ -0,0 +1,38 @@
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+
+from core import config
+
+# CPU-bound work (query encoding, FAISS search) gets its own bounded pool so it
+# cannot starve database calls, and neither runs on the event loop thread.
+cpu_executor = ThreadPoolExecutor(max_workers=config.SEARCH_WORKERS, thread_name_prefix="search")
+io_executor = ThreadPoolExecutor(max_workers=config.DB_WORKERS, thread_name_prefix="db")
+# Chunks of one large article fetch, submitted from work already running on the pools above,
+# so it needs its own workers to never wait on itself
+fetch_executor = ThreadPoolExecutor(max_workers=config.DB_FETCH_WORKERS, thread_name_prefix="db-fetch")
+
+async def run_cpu_bound(func, *args, **kwargs):
+    """Run encode/search work on the bounded search executor."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(cpu_executor, functools.partial(func, *args, **kwargs))
+
+async def run_io_bound(func, *args, **kwargs):
+    """Run blocking database access on the database executor."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(io_executor, functools.partial(func, *args, **kwargs))
+
+async def iterate_io_bound(iterator):
+    """Step a blocking iterator (such as a database cursor reader) on the database executor."""
+    done = object()
+    while True:
+        item = await run_io_bound(next, iterator, done)
+        if item is done:
+            return
+        yield item
+
+def shutdown():
+    """Stop the executors, letting queued work finish."""
+    cpu_executor.shutdown(wait=True)
+    io_executor.shutdown(wait=True)
+    fetch_executor.shutdown(wait=True)
@@ -0,0 +1,66 @@
+import os
+
+# Database
+DB_PATH = os.getenv("ARXIV_DB_PATH", "../data/database/arxiv_data.db")
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "8"))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+# Article fetches larger than this are split into chunks read in parallel on pooled connections
+DB_FETCH_CHUNK_SIZE = int(os.getenv("DB_FETCH_CHUNK_SIZE", "1000"))
+SQLITE_MMAP_SIZE = int(os.getenv("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024)))
+SQLITE_CACHE_SIZE_KB = int(os.getenv("SQLITE_CACHE_SIZE_KB", str(64 * 1024)))
+SQLITE_CACHED_STATEMENTS = int(os.getenv("SQLITE_CACHED_STATEMENTS", "256"))
+
+# Concurrency
+SEARCH_WORKERS = int(os.getenv("SEARCH_WORKERS", str(os.cpu_count() or 4)))
+DB_WORKERS = int(os.getenv("DB_WORKERS", str(DB_POOL_SIZE)))
+DB_FETCH_WORKERS = int(os.getenv("DB_FETCH_WORKERS", "4"))
+
+# Query encoder
+MODEL_NAME = os.getenv("MODEL_NAME", "all-MiniLM-L6-v2")
+ENCODER_MAX_BATCH_SIZE = int(os.getenv("ENCODER_MAX_BATCH_SIZE", "64"))
+ENCODER_MAX_WAIT_MS = float(os.getenv("ENCODER_MAX_WAIT_MS", "2"))
+# Inference backend: torch, torch-int8 (dynamic int8 quantization), onnx or onnx-int8
+ENCODER_BACKEND = os.getenv("ENCODER_BACKEND", "torch")
+ENCODER_ONNX_PATH = os.getenv("ENCODER_ONNX_PATH", "../data/models/all-MiniLM-L6-v2-onnx")
+ENCODER_THREADS = int(os.getenv("ENCODER_THREADS", "0"))  # 0 keeps the runtime's default
+
+# Search resources and caches
+# Load the index and encoder on a background thread so the API serves (keyword search) immediately
+SEARCH_BACKGROUND_LOAD = os.getenv("SEARCH_BACKGROUND_LOAD", "true").lower() == "true"
+INDEX_PATH = os.getenv("FAISS_INDEX_PATH", "../data/indexes/faiss_index.index")
+# Raw int64 row -> article id map; falls back to article_ids.csv when missing
+ARTICLE_IDS_PATH = os.getenv("ARTICLE_IDS_PATH", "../data/database/article_ids.npy")
+INDEX_MMAP = os.getenv("INDEX_MMAP", "true").lower() == "true"
+# Poll the index manifest and hot-reload new versions; 0 disables polling (reloads via the admin API only)
+INDEX_RELOAD_INTERVAL_SECONDS = float(os.getenv("INDEX_RELOAD_INTERVAL_SECONDS", "30"))
+# Loads always check the manifest's vector count and file sizes. SHA-256 checksums read the whole
+# index, so by default only hot reloads (off the request path) run them: true, reload or false
+INDEX_VERIFY_CHECKSUMS = os.getenv("INDEX_VERIFY_CHECKSUMS", "reload").lower()
+EMBEDDING_CACHE_MAX_ENTRIES = int(os.getenv("EMBEDDING_CACHE_MAX_ENTRIES", "20000"))
+RESULT_CACHE_MAX_ENTRIES = int(os.getenv("RESULT_CACHE_MAX_ENTRIES", "5000"))
+SEARCH_CACHE_TTL_SECONDS = float(os.getenv("SEARCH_CACHE_TTL_SECONDS", "3600"))
+# Query-time ANN knobs; 0 keeps the defaults stored in the index metadata
+FAISS_NPROBE = int(os.getenv("FAISS_NPROBE", "0"))
+FAISS_EF_SEARCH = int(os.getenv("FAISS_EF_SEARCH", "0"))
+FAISS_THREADS = int(os.getenv("FAISS_THREADS", "0"))  # OpenMP threads per process; 0 keeps one per core
+
+# POST /search/batch
+BATCH_SEARCH_MAX_QUERIES = int(os.getenv("BATCH_SEARCH_MAX_QUERIES", "500"))
+# Streamed search responses (Accept: application/x-ndjson or text/event-stream) read articles in chunks of this size
+STREAM_CHUNK_SIZE = int(os.getenv("STREAM_CHUNK_SIZE", "100"))
+# Characters of abstract around the matched terms in a search result's "snippet" field
+SNIPPET_LENGTH = int(os.getenv("SNIPPET_LENGTH", "300"))
+
+# Filtered vector search planner
+# Brute force copies every allowed vector per query (rows x dimension x 4 bytes), so it is capped by size:
+# 4 MiB is about 2,700 vectors at 384 dimensions
+PLANNER_BRUTE_FORCE_MAX_BYTES = int(os.getenv("PLANNER_BRUTE_FORCE_MAX_BYTES", str(4 * 1024 * 1024)))
+PLANNER_SELECTOR_MAX_SELECTIVITY = float(os.getenv("PLANNER_SELECTOR_MAX_SELECTIVITY", "0.3"))
+
+# /stats and /years: cached in process, revalidated against the ingestion's stats generation
+STATS_CHECK_INTERVAL_SECONDS = float(os.getenv("STATS_CHECK_INTERVAL_SECONDS", "5"))
+STATS_CACHE_TTL_SECONDS = float(os.getenv("STATS_CACHE_TTL_SECONDS", "300"))
+STATS_MAX_AGE_SECONDS = int(os.getenv("STATS_MAX_AGE_SECONDS", "60"))
+
+# Admin endpoints; when set, requests must send it in the X-Admin-Token header
+ADMIN_TOKEN = os.getenv("ADMIN_TOKEN")
@@ -1,78 +1,256 @@
 import sqlite3
-import pandas as pd
-from typing import List, Dict, Any
+import re
+from itertools import chain
+from typing import List, Dict, Any, Iterator, Optional, Sequence, Tuple
 import logging
 
+import numpy as np
+
+from core import config
+from core.concurrency import fetch_executor
+from core.pool import get_pool
+from models.schemas import Article
+
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Filter name -> column of the articles_fts full-text index
+FTS_FILTER_COLUMNS = {
+    'title_filter': 'title',
+    'abstract_filter': 'abstract',
+    'author_filter': 'authors',
+    'category_filter': 'categories',
+}
+
+def build_fts_keywords(columns: List[str], text: str) -> Optional[str]:
+    """Build an FTS5 query matching every token, in any order, within the given columns."""
+    tokens = re.findall(r'\w+', text or '')
+    if not tokens:
+        return None
+    terms = " AND ".join(f'"{token}"' for token in tokens)
+    return f'{{{" ".join(columns)}}} : ({terms} *)'
+
+def build_fts_phrase(column: str, text: str) -> Optional[str]:
+    """Build an FTS5 column phrase query with a prefix match on the last token."""
+    tokens = re.findall(r'\w+', text or '')
+    if not tokens:
+        return None
+    return f'{column} : "{" ".join(tokens)}" *'
+
+ARTICLE_COLUMNS = ('id', 'title', 'abstract', 'published', 'categories', 'authors')
+
+def article_row(cursor: sqlite3.Cursor, row: tuple) -> Article:
+    """Row factory building the Article response model from a row of ARTICLE_COLUMNS, without re-validating it."""
+    return Article.model_construct(**dict(zip(ARTICLE_COLUMNS, row)))
+
+def id_array(cursor: sqlite3.Cursor) -> np.ndarray:
+    """Read a single-column id result straight into an int64 array."""
+    return np.fromiter(chain.from_iterable(cursor), dtype=np.int64)
+
+def as_params(article_ids: Sequence[int]) -> List[int]:
+    """Plain ints for binding; sqlite3 cannot bind numpy integers."""
+    return article_ids.tolist() if isinstance(article_ids, np.ndarray) else [int(i) for i in article_ids]
+
+def json_id_list(article_ids: List[int]) -> str:
+    """Ids as one JSON array, bound to a single json_each(?) parameter."""
+    return f"[{','.join(map(str, article_ids))}]"
+
+def chunked(items: List[Any], size: int) -> List[List[Any]]:
+    return [items[start:start + size] for start in range(0, len(items), size)]
+
 class DatabaseManager:
-    def __init__(self, db_path: str = "../data/database/arxiv_data.db"):
+    def __init__(self, db_path: str = config.DB_PATH, use_fts: bool = True):
         self.db_path = db_path
+        self.use_fts = use_fts
+        self.pool = get_pool(db_path)
+        self._has_fts = None
+        self._has_normalized_schema = None
+        self._has_author_names = None
+        self._has_json_each = None
     
     def get_connection(self):
-        return sqlite3.connect(self.db_path)
+        """Check out a pooled read-only connection, returned to the pool on exit."""
+        return self.pool.connection()
     
-    def get_years(self) -> List[str]:
-        """Get all available years from the database."""
-        conn = None
+    def has_fts_index(self) -> bool:
+        """Check whether the articles_fts full-text index has been built."""
+        if self._has_fts is None:
+            try:
+                with self.get_connection() as conn:
+                    row = conn.execute(
+                        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'articles_fts'"
+                    ).fetchone()
+                self._has_fts = row is not None
+            except sqlite3.Error as e:
+                logger.warning(f"Could not check for full-text index: {e}")
+                return False
+        return self._has_fts
+    
+    @staticmethod
+    def _stats_generation(conn) -> Optional[str]:
         try:
-            conn = self.get_connection()
-            years_query = "SELECT DISTINCT strftime('%Y', published) as year FROM articles"
-            years = pd.read_sql(years_query, conn)['year'].dropna().astype(str).tolist()
-            return sorted(list(set(years)), reverse=True)
-        except Exception as e:
-            logger.error(f"Error getting years: {e}")
-            return []
-        finally:
-            if conn:
-                conn.close()
+            row = conn.execute("SELECT value FROM ingest_state WHERE key = 'stats_generation'").fetchone()
+        except sqlite3.OperationalError:
+            return None
+        return row[0] if row else None
+    
+    def get_stats_generation(self) -> Optional[str]:
+        """Generation of the summary tables, bumped by every ingestion; None when they were never built."""
+        with self.get_connection() as conn:
+            return self._stats_generation(conn)
+    
+    def get_years(self) -> List[str]:
+        """Get all available years from the database, newest first."""
+        with self.get_connection() as conn:
+            if self._stats_generation(conn) is not None:
+                rows = conn.execute("SELECT year FROM stats_by_year ORDER BY year DESC").fetchall()
+            else:
+                rows = conn.execute("""
+                    SELECT DISTINCT strftime('%Y', published) AS year FROM articles
+                    WHERE year IS NOT NULL ORDER BY year DESC
+                """).fetchall()
+        return [str(year) for (year,) in rows]
     
     def get_stats(self) -> Dict[str, Any]:
-        """Get database statistics."""
-        conn = None
-        try:
-            conn = self.get_connection()
-            
-            # Total papers
-            total_papers = pd.read_sql("SELECT COUNT(*) as count FROM articles", conn)['count'].iloc[0]
-            
-            # Year counts
-            year_counts = pd.read_sql("""
-                SELECT strftime('%Y', published) as year, COUNT(*) as count 
-                FROM articles 
-                GROUP BY year 
-                ORDER BY year DESC
-            """, conn)
-            
-            return {
-                "total_papers": total_papers,
-                "latest_year": year_counts['year'].max() if not year_counts.empty else "N/A",
-                "year_span": int(year_counts['year'].max()) - int(year_counts['year'].min()) + 1 if not year_counts.empty else 0,
-                "papers_by_year": dict(zip(year_counts['year'], year_counts['count']))
-            }
-        except Exception as e:
-            logger.error(f"Error getting stats: {e}")
-            return {"total_papers": 0, "latest_year": "N/A", "year_span": 0, "papers_by_year": {}}
-        finally:
-            if conn:
-                conn.close()
-    
-    def search_articles(self, filters: Dict[str, Any], article_ids: List[int] = None) -> pd.DataFrame:
-        """Search articles with filters."""
-        conn = None
-        try:
-            conn = self.get_connection()
-            
+        """Get database statistics from the summary tables written at ingestion.
+        
+        Databases ingested before the summary tables existed are aggregated on the fly.
+        """
+        with self.get_connection() as conn:
+            if self._stats_generation(conn) is not None:
+                totals = dict(conn.execute("SELECT key, value FROM stats_totals").fetchall())
+                year_counts = conn.execute("SELECT year, papers FROM stats_by_year ORDER BY year DESC").fetchall()
+                category_counts = conn.execute(
+                    "SELECT category, papers FROM stats_by_category ORDER BY papers DESC, category"
+                ).fetchall()
+                top_authors = conn.execute(
+                    "SELECT name, papers FROM stats_top_authors ORDER BY papers DESC, name"
+                ).fetchall()
+            else:
+                totals = {"total_papers": conn.execute("SELECT COUNT(*) FROM articles").fetchone()[0]}
+                year_counts = conn.execute("""
+                    SELECT strftime('%Y', published) AS year, COUNT(*) AS count
+                    FROM articles
+                    GROUP BY year HAVING year IS NOT NULL
+                    ORDER BY year DESC
+                """).fetchall()
+                category_counts, top_authors = [], []
+        
+        years = [int(year) for year, _ in year_counts]
+        return {
+            "total_papers": int(totals.get("total_papers", 0)),
+            "latest_year": str(max(years)) if years else "N/A",
+            "year_span": max(years) - min(years) + 1 if years else 0,
+            "papers_by_year": dict(year_counts),
+            "papers_by_category": dict(category_counts),
+            "top_authors": [{"name": name, "papers": papers} for name, papers in top_authors],
+        }
+    
+    def has_normalized_schema(self) -> bool:
+        """Check for the indexed year column and the article_categories table (clean_and_store.py --migrate)."""
+        if self._has_normalized_schema is None:
+            try:
+                with self.get_connection() as conn:
+                    columns = {row[1] for row in conn.execute("PRAGMA table_xinfo(articles)")}
+                    table = conn.execute(
+                        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'article_categories'"
+                    ).fetchone()
+                self._has_normalized_schema = 'year' in columns and table is not None
+            except sqlite3.Error as e:
+                logger.warning(f"Could not inspect the database schema: {e}")
+                return False
+        return self._has_normalized_schema
+    
+    def has_author_names(self) -> bool:
+        """Check for the denormalized articles.author_names column (clean_and_store.py --migrate)."""
+        if self._has_author_names is None:
+            try:
+                with self.get_connection() as conn:
+                    columns = {row[1] for row in conn.execute("PRAGMA table_xinfo(articles)")}
+                self._has_author_names = 'author_names' in columns
+            except sqlite3.Error as e:
+                logger.warning(f"Could not inspect the database schema: {e}")
+                return False
+        return self._has_author_names
+    
+    def has_json_each(self) -> bool:
+        """Check whether SQLite was built with json_each, which binds an id list as one parameter."""
+        if self._has_json_each is None:
+            try:
+                with self.get_connection() as conn:
+                    conn.execute("SELECT value FROM json_each('[1]')").fetchall()
+                self._has_json_each = True
+            except sqlite3.OperationalError:
+                self._has_json_each = False
+        return self._has_json_each
+    
+    def _inspect_schema(self):
+        """Run the cached schema checks, which check out their own connection, before taking one."""
+        self.has_fts_index()
+        self.has_normalized_schema()
+        self.has_author_names()
+        self.has_json_each()
+    
+    def _id_list(self, article_ids: List[int]) -> Tuple[str, List[Any]]:
+        """SQL list and parameters for ``a.id IN (...)``: one JSON parameter, or a placeholder per id."""
+        if self.has_json_each():
+            return "SELECT value FROM json_each(?)", [json_id_list(article_ids)]
+        return ','.join('?' for _ in article_ids), list(article_ids)
+    
+    @staticmethod
+    def category_codes(conn, text: str) -> List[str]:
+        """Category codes matching a category filter.
+        
+        Matches a code exactly or as an archive prefix ("cs" finds "cs.AI"),
+        or any part of a category name, all case-insensitively.
+        """
+        text = (text or '').strip()
+        rows = conn.execute(
+            "SELECT code FROM category_names WHERE code LIKE ? OR code LIKE ? OR name LIKE ?",
+            (text, f"{text}.%", f"%{text}%"),
+        ).fetchall()
+        return [code for (code,) in rows]
+    
+    def build_search_query(self, conn, filters: Dict[str, Any],
+                           article_ids: List[int] = None) -> Tuple[str, List[Any]]:
+        """SQL and parameters selecting the ids of articles that match the filters.
+        
+        Text filters are answered by the articles_fts index with BM25 ranking
+        when it exists, otherwise by LIKE scans over the base tables. On a
+        migrated schema, year and category filters are index lookups on the
+        year column and article_categories.
+        """
+        conditions = []
+        params = []
+        normalized = self.has_normalized_schema()
+        
+        match_terms = []
+        if self.use_fts and self.has_fts_index():
+            for key, column in FTS_FILTER_COLUMNS.items():
+                if key == 'category_filter' and normalized:
+                    continue
+                if filters.get(key):
+                    phrase = build_fts_phrase(column, filters[key])
+                    if phrase:
+                        match_terms.append(phrase)
+            if filters.get('keyword_filter'):
+                keywords = build_fts_keywords(['title', 'abstract'], filters['keyword_filter'])
+                if keywords:
+                    match_terms.append(keywords)
+        
+        if match_terms:
             sql_query = """
-                SELECT DISTINCT a.id
+                SELECT a.id
+                FROM articles_fts
+                JOIN articles a ON a.id = articles_fts.rowid
+            """
+            conditions.append("articles_fts MATCH ?")
+            params.append(" AND ".join(match_terms))
+        else:
+            sql_query = """
+                SELECT a.id
                 FROM articles a
-                LEFT JOIN article_authors aa ON a.id = aa.article_id
-                LEFT JOIN authors au ON aa.author_id = au.id
             """
-            conditions = []
-            params = []
-            
             if filters.get('title_filter'):
                 conditions.append("a.title LIKE ?")
                 params.append(f"%{filters['title_filter']}%")
@@ -80,67 +258,146 @@ class DatabaseManager:
                 conditions.append("a.abstract LIKE ?")
                 params.append(f"%{filters['abstract_filter']}%")
             if filters.get('author_filter'):
-                conditions.append("au.name LIKE ?")
+                conditions.append("""a.id IN (SELECT article_id FROM article_authors WHERE author_id IN
+                                               (SELECT id FROM authors WHERE name LIKE ?))""")
                 params.append(f"%{filters['author_filter']}%")
-            if filters.get('category_filter'):
+            if filters.get('category_filter') and not normalized:
                 conditions.append("a.categories LIKE ?")
                 params.append(f"%{filters['category_filter']}%")
-            if filters.get('year_filter') and filters['year_filter'] != 'All':
+            if filters.get('keyword_filter'):
+                conditions.append("(a.title LIKE ? OR a.abstract LIKE ?)")
+                params.extend([f"%{filters['keyword_filter']}%"] * 2)
+        
+        if filters.get('category_filter') and normalized:
+            codes = self.category_codes(conn, filters['category_filter'])
+            placeholders = ','.join('?' for _ in codes)
+            conditions.append(f"a.id IN (SELECT article_id FROM article_categories WHERE code IN ({placeholders}))")
+            params.extend(codes)
+        
+        year = filters.get('year_filter')
+        if year and year != 'All':
+            if normalized:
+                conditions.append("a.year = ?")
+                params.append(int(year) if str(year).isdigit() else None)
+            else:
                 conditions.append("strftime('%Y', a.published) = ?")
-                params.append(filters['year_filter'])
-            
-            if article_ids:
-                placeholders = ','.join('?' for _ in article_ids)
-                conditions.append(f"a.id IN ({placeholders})")
-                params.extend(article_ids)
-            
-            if conditions:
-                sql_query += " WHERE " + " AND ".join(conditions)
-            
-            filtered_df = pd.read_sql_query(sql_query, conn, params=params)
-            return filtered_df
+                params.append(year)
+        
+        if article_ids:
+            id_list, id_params = self._id_list(article_ids)
+            conditions.append(f"a.id IN ({id_list})")
+            params.extend(id_params)
+        
+        if conditions:
+            sql_query += " WHERE " + " AND ".join(conditions)
+        if match_terms:
+            sql_query += " ORDER BY bm25(articles_fts)"
+        return sql_query, params
+    
+    def explain_search(self, filters: Dict[str, Any]) -> List[str]:
+        """EXPLAIN QUERY PLAN details of the query search_articles runs for these filters."""
+        self._inspect_schema()
+        with self.get_connection() as conn:
+            sql_query, params = self.build_search_query(conn, filters)
+            return [row[3] for row in conn.execute(f"EXPLAIN QUERY PLAN {sql_query}", params)]
+    
+    def search_articles(self, filters: Dict[str, Any], article_ids: Sequence[int] = None) -> np.ndarray:
+        """Ids of the articles matching the filters (see build_search_query), in rank order when ranked."""
+        try:
+            self._inspect_schema()
+            if article_ids is not None:
+                article_ids = as_params(article_ids)
+            with self.get_connection() as conn:
+                sql_query, params = self.build_search_query(conn, filters, article_ids)
+                return id_array(conn.execute(sql_query, params))
             
         except Exception as e:
             logger.error(f"Error searching articles: {e}")
-            return pd.DataFrame()
-        finally:
-            if conn:
-                conn.close()
-    
-    def get_articles_by_ids(self, article_ids: List[int]) -> pd.DataFrame:
-        """Get full article details by IDs."""
-        if not article_ids:
+            return np.empty(0, dtype=np.int64)
+    
+    def _articles_query(self, article_ids: List[int],
+                        columns: Sequence[str] = ARTICLE_COLUMNS) -> Tuple[str, List[Any]]:
+        """Article ``columns`` with authors as one string, read from author_names when the schema has it."""
+        id_list, params = self._id_list(article_ids)
+        if self.has_author_names() or 'authors' not in columns:
+            select = ', '.join('a.author_names' if column == 'authors' else f'a.{column}' for column in columns)
+            return f"""
+                SELECT {select}
+                FROM articles a
+                WHERE a.id IN ({id_list})
+            """, params
+        select = ', '.join("GROUP_CONCAT(au.name, '; ')" if column == 'authors' else f'a.{column}'
+                           for column in columns)
+        return f"""
+            SELECT {select}
+            FROM articles a
+            LEFT JOIN article_authors aa ON a.id = aa.article_id
+            LEFT JOIN authors au ON aa.author_id = au.id
+            WHERE a.id IN ({id_list})
+            GROUP BY a.id
+        """, params
+    
+    def _fetch_articles(self, article_ids: List[int], columns: Optional[Sequence[str]] = None) -> List[Any]:
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            if columns is None:
+                cursor.row_factory = article_row
+                return cursor.execute(*self._articles_query(article_ids)).fetchall()
+            cursor.row_factory = lambda cursor, row: dict(zip(columns, row))
+            return cursor.execute(*self._articles_query(article_ids, columns)).fetchall()
+    
+    @staticmethod
+    def _in_order(article_ids: List[int], articles: List[Any], columns: Optional[Sequence[str]]) -> List[Any]:
+        """The articles in the order of ``article_ids``, skipping ids without an article."""
+        article_id_of = (lambda article: article.id) if columns is None else (lambda article: article['id'])
+        by_id = {article_id_of(article): article for article in articles}
+        return [by_id[article_id] for article_id in article_ids if article_id in by_id]
+    
+    def get_articles_by_ids(self, article_ids: Sequence[int],
+                            columns: Optional[Sequence[str]] = None) -> List[Any]:
+        """Get full article details by IDs, in the order of ``article_ids``; ids without an article are skipped.
+        
+        With ``columns`` (a subset of ARTICLE_COLUMNS including id) only those
+        are read, and each article is a plain dict instead of an Article.
+        Large id sets are split into DB_FETCH_CHUNK_SIZE chunks; the calling
+        thread reads the first while the rest are read in parallel on other
+        pooled connections.
+        """
+        if not len(article_ids):
             logger.warning("No article IDs provided")
-            return pd.DataFrame()
+            return []
             
-        conn = None
         try:
-            conn = self.get_connection()
-            
-            placeholders = ','.join('?' for _ in article_ids)
-            results_query = f"""
-                SELECT a.id, a.title, a.abstract, a.published, a.categories, 
-                       GROUP_CONCAT(au.name, '; ') as authors
-                FROM articles a
-                LEFT JOIN article_authors aa ON a.id = aa.article_id
-                LEFT JOIN authors au ON aa.author_id = au.id
-                WHERE a.id IN ({placeholders})
-                GROUP BY a.id, a.title, a.abstract, a.published, a.categories
-                ORDER BY a.published DESC
-            """
-            
-            results = pd.read_sql_query(results_query, conn, params=article_ids)
-            return results
+            self._inspect_schema()
+            article_ids = as_params(article_ids)
+            chunks = chunked(article_ids, config.DB_FETCH_CHUNK_SIZE)
+            pending = [fetch_executor.submit(self._fetch_articles, chunk, columns) for chunk in chunks[1:]]
+            articles = self._fetch_articles(chunks[0], columns)
+            for future in pending:
+                articles.extend(future.result())
+            return self._in_order(article_ids, articles, columns)
             
         except sqlite3.Error as e:
             logger.error(f"Database error getting articles by IDs: {e}")
-            return pd.DataFrame()
-        except pd.errors.DatabaseError as e:
-            logger.error(f"Pandas database error getting articles by IDs: {e}")
-            return pd.DataFrame()
+            return []
         except Exception as e:
             logger.error(f"Unexpected error getting articles by IDs: {e}")
-            return pd.DataFrame()
-        finally:
-            if conn:
-                conn.close()
\ No newline at end of file
+            return []
+    
+    def iter_articles_by_ids(self, article_ids: Sequence[int], chunk_size: int = config.STREAM_CHUNK_SIZE,
+                             columns: Optional[Sequence[str]] = None) -> Iterator[List[Any]]:
+        """Yield the articles in the order of ``article_ids``, ``chunk_size`` at a time.
+        
+        ``columns`` projects them as in get_articles_by_ids. Only one chunk of
+        rows is read into memory at once, and a pooled connection is held only
+        while a chunk is read, so a slow client never pins one. Ids without an
+        article are skipped; errors are raised.
+        """
+        self._inspect_schema()
+        for chunk in chunked(as_params(article_ids), chunk_size):
+            yield self._in_order(chunk, self._fetch_articles(chunk, columns), columns)
+    
+    def get_article(self, article_id: int) -> Optional[Article]:
+        """Full details of one article, or None when there is no article with that id."""
+        articles = self.get_articles_by_ids([article_id])
+        return articles[0] if articles else None
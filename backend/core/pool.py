@@ -0,0 +1,159 @@
+import sqlite3
+import threading
+import queue
+import time
+import logging
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Any
+
+from core import config
+
+logger = logging.getLogger(__name__)
+
+class PoolTimeoutError(sqlite3.OperationalError):
+    """Raised when no pooled connection became free within the timeout."""
+
+class ConnectionPool:
+    """Bounded pool of long-lived, read-only SQLite connections.
+
+    Connections are opened lazily in ``mode=ro`` URI form and handed to one
+    thread at a time. Idle connections are reused most-recently-used first so
+    their page cache and prepared statements stay warm.
+    """
+
+    def __init__(self, db_path: str, max_size: int = config.DB_POOL_SIZE,
+                 timeout: float = config.DB_POOL_TIMEOUT):
+        self.db_path = db_path
+        self.max_size = max(1, max_size)
+        self.timeout = timeout
+        self._idle = queue.LifoQueue()
+        self._lock = threading.Lock()
+        self._size = 0
+        self._hits = 0
+        self._misses = 0
+        self._waits = 0
+        self._wait_time = 0.0
+        self._max_wait_time = 0.0
+
+    def _connect(self) -> sqlite3.Connection:
+        uri = f"{Path(self.db_path).resolve().as_uri()}?mode=ro"
+        conn = sqlite3.connect(
+            uri,
+            uri=True,
+            check_same_thread=False,
+            cached_statements=config.SQLITE_CACHED_STATEMENTS,
+        )
+        # journal_mode=WAL is persistent and set by the ingestion scripts; it
+        # lets these readers run concurrently with a writer.
+        conn.execute(f"PRAGMA mmap_size = {config.SQLITE_MMAP_SIZE}")
+        conn.execute(f"PRAGMA cache_size = -{config.SQLITE_CACHE_SIZE_KB}")
+        conn.execute("PRAGMA query_only = ON")
+        conn.execute("PRAGMA temp_store = MEMORY")
+        return conn
+
+    def acquire(self) -> sqlite3.Connection:
+        """Check out a connection, opening one if the pool is not yet full."""
+        try:
+            conn = self._idle.get_nowait()
+            with self._lock:
+                self._hits += 1
+            return conn
+        except queue.Empty:
+            pass
+
+        with self._lock:
+            can_open = self._size < self.max_size
+            if can_open:
+                self._size += 1
+                self._misses += 1
+        if can_open:
+            try:
+                return self._connect()
+            except Exception:
+                with self._lock:
+                    self._size -= 1
+                raise
+
+        start = time.perf_counter()
+        try:
+            conn = self._idle.get(timeout=self.timeout)
+        except queue.Empty:
+            raise PoolTimeoutError(f"No database connection available after {self.timeout}s")
+        waited = time.perf_counter() - start
+        with self._lock:
+            self._waits += 1
+            self._wait_time += waited
+            self._max_wait_time = max(self._max_wait_time, waited)
+        return conn
+
+    def release(self, conn: sqlite3.Connection):
+        """Return a connection to the pool."""
+        if conn.in_transaction:
+            conn.rollback()
+        self._idle.put(conn)
+
+    def discard(self, conn: sqlite3.Connection):
+        """Close a broken connection instead of returning it to the pool."""
+        try:
+            conn.close()
+        except sqlite3.Error:
+            pass
+        with self._lock:
+            self._size -= 1
+
+    @contextmanager
+    def connection(self):
+        conn = self.acquire()
+        try:
+            yield conn
+        except sqlite3.DatabaseError as e:
+            # Operational errors (bad SQL, busy) leave the connection usable
+            if isinstance(e, sqlite3.OperationalError):
+                self.release(conn)
+            else:
+                self.discard(conn)
+            raise
+        except BaseException:
+            self.release(conn)
+            raise
+        else:
+            self.release(conn)
+
+    def close(self):
+        """Close all idle connections."""
+        while True:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            self.discard(conn)
+
+    def stats(self) -> Dict[str, Any]:
+        """Get pool hit/miss and wait-time metrics."""
+        with self._lock:
+            checkouts = self._hits + self._misses + self._waits
+            return {
+                "size": self._size,
+                "max_size": self.max_size,
+                "idle": self._idle.qsize(),
+                "checkouts": checkouts,
+                "hits": self._hits,
+                "misses": self._misses,
+                "waits": self._waits,
+                "hit_rate": (self._hits + self._waits) / checkouts if checkouts else 0.0,
+                "total_wait_ms": round(self._wait_time * 1000, 3),
+                "avg_wait_ms": round(self._wait_time * 1000 / self._waits, 3) if self._waits else 0.0,
+                "max_wait_ms": round(self._max_wait_time * 1000, 3),
+            }
+
+_pools: Dict[str, ConnectionPool] = {}
+_pools_lock = threading.Lock()
+
+def get_pool(db_path: str) -> ConnectionPool:
+    """Get the process-wide pool for a database file."""
+    key = str(Path(db_path).resolve())
+    with _pools_lock:
+        if key not in _pools:
+            _pools[key] = ConnectionPool(db_path)
+        return _pools[key]
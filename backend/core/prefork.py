@@ -0,0 +1,116 @@
+import gc
+import logging
+import os
+import signal
+import socket
+import sys
+import time
+from typing import Callable, Optional, Set
+
+import uvicorn
+
+logger = logging.getLogger(__name__)
+
+# uvicorn's exit code when the app's startup fails; restarting such a worker would fail again
+STARTUP_FAILURE = 3
+
+def bind_socket(host: str, port: int, backlog: int = 2048) -> socket.socket:
+    """Listening socket opened once by the parent and accepted on by every worker."""
+    family = socket.AF_INET6 if ":" in host else socket.AF_INET
+    sock = socket.socket(family, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(backlog)
+    sock.set_inheritable(True)
+    return sock
+
+class PreforkServer:
+    """Serve an ASGI app from N forked uvicorn worker processes sharing one listening socket.
+
+    ``preload`` runs in the parent before it forks, so what it loads (the
+    FAISS index, id map and model weights) exists once in memory and is
+    shared copy-on-write by all workers; the garbage collector is frozen so
+    it does not touch, and thereby copy, those objects in every worker.
+    Workers that die are restarted, unless the app failed to start in one;
+    SIGINT or SIGTERM stops them all.
+    Needs os.fork, so POSIX only.
+    """
+
+    def __init__(self, app, host: str, port: int, workers: int, log_level: str = "info",
+                 preload: Optional[Callable[[], None]] = None):
+        self.app = app
+        self.host = host
+        self.port = port
+        self.workers = max(1, workers)
+        self.log_level = log_level
+        self.preload = preload
+        self._pids: Set[int] = set()
+        self._stopping = False
+        self._failed = False
+
+    def run(self):
+        sock = bind_socket(self.host, self.port)
+        if self.preload is not None:
+            started = time.perf_counter()
+            try:
+                self.preload()
+                logger.info(f"Preloaded shared resources in {(time.perf_counter() - started) * 1000:.0f} ms")
+            except Exception as e:
+                # Workers load whatever is missing themselves, as a single process would
+                logger.error(f"Preloading failed, every worker loads its own resources: {e}")
+        gc.collect()
+        gc.freeze()
+
+        signal.signal(signal.SIGINT, self._stop)
+        signal.signal(signal.SIGTERM, self._stop)
+        logger.info(f"Serving on {self.host}:{self.port} with {self.workers} workers (parent pid {os.getpid()})")
+        for _ in range(self.workers):
+            self._spawn(sock)
+
+        while self._pids:
+            try:
+                pid, status = os.wait()
+            except ChildProcessError:
+                break
+            self._pids.discard(pid)
+            if os.WIFEXITED(status) and os.WEXITSTATUS(status) == STARTUP_FAILURE and not self._stopping:
+                logger.error(f"Worker {pid} failed to start the application, stopping")
+                self._failed = True
+                self._stop(signal.SIGTERM, None)
+            elif not self._stopping:
+                logger.warning(f"Worker {pid} exited with status {status}, starting a new one")
+                time.sleep(1)
+                self._spawn(sock)
+        sock.close()
+        if self._failed:
+            sys.exit(STARTUP_FAILURE)
+
+    def _spawn(self, sock: socket.socket):
+        pid = os.fork()
+        if pid:
+            self._pids.add(pid)
+            return
+        # Own process group, so a terminal's Ctrl-C reaches the parent only and each worker
+        # gets a single SIGTERM, which uvicorn handles as a graceful shutdown
+        os.setpgid(0, 0)
+        signal.signal(signal.SIGINT, signal.SIG_DFL)
+        signal.signal(signal.SIGTERM, signal.SIG_DFL)
+        code = 0
+        try:
+            server = uvicorn.Server(uvicorn.Config(self.app, log_level=self.log_level))
+            server.run(sockets=[sock])
+        except SystemExit as e:
+            code = e.code if isinstance(e.code, int) else 1
+        except BaseException:
+            logger.exception("Worker failed")
+            code = 1
+        finally:
+            os._exit(code)
+
+    def _stop(self, signum, frame):
+        self._stopping = True
+        for pid in list(self._pids):
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
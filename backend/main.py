@@ -1,6 +1,7 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from api.routes import router
+from api.routes import router, search_service
+from core import concurrency, config
 import os
 
 app = FastAPI(
@@ -21,6 +22,19 @@ app.add_middleware(
 # Include routes
 app.include_router(router, prefix="/api/v1")
 
+@app.on_event("startup")
+async def startup():
+    search_service.start(background=config.SEARCH_BACKGROUND_LOAD)
+
+@app.on_event("shutdown")
+async def shutdown():
+    search_service.stop()
+    if search_service.llm:
+        await search_service.llm.aclose()
+    if search_service.encoder:
+        search_service.encoder.close()
+    concurrency.shutdown()
+
 @app.get("/")
 async def root():
     return {"message": "ArXiv Research Hub API is running!"}
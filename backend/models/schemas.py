@@ -1,7 +1,10 @@
 from pydantic import BaseModel
-from typing import List, Optional
+from typing import List, Literal, Optional
 from datetime import datetime
 
+# Article fields a search can be projected onto; "snippet" is the part of the abstract around the query terms
+ArticleField = Literal["id", "title", "abstract", "published", "categories", "authors", "score", "snippet"]
+
 class SearchRequest(BaseModel):
     query: str
     year_filter: Optional[str] = None
@@ -11,6 +14,9 @@ class SearchRequest(BaseModel):
     abstract_filter: Optional[str] = None
     search_type: str = "manual"  # "manual" or "ai"
     limit: Optional[int] = None
+    offset: int = 0
+    cursor: Optional[str] = None  # next_cursor from a previous page; overrides offset
+    fields: Optional[List[ArticleField]] = None  # return only these article fields (and id); all when omitted
 
 class Article(BaseModel):
     id: int
@@ -19,15 +25,38 @@ class Article(BaseModel):
     published: str
     categories: str
     authors: Optional[str] = None
+    score: Optional[float] = None  # semantic similarity, when the query was ranked by embedding
 
 class SearchResponse(BaseModel):
     articles: List[Article]
     total_count: int
     search_type: str
     explanation: Optional[str] = None
+    # Size of the ranked list being paged. Filter and keyword listings hold every match, but a semantic
+    # ranking holds only the nearest k candidates (max(200, offset + limit); 150 for AI search), so this
+    # is not a count of all matching articles and next_cursor is None once the k-th candidate is reached
+    candidates: Optional[int] = None
+    offset: int = 0
+    next_cursor: Optional[str] = None
+    warming: bool = False  # semantic search still loading; results are keyword matches
+    degraded: bool = False  # semantic search failed to load; results are keyword matches
+
+class BatchSearchRequest(BaseModel):
+    queries: List[str]
+    year_filter: Optional[str] = None
+    category_filter: Optional[str] = None
+    author_filter: Optional[str] = None
+    title_filter: Optional[str] = None
+    abstract_filter: Optional[str] = None
+    limit: Optional[int] = None  # per query
+
+class BatchSearchResponse(BaseModel):
+    results: List[SearchResponse]  # in the order of the request's queries
 
 class StatsResponse(BaseModel):
     total_papers: int
     latest_year: str
     year_span: int
-    papers_by_year: dict
\ No newline at end of file
+    papers_by_year: dict
+    papers_by_category: dict = {}
+    top_authors: List[dict] = []
\ No newline at end of file
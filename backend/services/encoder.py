@@ -0,0 +1,138 @@
+import threading
+import queue
+import time
+import logging
+from concurrent.futures import Future
+from typing import List, Dict, Any
+
+import numpy as np
+
+from core import config
+
+logger = logging.getLogger(__name__)
+
+class _EncodeRequest:
+    __slots__ = ("texts", "future", "enqueued_at")
+
+    def __init__(self, texts: List[str]):
+        self.texts = texts
+        self.future = Future()
+        self.enqueued_at = time.perf_counter()
+
+class BatchingEncoder:
+    """Shared query encoder that micro-batches texts from concurrent requests.
+
+    Callers block in ``encode`` while a single worker thread drains the queue,
+    waiting at most ``max_wait_ms`` for more texts (up to ``max_batch_size``)
+    before running one ``model.encode`` call for the whole batch. The wait is
+    skipped when no other caller is in flight, so a lone request pays nothing.
+    """
+
+    def __init__(self, model, max_batch_size: int = config.ENCODER_MAX_BATCH_SIZE,
+                 max_wait_ms: float = config.ENCODER_MAX_WAIT_MS):
+        self.model = model
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait = max(0.0, max_wait_ms) / 1000
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._requests = 0
+        self._texts = 0
+        self._batches = 0
+        self._encode_time = 0.0
+        self._queue_time = 0.0
+        self._max_batch = 0
+        self._inflight = 0
+        self._closed = False
+        self._worker = threading.Thread(target=self._run, name="query-encoder", daemon=True)
+        self._worker.start()
+
+    def encode(self, texts: List[str]) -> np.ndarray:
+        """Encode texts into a float32 matrix, one row per text."""
+        if not texts:
+            raise ValueError("No texts to encode")
+        request = _EncodeRequest(list(texts))
+        # Checked and queued under the lock close() takes, so no request lands behind the stop marker
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("Encoder has been closed")
+            self._inflight += 1
+            self._queue.put(request)
+        try:
+            return request.future.result()
+        finally:
+            with self._lock:
+                self._inflight -= 1
+
+    def _collect(self, first: _EncodeRequest) -> List[_EncodeRequest]:
+        batch = [first]
+        size = len(first.texts)
+        deadline = time.perf_counter() + self.max_wait
+        while size < self.max_batch_size:
+            with self._lock:
+                others_waiting = self._inflight > len(batch)
+            remaining = deadline - time.perf_counter() if others_waiting else 0
+            try:
+                request = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if request is None:
+                self._queue.put(None)
+                break
+            batch.append(request)
+            size += len(request.texts)
+        return batch
+
+    def _run(self):
+        while True:
+            first = self._queue.get()
+            if first is None:
+                break
+            batch = self._collect(first)
+
+            # Identical texts (popular queries) are encoded once per batch
+            unique_texts = list(dict.fromkeys(text for request in batch for text in request.texts))
+            started = time.perf_counter()
+            try:
+                vectors = np.asarray(self.model.encode(unique_texts), dtype=np.float32)
+            except Exception as e:
+                logger.error(f"Batch encoding failed: {e}")
+                for request in batch:
+                    request.future.set_exception(e)
+                continue
+            finished = time.perf_counter()
+
+            rows = {text: i for i, text in enumerate(unique_texts)}
+            for request in batch:
+                request.future.set_result(vectors[[rows[text] for text in request.texts]])
+
+            with self._lock:
+                self._batches += 1
+                self._requests += len(batch)
+                self._texts += len(unique_texts)
+                self._encode_time += finished - started
+                self._queue_time += sum(started - request.enqueued_at for request in batch)
+                self._max_batch = max(self._max_batch, len(unique_texts))
+
+    def close(self):
+        """Stop the worker thread after pending requests are served; later calls to encode raise."""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._queue.put(None)
+        self._worker.join(timeout=5)
+
+    def stats(self) -> Dict[str, Any]:
+        """Get throughput and latency counters."""
+        with self._lock:
+            return {
+                "requests": self._requests,
+                "texts_encoded": self._texts,
+                "batches": self._batches,
+                "avg_batch_size": round(self._texts / self._batches, 2) if self._batches else 0.0,
+                "max_batch_size": self._max_batch,
+                "avg_encode_ms": round(self._encode_time * 1000 / self._batches, 3) if self._batches else 0.0,
+                "avg_queue_wait_ms": round(self._queue_time * 1000 / self._requests, 3) if self._requests else 0.0,
+                "texts_per_second": round(self._texts / self._encode_time, 1) if self._encode_time else 0.0,
+                "pending": self._queue.qsize(),
+            }
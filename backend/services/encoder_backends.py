@@ -0,0 +1,102 @@
+import json
+import os
+import logging
+from typing import List
+
+import numpy as np
+
+from core import config
+
+logger = logging.getLogger(__name__)
+
+ENCODER_BACKENDS = ("torch", "torch-int8", "onnx", "onnx-int8")
+
+# Exported encoders must embed queries this close (cosine similarity) to the PyTorch model the index
+# was built with, or their query vectors stop matching the indexed abstracts
+MIN_COSINE = 0.99
+DRIFT_QUERIES = [
+    'neural networks for image classification', 'quantum error correction', 'graph neural networks',
+    'dark matter detection', 'reinforcement learning robotics', 'protein structure prediction',
+    'stochastic volatility models', 'large language models reasoning', 'a', 'transformers',
+]
+
+
+class OnnxQueryModel:
+    """Sentence embedding model served by ONNX Runtime, without importing PyTorch.
+
+    Expects a directory written by ``data/scripts/export_query_encoder.py``:
+    the exported transformer (``model.onnx`` and optionally the int8
+    ``model_int8.onnx``), the fast tokenizer's ``tokenizer.json`` and an
+    ``encoder_config.json`` describing pooling and normalization.
+    """
+
+    def __init__(self, model_dir: str, quantized: bool = False, threads: int = 0):
+        import onnxruntime as ort
+        from tokenizers import Tokenizer
+
+        with open(os.path.join(model_dir, "encoder_config.json")) as f:
+            self.encoder_config = json.load(f)
+        model_file = os.path.join(model_dir, "model_int8.onnx" if quantized else "model.onnx")
+        if not os.path.exists(model_file):
+            raise FileNotFoundError(f"ONNX encoder not found at {model_file}")
+
+        self.tokenizer = Tokenizer.from_file(os.path.join(model_dir, "tokenizer.json"))
+        self.tokenizer.enable_truncation(max_length=self.encoder_config["max_seq_length"])
+        self.tokenizer.enable_padding(pad_id=self.encoder_config.get("pad_token_id", 0))
+
+        options = ort.SessionOptions()
+        if threads:
+            options.intra_op_num_threads = threads
+        self.session = ort.InferenceSession(model_file, options, providers=["CPUExecutionProvider"])
+        self._inputs = {i.name for i in self.session.get_inputs()}
+
+    def get_sentence_embedding_dimension(self) -> int:
+        return int(self.encoder_config["dimension"])
+
+    def encode(self, texts: List[str], **kwargs) -> np.ndarray:
+        """Mean-pooled (and, like the source model, optionally normalized) embeddings."""
+        encodings = self.tokenizer.encode_batch(list(texts))
+        feed = {
+            "input_ids": np.array([e.ids for e in encodings], dtype=np.int64),
+            "attention_mask": np.array([e.attention_mask for e in encodings], dtype=np.int64),
+            "token_type_ids": np.array([e.type_ids for e in encodings], dtype=np.int64),
+        }
+        hidden = self.session.run(None, {name: value for name, value in feed.items() if name in self._inputs})[0]
+        mask = feed["attention_mask"][:, :, None].astype(np.float32)
+        vectors = (hidden * mask).sum(axis=1) / np.clip(mask.sum(axis=1), 1e-9, None)
+        if self.encoder_config.get("normalize", False) or kwargs.get("normalize_embeddings"):
+            vectors /= np.clip(np.linalg.norm(vectors, axis=1, keepdims=True), 1e-12, None)
+        return vectors.astype(np.float32)
+
+def load_query_model(backend: str = config.ENCODER_BACKEND, model_name: str = config.MODEL_NAME,
+                     onnx_path: str = config.ENCODER_ONNX_PATH, threads: int = config.ENCODER_THREADS):
+    """Load the query encoder for the configured inference backend.
+
+    ``torch`` is the full SentenceTransformer, ``torch-int8`` the same model
+    with dynamically int8-quantized Linear layers, and ``onnx``/``onnx-int8``
+    an exported model run by ONNX Runtime, which skips importing PyTorch.
+    """
+    if backend not in ENCODER_BACKENDS:
+        raise ValueError(f"Unknown encoder backend '{backend}', expected one of {ENCODER_BACKENDS}")
+    if backend.startswith("onnx"):
+        return OnnxQueryModel(onnx_path, quantized=backend == "onnx-int8", threads=threads)
+
+    from sentence_transformers import SentenceTransformer
+
+    if threads:
+        import torch
+        torch.set_num_threads(threads)
+    model = SentenceTransformer(model_name)
+    if backend == "torch-int8":
+        import torch
+        model = torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+    return model
+
+
+def min_cosine_similarity(reference: np.ndarray, vectors: np.ndarray) -> float:
+    """Smallest cosine similarity between matching rows of two embedding matrices."""
+    reference = np.asarray(reference, dtype=np.float32)
+    vectors = np.asarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(reference, axis=1) * np.linalg.norm(vectors, axis=1)
+    return float(((reference * vectors).sum(axis=1) / np.clip(norms, 1e-12, None)).min())
+
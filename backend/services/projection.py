@@ -0,0 +1,51 @@
+import re
+from typing import Any, Dict, List, Optional, Pattern, Sequence
+
+from core import config
+from core.database import ARTICLE_COLUMNS
+
+def projected_columns(fields: Sequence[str]) -> List[str]:
+    """Database columns needed to build the requested fields; the id is always included."""
+    wanted = set(fields) | {'id'}
+    if 'snippet' in wanted:
+        wanted.add('abstract')
+    return [column for column in ARTICLE_COLUMNS if column in wanted]
+
+def snippet_pattern(*texts: Optional[str]) -> Optional[Pattern]:
+    """Regex matching the start of any word of the texts three letters or longer, case-insensitively."""
+    terms = dict.fromkeys(word for text in texts for word in re.findall(r'\w{3,}', (text or '').lower()))
+    if not terms:
+        return None
+    return re.compile(r'\b(?:' + '|'.join(map(re.escape, terms)) + ')', re.IGNORECASE)
+
+def make_snippet(text: str, pattern: Optional[Pattern], length: int = config.SNIPPET_LENGTH) -> str:
+    """About ``length`` characters of ``text`` around the first matched term, cut at word boundaries.
+    
+    Without a match the snippet is the start of the text. Ellipses mark cut ends.
+    """
+    text = text or ''
+    if len(text) <= length:
+        return ' '.join(text.split())
+    match = pattern.search(text) if pattern else None
+    # Leave a little context before the match, but do not run past the end of the text
+    start = min(max(0, match.start() - length // 4), len(text) - length) if match else 0
+    if start:
+        start = text.find(' ', start) + 1 or start
+    end = start + length
+    if end < len(text):
+        end = text.rfind(' ', start, end) if ' ' in text[start:end] else end
+    # Collapse line breaks in the window only; abstracts are much longer than snippets
+    return ('…' if start else '') + ' '.join(text[start:end].split()) + ('…' if end < len(text) else '')
+
+def project(row: Dict[str, Any], fields: Sequence[str], score: Optional[float],
+            pattern: Optional[Pattern]) -> Dict[str, Any]:
+    """Build a projected article from a row of ``projected_columns(fields)``: the id, then the fields in order."""
+    article = {'id': row['id']}
+    for field in fields:
+        if field == 'score':
+            article['score'] = score
+        elif field == 'snippet':
+            article['snippet'] = make_snippet(row['abstract'], pattern)
+        elif field != 'id':
+            article[field] = row[field]
+    return article
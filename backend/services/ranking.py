@@ -0,0 +1,50 @@
+import base64
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+def merge_ranked(results: List[Tuple[np.ndarray, np.ndarray]]) -> Tuple[np.ndarray, np.ndarray]:
+    """Union several (scores, ids) result lists, keeping each id's best score, best first."""
+    if not results:
+        return np.empty(0, dtype=np.float32), np.empty(0, dtype=np.int64)
+    scores = np.concatenate([scores for scores, _ in results])
+    ids = np.concatenate([ids for _, ids in results])
+    order = np.argsort(-scores, kind='stable')
+    scores, ids = scores[order], ids[order]
+    _, first = np.unique(ids, return_index=True)
+    keep = np.sort(first)
+    return scores[keep], ids[keep]
+
+def top_k(scores: np.ndarray, ids: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+    """The k best (scores, ids), best first; argpartition avoids sorting the whole list."""
+    if k < len(scores):
+        best = np.argpartition(-scores, k - 1)[:k]
+    else:
+        best = np.arange(len(scores))
+    best = best[np.argsort(-scores[best], kind='stable')]
+    return scores[best], ids[best]
+
+def paginate(ids: np.ndarray, scores: Optional[np.ndarray], limit: Optional[int],
+             offset: int = 0) -> Tuple[np.ndarray, Optional[np.ndarray]]:
+    """Select one page of a result list, ranking by score when scores are available."""
+    end = offset + limit if limit and limit > 0 else len(ids)
+    if scores is not None:
+        scores, ids = top_k(scores, ids, end)
+        return ids[offset:end], scores[offset:end]
+    return ids[offset:end], None
+
+def encode_cursor(offset: int) -> str:
+    """Opaque pagination cursor pointing at the given result offset."""
+    return base64.urlsafe_b64encode(f"offset:{offset}".encode()).decode().rstrip("=")
+
+def decode_cursor(cursor: str) -> int:
+    """Read the offset back from a cursor; raises ValueError for malformed cursors."""
+    try:
+        text = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        prefix, value = text.split(":", 1)
+        offset = int(value)
+    except (ValueError, UnicodeDecodeError) as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
+    if prefix != "offset" or offset < 0:
+        raise ValueError(f"Invalid cursor: {cursor}")
+    return offset
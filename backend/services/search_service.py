@@ -1,12 +1,11 @@
-import pandas as pd
 import numpy as np
-from sentence_transformers import SentenceTransformer
-import faiss
 import logging
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Iterator, Optional, Tuple
 import sys
 import os
 import re
+import threading
+import time
 
 # Add data/scripts directory to path to import connect_llm
 scripts_path = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), 'data', 'scripts')
@@ -16,7 +15,13 @@ try:
 except ImportError:
     LLMConnect = None
 
+from core import config
 from core.database import DatabaseManager
+from services.encoder import BatchingEncoder
+from services.encoder_backends import load_query_model
+from services.cache import TTLCache, normalize_query
+from services.ranking import merge_ranked, paginate, encode_cursor
+from services.projection import project, projected_columns, snippet_pattern
 
 logger = logging.getLogger(__name__)
 
@@ -24,31 +29,243 @@ class SearchService:
     def __init__(self):
         self.db_manager = DatabaseManager()
         self.model = None
-        self.index = None
-        self.article_ids = None
+        self.encoder = None
+        self.vector_index = None
         self.llm = None
-        self._load_resources()
+        # Embeddings depend only on the model; top-k results also depend on the index
+        self.embedding_cache = TTLCache(config.EMBEDDING_CACHE_MAX_ENTRIES, config.SEARCH_CACHE_TTL_SECONDS)
+        self.result_cache = TTLCache(config.RESULT_CACHE_MAX_ENTRIES, config.SEARCH_CACHE_TTL_SECONDS)
+        self.load_error = None
+        self.load_timings = {}
+        self._ready = threading.Event()
+        self._loader = None
+        # Index hot reload: one reload at a time, polled by a watcher thread
+        self._reload_lock = threading.Lock()
+        self._reload_thread_lock = threading.Lock()
+        self._reload_thread = None
+        self._watcher = None
+        self._stopping = threading.Event()
+        self.reload_state = {
+            "state": "idle",
+            "reloads": 0,
+            "last_reload_at": None,
+            "last_reload_ms": None,
+            "last_checked_at": None,
+            "failed_version": None,
+            "error": None,
+        }
+    
+    def start(self, background: bool = True):
+        """Load search resources, by default on a background thread so the API serves immediately.
+        
+        Until loading finishes, queries are answered with full-text keyword
+        matches and responses are flagged as ``warming``; if loading fails
+        they keep being answered that way, flagged as ``degraded``.
+        """
+        if self._loader is not None or self._ready.is_set():
+            return
+        if config.INDEX_RELOAD_INTERVAL_SECONDS > 0 and self._watcher is None:
+            self._watcher = threading.Thread(target=self._watch_index, name="index-watcher", daemon=True)
+            self._watcher.start()
+        if not background:
+            self._load_resources()
+            return
+        self._loader = threading.Thread(target=self._load_in_background, name="search-warmup", daemon=True)
+        self._loader.start()
+    
+    def preload(self):
+        """Load the index and query model weights without starting anything, before forking workers.
+        
+        Called by the multi-process server (core/prefork.py) in its parent
+        process. Threads and inference runtimes do not survive fork, so the
+        model is loaded but never run here and no thread is started; each
+        worker's start() wraps the inherited model and warms it up. ONNX
+        Runtime sessions are not fork-safe, so those backends load per worker.
+        """
+        started = time.perf_counter()
+        self._load_index()
+        # Build the sorted id lookup of filtered search once, in shared memory
+        self.vector_index.rows_for_ids(np.empty(0, dtype=np.int64))
+        if not config.ENCODER_BACKEND.startswith("onnx"):
+            self.model = load_query_model()
+        self.load_timings["preload"] = round((time.perf_counter() - started) * 1000, 1)
+    
+    def stop(self):
+        """Stop watching for new index versions."""
+        self._stopping.set()
+    
+    def _load_in_background(self):
+        try:
+            self._load_resources()
+        except Exception:
+            # Already logged; the service keeps serving keyword search
+            pass
+    
+    @property
+    def ready(self) -> bool:
+        return self._ready.is_set()
+    
+    def wait_until_ready(self, timeout: Optional[float] = None) -> bool:
+        return self._ready.wait(timeout)
+    
+    def _semantic_ready(self) -> bool:
+        return self.encoder is not None and self.vector_index is not None
+    
+    def _fallback_flags(self, query: str, use_semantic: bool) -> Dict[str, bool]:
+        """Response flags of a query answered by keyword match because semantic search is not loaded.
+        
+        ``warming`` while the resources are still loading, ``degraded`` once
+        loading has failed and keyword matches are all this process will serve.
+        """
+        fallback = bool(query) and not use_semantic and not self.ready
+        failed = fallback and self.load_error is not None
+        return {"warming": fallback and not failed, "degraded": failed}
+    
+    def status(self) -> Dict[str, Any]:
+        """Readiness of each search resource and how long it took to load."""
+        if self.ready:
+            state = "ready"
+        elif self.load_error:
+            state = "failed"
+        else:
+            state = "warming"
+        return {
+            "state": state,
+            "ready": self.ready,
+            "semantic_search": self._semantic_ready(),
+            "llm": self.llm is not None,
+            "load_ms": dict(self.load_timings),
+            "error": self.load_error,
+        }
+    
+    def _read_index(self, reload: bool = False):
+        """Load the FAISS index and its article id map, verified against the version manifest.
+        
+        Checksums are verified on every load with INDEX_VERIFY_CHECKSUMS=true,
+        and by default (``reload``) only when hot-reloading a new version.
+        """
+        # Imported here so faiss is only loaded once the index is needed
+        from services.vector_index import VectorIndex, set_search_threads
+        set_search_threads(config.FAISS_THREADS)
+        checksums = config.INDEX_VERIFY_CHECKSUMS == "true" or (reload and config.INDEX_VERIFY_CHECKSUMS == "reload")
+        return VectorIndex.load(
+            config.INDEX_PATH,
+            config.ARTICLE_IDS_PATH,
+            mmap=config.INDEX_MMAP,
+            nprobe=config.FAISS_NPROBE,
+            ef_search=config.FAISS_EF_SEARCH,
+            verify_checksums=checksums,
+        )
+    
+    def _swap_index(self, vector_index):
+        """Make a loaded index current in one assignment.
+        
+        The index and its id map travel together in the VectorIndex, and
+        searches already running keep the instance they started with. Cached
+        results are keyed by index version, so the old version's entries are
+        dropped and can never answer a search on the new one.
+        """
+        current = self.vector_index
+        if current is not None and current.index.d != vector_index.index.d:
+            raise ValueError(f"New index has dimension {vector_index.index.d}, "
+                             f"the query encoder produces {current.index.d}")
+        self.vector_index = vector_index
+        self.result_cache.clear()
+    
+    def _load_index(self):
+        with self._reload_lock:
+            self._swap_index(self._read_index())
+    
+    def _available_version(self) -> Optional[str]:
+        """Index version currently published on disk, if it has a manifest."""
+        from services.vector_index import load_index_manifest
+        try:
+            manifest = load_index_manifest(config.INDEX_PATH)
+        except (OSError, ValueError):
+            return None
+        return manifest.get("version") if manifest else None
+    
+    def reload_index(self, force: bool = False) -> bool:
+        """Load the published index version and swap it in without interrupting searches.
+        
+        Returns False when that version is already loaded, unless ``force``.
+        On failure the current index stays in place.
+        """
+        with self._reload_lock:
+            available = self._available_version()
+            current = self.vector_index.version if self.vector_index else None
+            if not force and self.vector_index is not None and available == current:
+                return False
+            self.reload_state.update(state="loading", error=None)
+            started = time.perf_counter()
+            try:
+                self._swap_index(self._read_index(reload=True))
+            except Exception as e:
+                self.reload_state.update(state="failed", error=str(e), failed_version=available)
+                logger.error(f"Index reload failed, keeping version {current}: {e}")
+                raise
+            self.reload_state.update(
+                state="idle",
+                reloads=self.reload_state["reloads"] + 1,
+                last_reload_at=time.time(),
+                last_reload_ms=round((time.perf_counter() - started) * 1000, 1),
+                failed_version=None,
+            )
+        logger.info(f"Reloaded FAISS index version {self.vector_index.version} "
+                    f"with {self.vector_index.ntotal} vectors")
+        return True
+    
+    def request_reload(self, force: bool = False) -> bool:
+        """Start a reload on a background thread; False if one is already running."""
+        with self._reload_thread_lock:
+            if self._reload_thread is not None and self._reload_thread.is_alive():
+                return False
+            self._reload_thread = threading.Thread(target=self._reload_in_background, args=(force,),
+                                                   name="index-reload", daemon=True)
+            self._reload_thread.start()
+            return True
+    
+    def _reload_in_background(self, force: bool = False):
+        try:
+            self.reload_index(force=force)
+        except Exception:
+            # Already logged and recorded in reload_state
+            pass
+    
+    def _watch_index(self):
+        """Poll the manifest and reload when a new index version is published.
+        
+        A version that failed to load is not retried; the next build publishes
+        a new one.
+        """
+        while not self._stopping.wait(config.INDEX_RELOAD_INTERVAL_SECONDS):
+            if self._loader is not None and self._loader.is_alive():
+                continue
+            available = self._available_version()
+            self.reload_state["last_checked_at"] = time.time()
+            current = self.vector_index.version if self.vector_index else None
+            if available is None or available in (current, self.reload_state["failed_version"]):
+                continue
+            self._reload_in_background()
+    
+    def reload_status(self) -> Dict[str, Any]:
+        """Loaded and published index versions and the outcome of the last reload."""
+        vector_index = self.vector_index
+        return {
+            **self.reload_state,
+            "version": vector_index.version if vector_index else None,
+            "ntotal": vector_index.ntotal if vector_index else None,
+            "available_version": self._available_version(),
+            "watch_interval_s": config.INDEX_RELOAD_INTERVAL_SECONDS,
+        }
     
     def _load_resources(self):
-        """Load FAISS index, model, and article IDs."""
+        """Load FAISS index, LLM client and query encoder, cheapest first, keeping any that were preloaded."""
+        started = time.perf_counter()
         try:
-            # Load FAISS index
-            index_path = '../data/indexes/faiss_index.index'
-            if not os.path.exists(index_path):
-                raise FileNotFoundError(f"FAISS index not found at {index_path}")
-            self.index = faiss.read_index(index_path)
-            
-            # Load article IDs
-            csv_path = '../data/database/article_ids.csv'
-            if not os.path.exists(csv_path):
-                raise FileNotFoundError(f"Article IDs CSV not found at {csv_path}")
-            article_ids_df = pd.read_csv(csv_path)
-            if 'id' not in article_ids_df.columns:
-                raise ValueError("Article IDs CSV missing 'id' column")
-            self.article_ids = article_ids_df['id'].tolist()
-            
-            # Load sentence transformer model
-            self.model = SentenceTransformer('all-MiniLM-L6-v2')
+            if self.vector_index is None:
+                self._load_index()
+                self.load_timings["index"] = round((time.perf_counter() - started) * 1000, 1)
             
             # Initialize LLM if available
             if LLMConnect:
@@ -58,52 +275,39 @@ class SearchService:
                     logger.warning(f"LLM initialization failed: {e}")
                     self.llm = None
             
-            logger.info("Resources loaded successfully")
+            # Load the query encoder for the configured backend behind the shared batching encoder
+            stage = time.perf_counter()
+            if self.model is None:
+                self.model = load_query_model()
+            encoder = BatchingEncoder(self.model)
+            # Warm up so the first real query does not pay for lazy initialization
+            encoder.encode(["warm up"])
+            self.encoder = encoder
+            self.load_timings["encoder"] = round((time.perf_counter() - stage) * 1000, 1)
+            
+            self.load_timings["total"] = round((time.perf_counter() - started) * 1000, 1)
+            self._ready.set()
+            logger.info(f"Resources loaded successfully in {self.load_timings['total']:.0f} ms")
         except FileNotFoundError as e:
+            self.load_error = str(e)
             logger.error(f"Resource file not found: {e}")
             raise
-        except pd.errors.EmptyDataError as e:
-            logger.error(f"CSV file is empty or corrupted: {e}")
-            raise
         except Exception as e:
+            self.load_error = str(e)
             logger.error(f"Failed to load resources: {e}")
             raise
     
-    def manual_search(self, query: str, filters: Dict[str, Any], limit: Optional[int] = None) -> Dict[str, Any]:
-        """Perform manual search using filters and semantic similarity."""
+    def manual_search(self, query: str, filters: Dict[str, Any], limit: Optional[int] = None,
+                      offset: int = 0, fields: Optional[List[str]] = None) -> Dict[str, Any]:
+        """Perform manual search using filters and semantic similarity.
+        
+        With ``fields`` each article is a dict of only those fields (see
+        services.projection), snippets taken around the query terms.
+        """
         try:
-            # Get filtered article IDs from database
-            filtered_df = self.db_manager.search_articles(filters)
-            filtered_ids = set(filtered_df['id'].tolist()) if not filtered_df.empty else set()
-            
-            # Semantic search if query provided
-            final_ids = filtered_ids
-            if query and self.model and self.index:
-                query_vector = self.model.encode([query])
-                D, I = self.index.search(np.array(query_vector), k=200)
-                semantic_ids = set(self.article_ids[i] for i in I[0] if i < len(self.article_ids))
-                
-                if filtered_ids:
-                    final_ids = filtered_ids.intersection(semantic_ids)
-                else:
-                    final_ids = semantic_ids
-            
-            if not final_ids:
-                return {"articles": [], "total_count": 0, "search_type": "manual"}
-            
-            # Apply limit before fetching full details for performance
-            ids_to_fetch = list(final_ids)
-            if limit and limit > 0:
-                ids_to_fetch = ids_to_fetch[:limit]
-            
-            # Get full article details
-            results = self.db_manager.get_articles_by_ids(ids_to_fetch)
-            
-            return {
-                "articles": results.to_dict('records'),
-                "total_count": len(results),
-                "search_type": "manual"
-            }
+            ranked_ids, ranked_scores, extra = self._manual_ranking(query, filters, limit, offset)
+            return self._ranked_page("manual", ranked_ids, ranked_scores, limit, offset, fields=fields,
+                                     pattern=snippet_pattern(query, filters.get("abstract_filter")), **extra)
         except (AttributeError, ValueError) as e:
             logger.error(f"Invalid search parameters: {e}")
             return {"articles": [], "total_count": 0, "search_type": "manual", "error": "Invalid search parameters"}
@@ -111,89 +315,218 @@ class SearchService:
             logger.error(f"Error in manual search: {e}")
             return {"articles": [], "total_count": 0, "search_type": "manual", "error": str(e)}
     
-    def ai_search(self, query: str, filters: Dict[str, Any], limit: Optional[int] = None) -> Dict[str, Any]:
-        """Perform AI-powered search with intelligent query interpretation."""
-        try:
-            explanation = ""
-            
-            # Extract limit from query using regex as fallback
-            if not limit:
-                limit_match = re.search(r'\b(\d+)\s*(?:papers?|articles?|results?)', query.lower())
-                if limit_match:
-                    limit = int(limit_match.group(1))
-                    logger.info(f"Extracted limit from query regex: {limit}")
-            
-            # Get LLM response
-            if self.llm:
-                llm_response = self.llm.query_llm(query)
-                explanation = llm_response.get("explanation", "")
-                search_params = llm_response.get("search_params", {})
-                
-                # Extract limit from LLM if not already set
-                if not limit and search_params.get("limit"):
-                    try:
-                        limit = int(search_params["limit"])
-                        logger.info(f"Extracted limit from LLM: {limit}")
-                    except (ValueError, TypeError):
-                        pass
-                
-                # Merge LLM params with user filters (user filters take precedence)
-                for key, value in search_params.items():
-                    if key != "limit" and key in filters and not filters[key]:
-                        filters[key] = value
-            
-            # Perform enhanced semantic search
-            final_ids = set()
-            
-            if query and self.model and self.index:
-                # Try multiple query variations
-                queries_to_try = [query]
-                if len(query.split()) > 1:
-                    important_words = [word for word in query.split() if len(word) > 3]
-                    queries_to_try.extend(important_words[:3])
-                
-                all_semantic_ids = set()
-                for search_query in queries_to_try:
-                    query_vector = self.model.encode([search_query])
-                    D, I = self.index.search(np.array(query_vector), k=150)
-                    semantic_ids = set(self.article_ids[i] for i in I[0] if i < len(self.article_ids))
-                    all_semantic_ids.update(semantic_ids)
-                
-                final_ids = all_semantic_ids
-            
-            # Apply database filters
-            if any(filters.values()):
-                filtered_df = self.db_manager.search_articles(filters)
-                filtered_ids = set(filtered_df['id'].tolist()) if not filtered_df.empty else set()
-                
-                if final_ids:
-                    final_ids = final_ids.intersection(filtered_ids)
+    def _manual_ranking(self, query: str, filters: Dict[str, Any], limit: Optional[int],
+                        offset: int) -> Tuple[np.ndarray, Optional[np.ndarray], Dict[str, Any]]:
+        """Ranked article IDs and scores of a manual search, plus the extra response fields."""
+        use_semantic = bool(query and self._semantic_ready())
+        fallback = self._fallback_flags(query, use_semantic)
+        if fallback["warming"] or fallback["degraded"]:
+            # Without the encoder, answer the query with a full-text keyword match
+            filters = dict(filters, keyword_filter=query)
+        
+        # Get filtered article IDs from database (bm25 order when FTS answers the text filters);
+        # an unfiltered semantic search needs none
+        filtered_ids = None
+        if self._has_filters(filters) or not use_semantic:
+            filtered_ids = self._filtered_ids(filters)
+        ranked_ids = filtered_ids if filtered_ids is not None else np.empty(0, dtype=np.int64)
+        ranked_scores = None
+        
+        # Semantic search if query provided, restricted to the filtered articles
+        if use_semantic and (filtered_ids is None or len(filtered_ids)):
+            k = max(200, offset + limit) if limit and limit > 0 else 200
+            ranked_scores, ranked_ids = self._semantic_search([query], k=k, allowed_ids=filtered_ids)[0]
+        return ranked_ids, ranked_scores, fallback
+    
+    def stream_search(self, search_type: str, query: str, filters: Dict[str, Any], limit: Optional[int] = None,
+                      offset: int = 0, llm_response: Optional[Dict[str, Any]] = None,
+                      fields: Optional[List[str]] = None) -> Tuple[Dict[str, Any], Iterator[List[Any]]]:
+        """Rank a search like manual_search or ai_search, but fetch its articles lazily.
+        
+        Returns the response fields other than the articles, and an iterator
+        yielding the page's articles in rank order, one database chunk at a
+        time, so large pages never sit in memory whole. Articles are projected
+        onto ``fields`` as in manual_search. Errors are raised.
+        """
+        if search_type == "ai":
+            ranked_ids, ranked_scores, limit, extra = self._ai_ranking(query, filters, limit, llm_response, offset)
+        else:
+            ranked_ids, ranked_scores, extra = self._manual_ranking(query, filters, limit, offset)
+        page_ids, page_scores = paginate(ranked_ids, ranked_scores, limit, offset)
+        next_offset = offset + len(page_ids)
+        meta = {
+            "candidates": len(ranked_ids),
+            "offset": offset,
+            "next_cursor": encode_cursor(next_offset) if next_offset < len(ranked_ids) else None,
+            "search_type": search_type,
+            **extra,
+        }
+        pattern = snippet_pattern(query, filters.get("abstract_filter")) if fields else None
+        return meta, self._scored_chunks(page_ids, page_scores, fields, pattern)
+    
+    def _scored_chunks(self, page_ids: np.ndarray, page_scores: Optional[np.ndarray],
+                       fields: Optional[List[str]] = None, pattern=None) -> Iterator[List[Any]]:
+        scores = dict(zip(page_ids.tolist(), page_scores.tolist())) if page_scores is not None else {}
+        columns = projected_columns(fields) if fields else None
+        for articles in self.db_manager.iter_articles_by_ids(page_ids, columns=columns):
+            if fields:
+                yield [project(row, fields, scores.get(row["id"]), pattern) for row in articles]
+                continue
+            for article in articles:
+                # Fresh objects from the row factory, so the score is set in place
+                article.score = scores.get(article.id)
+            yield articles
+    
+    def _ranked_page(self, search_type: str, ids: np.ndarray, scores: Optional[np.ndarray],
+                     limit: Optional[int], offset: int = 0, fields: Optional[List[str]] = None,
+                     pattern=None, **extra: Any) -> Dict[str, Any]:
+        """Fetch one page of ranked article IDs, keeping rank order and attaching scores."""
+        return self._ranked_pages(search_type, [(ids, scores)], limit, offset, fields, pattern, **extra)[0]
+    
+    def _ranked_pages(self, search_type: str, rankings: List[Tuple[np.ndarray, Optional[np.ndarray]]],
+                      limit: Optional[int], offset: int = 0, fields: Optional[List[str]] = None,
+                      pattern=None, **extra: Any) -> List[Dict[str, Any]]:
+        """Fetch a page for each ranking with a single article query over the union of their IDs.
+        
+        With ``fields`` only the columns they need are read and each article
+        is projected to a dict, its snippet matched by ``pattern``.
+        """
+        # Apply limit before fetching full details for performance
+        pages = [paginate(ids, scores, limit, offset) for ids, scores in rankings]
+        wanted = np.unique(np.concatenate([page_ids for page_ids, _ in pages])) if pages else []
+        columns = projected_columns(fields) if fields else None
+        rows = self.db_manager.get_articles_by_ids(wanted, columns) if len(wanted) else []
+        by_id = {row["id"]: row for row in rows} if fields else {article.id: article for article in rows}
+        
+        responses = []
+        for (ids, _), (page_ids, page_scores) in zip(rankings, pages):
+            articles = []
+            for position, article_id in enumerate(page_ids.tolist()):
+                article = by_id.get(article_id)
+                if article is None:
+                    continue
+                score = float(page_scores[position]) if page_scores is not None else None
+                if fields:
+                    articles.append(project(article, fields, score, pattern))
                 else:
-                    final_ids = filtered_ids
-            
-            if not final_ids:
-                return {
-                    "articles": [], 
-                    "total_count": 0, 
-                    "search_type": "ai",
-                    "explanation": explanation
-                }
-            
-            # Apply limit before fetching full details for performance
-            ids_to_fetch = list(final_ids)
-            if limit and limit > 0:
-                ids_to_fetch = ids_to_fetch[:limit]
-                logger.info(f"Limiting results to {limit} articles")
-            
-            # Get full article details
-            results = self.db_manager.get_articles_by_ids(ids_to_fetch)
-            
-            return {
-                "articles": results.to_dict('records'),
-                "total_count": len(results),
-                "search_type": "ai",
-                "explanation": explanation
-            }
+                    # Copied because one article can appear in several pages with different scores
+                    articles.append(article.model_copy(update={"score": score}))
+            next_offset = offset + len(page_ids)
+            responses.append({
+                "articles": articles,
+                "total_count": len(articles),
+                "candidates": len(ids),
+                "offset": offset,
+                "next_cursor": encode_cursor(next_offset) if next_offset < len(ids) else None,
+                "search_type": search_type,
+                **extra,
+            })
+        return responses
+    
+    def batch_search(self, queries: List[str], filters: Dict[str, Any],
+                     limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Run manual search for many queries sharing the same filters, in one pass.
+        
+        The filters are applied once, all queries are encoded together and
+        searched with one multi-query FAISS call, and the articles of every
+        result page are fetched with one query. Results come back in query order.
+        """
+        if not self._semantic_ready():
+            # Warming up: fall back to the per-query keyword search
+            return [self.manual_search(query, filters, limit) for query in queries]
+        
+        filtered_ids = self._filtered_ids(filters) if self._has_filters(filters) else None
+        semantic = [i for i, query in enumerate(queries) if query]
+        # Empty queries list the filtered articles, like manual_search
+        listed = filtered_ids
+        if len(semantic) < len(queries) and listed is None:
+            listed = self._filtered_ids(filters)
+        unranked = (listed if listed is not None else np.empty(0, dtype=np.int64), None)
+        rankings = [unranked] * len(queries)
+        if semantic and (filtered_ids is None or len(filtered_ids)):
+            k = max(200, limit) if limit and limit > 0 else 200
+            results = self._semantic_search([queries[i] for i in semantic], k=k, allowed_ids=filtered_ids)
+            for i, (scores, ids) in zip(semantic, results):
+                rankings[i] = (ids, scores)
+        return self._ranked_pages("manual", rankings, limit, warming=False, degraded=False)
+    
+    @staticmethod
+    def _has_filters(filters: Dict[str, Any]) -> bool:
+        return any(value and not (key == 'year_filter' and value == 'All') for key, value in filters.items())
+    
+    def _filtered_ids(self, filters: Dict[str, Any]) -> np.ndarray:
+        """Article IDs matching the database filters."""
+        return self.db_manager.search_articles(filters)
+    
+    def _encode_queries(self, queries: List[str]) -> np.ndarray:
+        """Encode queries, reusing cached embeddings and batching the misses."""
+        keys = [normalize_query(q) for q in queries]
+        vectors = [self.embedding_cache.get(key) for key in keys]
+        missing = list(dict.fromkeys(key for key, vector in zip(keys, vectors) if vector is None))
+        if missing:
+            encoded = dict(zip(missing, self.encoder.encode(missing)))
+            for key, vector in encoded.items():
+                self.embedding_cache.set(key, vector.copy())
+            vectors = [encoded[key] if vector is None else vector for key, vector in zip(keys, vectors)]
+        return np.vstack(vectors).astype(np.float32, copy=False)
+    
+    def _semantic_search(self, queries: List[str], k: int,
+                         allowed_ids: Optional[np.ndarray] = None) -> List[Tuple[np.ndarray, np.ndarray]]:
+        """Get the top-k (scores, article ids) for each query, served from cache when possible.
+        
+        With ``allowed_ids`` the search is restricted to those articles, so
+        narrow filters still get k results instead of an empty intersection.
+        """
+        # One index version for the whole search, even if a reload swaps it meanwhile
+        vector_index = self.vector_index
+        if allowed_ids is not None:
+            D, ids = vector_index.search_filtered(self._encode_queries(queries), allowed_ids, k)
+            valid = ids >= 0
+            return [(D[row][valid[row]], ids[row][valid[row]]) for row in range(len(queries))]
+        
+        keys = [(vector_index.version, normalize_query(q), k) for q in queries]
+        results = [self.result_cache.get(key) for key in keys]
+        missing = [i for i, result in enumerate(results) if result is None]
+        if missing:
+            query_vectors = self._encode_queries([queries[i] for i in missing])
+            D, ids = vector_index.search(query_vectors, k=k)
+            for row, i in enumerate(missing):
+                # Approximate indexes pad missing neighbors with -1
+                valid = ids[row] >= 0
+                results[i] = (D[row][valid], ids[row][valid])
+                self.result_cache.set(keys[i], results[i])
+        return results
+    
+    def index_info(self) -> Dict[str, Any]:
+        """Describe the loaded FAISS index."""
+        vector_index = self.vector_index
+        return vector_index.info() if vector_index else {}
+    
+    def cache_stats(self) -> Dict[str, Any]:
+        """Get embedding and result cache statistics."""
+        return {
+            "embeddings": self.embedding_cache.stats(),
+            "results": self.result_cache.stats(),
+        }
+    
+    async def interpret_query(self, query: str) -> Optional[Dict[str, Any]]:
+        """Ask the LLM to interpret a query without blocking the event loop."""
+        if not self.llm:
+            return None
+        return await self.llm.aquery_llm(query)
+    
+    def ai_search(self, query: str, filters: Dict[str, Any], limit: Optional[int] = None,
+                  llm_response: Optional[Dict[str, Any]] = None, offset: int = 0,
+                  fields: Optional[List[str]] = None) -> Dict[str, Any]:
+        """Perform AI-powered search with intelligent query interpretation.
+        
+        Pass ``llm_response`` from interpret_query to skip the blocking LLM call.
+        ``fields`` projects the articles as in manual_search.
+        """
+        try:
+            ranked_ids, ranked_scores, limit, extra = self._ai_ranking(query, filters, limit, llm_response, offset)
+            return self._ranked_page("ai", ranked_ids, ranked_scores, limit, offset, fields=fields,
+                                     pattern=snippet_pattern(query, filters.get("abstract_filter")), **extra)
         except (AttributeError, ValueError) as e:
             logger.error(f"Invalid AI search parameters: {e}")
             return {
@@ -209,4 +542,66 @@ class SearchService:
                 "total_count": 0, 
                 "search_type": "ai", 
                 "error": str(e)
-            }
\ No newline at end of file
+            }
+    
+    def _ai_ranking(self, query: str, filters: Dict[str, Any], limit: Optional[int],
+                    llm_response: Optional[Dict[str, Any]], offset: int
+                    ) -> Tuple[np.ndarray, Optional[np.ndarray], Optional[int], Dict[str, Any]]:
+        """Ranked article IDs and scores of an AI search, the page size it settled on and the extra response fields."""
+        explanation = ""
+        
+        # Extract limit from query using regex as fallback
+        if not limit:
+            limit_match = re.search(r'\b(\d+)\s*(?:papers?|articles?|results?)', query.lower())
+            if limit_match:
+                limit = int(limit_match.group(1))
+                logger.info(f"Extracted limit from query regex: {limit}")
+        
+        # Get LLM response
+        if llm_response is None and self.llm:
+            llm_response = self.llm.query_llm(query)
+        if llm_response:
+            explanation = llm_response.get("explanation", "")
+            search_params = llm_response.get("search_params", {})
+            
+            # Extract limit from LLM if not already set
+            if not limit and search_params.get("limit"):
+                try:
+                    limit = int(search_params["limit"])
+                    logger.info(f"Extracted limit from LLM: {limit}")
+                except (ValueError, TypeError):
+                    pass
+            
+            # Merge LLM params with user filters (user filters take precedence)
+            for key, value in search_params.items():
+                if key != "limit" and key in filters and not filters[key]:
+                    filters[key] = value
+        
+        use_semantic = bool(query and self._semantic_ready())
+        fallback = self._fallback_flags(query, use_semantic)
+        if fallback["warming"] or fallback["degraded"]:
+            # Without the encoder, answer the query with a full-text keyword match
+            filters = dict(filters, keyword_filter=query)
+        
+        # Get filtered article IDs from database
+        filtered_ids = self._filtered_ids(filters) if self._has_filters(filters) else None
+        ranked_ids = filtered_ids if filtered_ids is not None else np.empty(0, dtype=np.int64)
+        ranked_scores = None
+        
+        # Perform enhanced semantic search within the filtered articles
+        if use_semantic and (filtered_ids is None or len(filtered_ids)):
+            # Try multiple query variations
+            queries_to_try = [query]
+            if len(query.split()) > 1:
+                important_words = [word for word in query.split() if len(word) > 3]
+                queries_to_try.extend(important_words[:3])
+            
+            # Encode and search all variations as one batch, ranking each article by its best score
+            k = max(150, offset + limit) if limit and limit > 0 else 150
+            ranked_scores, ranked_ids = merge_ranked(
+                self._semantic_search(queries_to_try, k=k, allowed_ids=filtered_ids)
+            )
+        
+        if limit and limit > 0:
+            logger.info(f"Limiting results to {limit} articles")
+        return ranked_ids, ranked_scores, limit, {"explanation": explanation, **fallback}
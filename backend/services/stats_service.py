@@ -0,0 +1,57 @@
+import hashlib
+import json
+import threading
+import time
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from core import config
+from core.database import DatabaseManager
+from services.cache import TTLCache
+
+class StatsService:
+    """Serve /stats and /years from memory.
+
+    The payloads come from the summary tables written at ingestion. Every
+    ingestion bumps the stats generation, which is checked at most every
+    ``STATS_CHECK_INTERVAL_SECONDS``; a new generation drops the cached copies.
+    Each payload carries an ETag so clients can revalidate for free.
+    """
+
+    def __init__(self, db_manager: DatabaseManager):
+        self.db_manager = db_manager
+        self.cache = TTLCache(8, config.STATS_CACHE_TTL_SECONDS)
+        self._loaders: Dict[str, Callable[[], Dict[str, Any]]] = {
+            "stats": db_manager.get_stats,
+            "years": lambda: {"years": db_manager.get_years()},
+        }
+        self._lock = threading.Lock()
+        self._generation = None
+        self._checked_at = float("-inf")
+
+    def _current_generation(self) -> Optional[str]:
+        """Stats generation in the database, re-read at most every check interval."""
+        now = time.monotonic()
+        with self._lock:
+            if now - self._checked_at < config.STATS_CHECK_INTERVAL_SECONDS:
+                return self._generation
+            self._checked_at = now
+        generation = self.db_manager.get_stats_generation()
+        with self._lock:
+            if generation != self._generation:
+                self._generation = generation
+                self.cache.clear()
+        return generation
+
+    def get(self, name: str) -> Tuple[Dict[str, Any], str]:
+        """The named payload and its ETag."""
+        key = (name, self._current_generation())
+        entry = self.cache.get(key)
+        if entry is None:
+            payload = self._loaders[name]()
+            digest = hashlib.sha1(json.dumps(payload, sort_keys=True).encode()).hexdigest()[:16]
+            entry = (payload, f'"{name}-{digest}"')
+            self.cache.set(key, entry)
+        return entry
+
+    def stats(self) -> Dict[str, Any]:
+        return {"generation": self._generation, **self.cache.stats()}
@@ -0,0 +1,342 @@
+import os
+import sys
+import logging
+import threading
+from collections import Counter
+from typing import Dict, Any, Optional, Tuple
+
+import faiss
+import numpy as np
+
+from core import config
+
+# The index file names and readers are shared with the index builder in data/scripts
+scripts_path = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), 'data', 'scripts')
+if scripts_path not in sys.path:
+    sys.path.append(scripts_path)
+from index_files import file_sha256, load_index_manifest, load_index_metadata, metadata_path  # noqa: E402
+
+logger = logging.getLogger(__name__)
+
+class IndexVersionMismatch(ValueError):
+    """The files on disk do not all belong to the version named by the manifest."""
+
+def verify_manifest(manifest: Dict[str, Any], files: Dict[str, str], ntotal: int, checksums: bool = True):
+    """Check a loaded index against its manifest: vector count, file sizes and, optionally, checksums.
+
+    The count and sizes are free to check; checksums read every file end to
+    end. Files whose name differs from the manifest entry (such as the legacy
+    CSV id map) are skipped; the vector count still ties them to the index.
+    """
+    if int(manifest.get("ntotal", ntotal)) != ntotal:
+        raise IndexVersionMismatch(f"Manifest {manifest.get('version')} lists {manifest['ntotal']} vectors, "
+                                   f"the index has {ntotal}")
+    for role, path in files.items():
+        entry = manifest.get("files", {}).get(role)
+        if entry is None or os.path.basename(entry["path"]) != os.path.basename(path):
+            continue
+        if "size" in entry and os.path.getsize(path) != entry["size"]:
+            raise IndexVersionMismatch(f"{path} has {os.path.getsize(path)} bytes, "
+                                       f"manifest {manifest.get('version')} lists {entry['size']}")
+        if checksums and file_sha256(path) != entry["sha256"]:
+            raise IndexVersionMismatch(f"{path} does not match manifest {manifest.get('version')}")
+
+def base_index(index):
+    """The concrete index, looking through an IndexIDMap wrapper."""
+    index = faiss.downcast_index(index)
+    if isinstance(index, (faiss.IndexIDMap, faiss.IndexIDMap2)):
+        index = faiss.downcast_index(index.index)
+    return index
+
+def apply_search_params(index, nprobe: Optional[int] = None, ef_search: Optional[int] = None):
+    """Set nprobe on IVF indexes and efSearch on HNSW indexes; other index types ignore them."""
+    try:
+        ivf = faiss.extract_index_ivf(index)
+    except RuntimeError:
+        ivf = None
+    if ivf is not None and nprobe:
+        ivf.nprobe = min(int(nprobe), ivf.nlist)
+        logger.info(f"Searching IVF index with nprobe={ivf.nprobe} of {ivf.nlist} lists")
+    hnsw = base_index(index)
+    if hasattr(hnsw, 'hnsw') and ef_search:
+        hnsw.hnsw.efSearch = int(ef_search)
+        logger.info(f"Searching HNSW index with efSearch={hnsw.hnsw.efSearch}")
+
+def set_search_threads(threads: int):
+    """Cap the OpenMP threads of FAISS searches in this process; 0 keeps one per core."""
+    if threads:
+        faiss.omp_set_num_threads(threads)
+
+def read_index(index_path: str, mmap: bool = True):
+    """Read a FAISS index, memory-mapping its vectors when the index type allows it.
+
+    Mapped pages live in the OS page cache, so every worker process on the
+    machine shares one copy and startup does not copy the vectors at all.
+    """
+    if mmap:
+        flag = getattr(faiss, "IO_FLAG_MMAP_IFC", faiss.IO_FLAG_MMAP)
+        try:
+            return faiss.read_index(index_path, flag | faiss.IO_FLAG_READ_ONLY)
+        except RuntimeError as e:
+            logger.warning(f"Could not memory-map {index_path}, reading it into RAM: {e}")
+    return faiss.read_index(index_path)
+
+def resolve_article_ids_path(ids_path: str) -> str:
+    """The file load_article_ids reads for ``ids_path``: the .npy map if present, else the CSV."""
+    stem, ext = os.path.splitext(ids_path)
+    if ext in ('', '.npy') and os.path.exists(stem + '.npy'):
+        return stem + '.npy'
+    return stem + '.csv'
+
+def load_article_ids(ids_path: str, mmap: bool = True) -> np.ndarray:
+    """Load the index row -> article id map.
+
+    A raw int64 ``.npy`` file is memory-mapped; the legacy ``article_ids.csv``
+    with the same name is parsed when no ``.npy`` file exists.
+    """
+    path = resolve_article_ids_path(ids_path)
+    if path.endswith('.npy'):
+        return np.load(path, mmap_mode='r' if mmap else None)
+    if os.path.exists(path):
+        with open(path) as f:
+            if f.readline().strip().strip('"') != 'id':
+                raise ValueError("Article IDs CSV missing 'id' column")
+        return np.loadtxt(path, dtype=np.int64, skiprows=1, ndmin=1)
+    stem = os.path.splitext(ids_path)[0]
+    raise FileNotFoundError(f"Article IDs not found at {stem}.npy or {stem}.csv")
+
+class VectorIndex:
+    """A FAISS index together with its row -> article id map and build metadata.
+
+    Indexes built with article id labels (``id_mapped`` in the metadata) return
+    article ids directly; their id map then just lists the ids present.
+    """
+
+    def __init__(self, index, article_ids: np.ndarray, metadata: Dict[str, Any],
+                 manifest: Optional[Dict[str, Any]] = None):
+        if index.ntotal != len(article_ids):
+            raise ValueError(f"Index has {index.ntotal} vectors but the id map has {len(article_ids)} ids")
+        self.index = index
+        self.article_ids = article_ids
+        self.metadata = metadata
+        self.manifest = manifest
+        self.version = manifest.get("version") if manifest else None
+        self.id_mapped = bool(metadata.get("id_mapped", False))
+        self._lock = threading.Lock()
+        self._id_order = None
+        self._can_reconstruct = None
+        self.plan_counts = Counter()
+
+    @classmethod
+    def load(cls, index_path: str, ids_path: str, mmap: bool = True,
+             nprobe: Optional[int] = None, ef_search: Optional[int] = None,
+             verify_checksums: bool = False) -> "VectorIndex":
+        """Load an index and id map from disk and apply its query-time search parameters.
+
+        When a version manifest exists the loaded files are verified against it
+        and the manifest is re-read afterwards, so a build published while
+        loading raises IndexVersionMismatch instead of mixing two versions.
+        """
+        if not os.path.exists(index_path):
+            raise FileNotFoundError(f"FAISS index not found at {index_path}")
+        manifest = load_index_manifest(index_path)
+        index = read_index(index_path, mmap=mmap)
+        article_ids = load_article_ids(ids_path, mmap=mmap)
+        metadata = load_index_metadata(index_path)
+        if manifest is not None:
+            files = {
+                "index": index_path,
+                "ids": resolve_article_ids_path(ids_path),
+                "metadata": metadata_path(index_path),
+            }
+            verify_manifest(manifest, files, int(index.ntotal), checksums=verify_checksums)
+            current = load_index_manifest(index_path)
+            if current is None or current.get("version") != manifest.get("version"):
+                raise IndexVersionMismatch(f"Index version changed while loading {manifest.get('version')}")
+        search_params = metadata.get("search_params", {})
+        apply_search_params(
+            index,
+            nprobe=nprobe or search_params.get("nprobe"),
+            ef_search=ef_search or search_params.get("ef_search"),
+        )
+        vector_index = cls(index, article_ids, metadata, manifest)
+        vector_index.prepare_reconstruct()
+        return vector_index
+
+    @property
+    def ntotal(self) -> int:
+        return int(self.index.ntotal)
+
+    def _to_article_ids(self, I: np.ndarray) -> np.ndarray:
+        """Map index labels to article ids, keeping -1 for missing neighbors."""
+        if self.id_mapped:
+            return I
+        valid = I >= 0
+        ids = np.full(I.shape, -1, dtype=np.int64)
+        ids[valid] = self.article_ids[I[valid]]
+        return ids
+
+    def search(self, vectors: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Search and map index rows to article ids; missing neighbors are -1."""
+        D, I = self.index.search(np.ascontiguousarray(vectors, dtype=np.float32), k)
+        return D, self._to_article_ids(I)
+
+    def rows_for_ids(self, article_ids: np.ndarray) -> np.ndarray:
+        """Map article ids to index labels (rows, or the ids themselves when id-mapped),
+        dropping ids that are not in the index."""
+        with self._lock:
+            if self._id_order is None:
+                order = np.argsort(self.article_ids, kind='stable')
+                self._id_order = (order, np.asarray(self.article_ids)[order])
+        order, sorted_ids = self._id_order
+        article_ids = np.asarray(article_ids, dtype=np.int64)
+        positions = np.searchsorted(sorted_ids, article_ids)
+        positions[positions == len(sorted_ids)] = 0
+        found = sorted_ids[positions] == article_ids if len(sorted_ids) else np.zeros(len(article_ids), bool)
+        if self.id_mapped:
+            return article_ids[found]
+        return order[positions[found]].astype(np.int64)
+
+    def prepare_reconstruct(self) -> bool:
+        """Check once whether stored vectors can be fetched, building an IVF direct map if needed.
+
+        The direct map is built under the lock, and by load() before the
+        index serves any search, so no search runs while FAISS changes it.
+        """
+        with self._lock:
+            if self._can_reconstruct is None:
+                self._can_reconstruct = self._enable_reconstruct()
+            return self._can_reconstruct
+
+    def _enable_reconstruct(self) -> bool:
+        if self.ntotal == 0:
+            return False
+        probe = np.asarray(self.article_ids[:1], dtype=np.int64) if self.id_mapped else np.zeros(1, dtype=np.int64)
+        try:
+            self.index.reconstruct_batch(probe)
+            return True
+        except RuntimeError:
+            pass
+        try:
+            # IVF indexes need a label -> list direct map to reconstruct
+            ivf = faiss.extract_index_ivf(self.index)
+            if self.id_mapped:
+                ivf.set_direct_map_type(faiss.DirectMap.Hashtable)
+            else:
+                ivf.make_direct_map()
+            self.index.reconstruct_batch(probe)
+            return True
+        except RuntimeError:
+            logger.info("Index cannot reconstruct vectors; filtered search will use ID selectors")
+            return False
+
+    def _reconstruct(self, rows: np.ndarray) -> Optional[np.ndarray]:
+        """Fetch stored vectors for rows, or None when this index type cannot."""
+        if not self.prepare_reconstruct():
+            return None
+        return self.index.reconstruct_batch(rows)
+
+    def _search_params(self, selector):
+        """Search parameters that keep the index's nprobe/efSearch while restricting ids."""
+        index = base_index(self.index)
+        if hasattr(index, 'nprobe'):
+            return faiss.SearchParametersIVF(sel=selector, nprobe=index.nprobe)
+        if hasattr(index, 'hnsw'):
+            return faiss.SearchParametersHNSW(sel=selector, efSearch=index.hnsw.efSearch)
+        return faiss.SearchParameters(sel=selector)
+
+    def _brute_force(self, vectors: np.ndarray, rows: np.ndarray, k: int) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+        candidates = self._reconstruct(rows)
+        if candidates is None:
+            return None
+        scores = vectors @ candidates.T
+        D = np.full((len(vectors), k), -np.inf, dtype=np.float32)
+        I = np.full((len(vectors), k), -1, dtype=np.int64)
+        top_k = min(k, len(rows))
+        if top_k:
+            top = np.argpartition(-scores, top_k - 1, axis=1)[:, :top_k]
+            top_scores = np.take_along_axis(scores, top, axis=1)
+            order = np.argsort(-top_scores, axis=1)
+            D[:, :top_k] = np.take_along_axis(top_scores, order, axis=1)
+            I[:, :top_k] = rows[np.take_along_axis(top, order, axis=1)]
+        return D, I
+
+    def _overfetch(self, vectors: np.ndarray, rows: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+        if self.id_mapped:
+            def is_allowed(I):
+                return np.isin(I, rows)
+        else:
+            allowed = np.zeros(self.ntotal, dtype=bool)
+            allowed[rows] = True
+
+            def is_allowed(I):
+                return (I >= 0) & allowed[np.maximum(I, 0)]
+        selectivity = len(rows) / self.ntotal
+        fetch = min(self.ntotal, int(np.ceil(k / selectivity * 1.5)))
+        while True:
+            D_all, I_all = self.index.search(vectors, fetch)
+            keep = is_allowed(I_all)
+            enough = keep.sum(axis=1) >= min(k, len(rows))
+            if enough.all() or fetch >= self.ntotal:
+                break
+            fetch = min(self.ntotal, fetch * 2)
+        D = np.full((len(vectors), k), -np.inf, dtype=np.float32)
+        I = np.full((len(vectors), k), -1, dtype=np.int64)
+        for q in range(len(vectors)):
+            hits = np.flatnonzero(keep[q])[:k]
+            D[q, :len(hits)] = D_all[q, hits]
+            I[q, :len(hits)] = I_all[q, hits]
+        return D, I
+
+    def plan(self, allowed: int) -> str:
+        """Filtered search strategy for a filter that allows this many indexed vectors."""
+        candidate_bytes = allowed * self.index.d * np.dtype(np.float32).itemsize
+        if candidate_bytes <= config.PLANNER_BRUTE_FORCE_MAX_BYTES and self._can_reconstruct is not False:
+            return "brute_force"
+        if allowed / self.ntotal <= config.PLANNER_SELECTOR_MAX_SELECTIVITY:
+            return "selector"
+        return "overfetch"
+
+    def search_filtered(self, vectors: np.ndarray, allowed_ids: np.ndarray, k: int,
+                        strategy: str = "auto") -> Tuple[np.ndarray, np.ndarray]:
+        """Top-k search restricted to ``allowed_ids``; missing neighbors are -1.
+
+        The planner picks a strategy from the filter's size and selectivity:
+        exact brute-force scoring of a candidate set small enough to copy, a
+        FAISS search with an ID selector for narrow filters, or adaptive
+        over-fetching for wide ones.
+        """
+        vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+        rows = self.rows_for_ids(allowed_ids)
+        if len(rows) == 0:
+            return (np.full((len(vectors), k), -np.inf, dtype=np.float32),
+                    np.full((len(vectors), k), -1, dtype=np.int64))
+
+        if strategy == "auto":
+            strategy = self.plan(len(rows))
+
+        result = self._brute_force(vectors, rows, k) if strategy == "brute_force" else None
+        if result is None and strategy in ("brute_force", "selector"):
+            strategy = "selector"
+            selector = faiss.IDSelectorBatch(rows)
+            result = self.index.search(vectors, k, params=self._search_params(selector))
+        elif strategy == "overfetch":
+            result = self._overfetch(vectors, rows, k)
+        with self._lock:
+            self.plan_counts[strategy] += 1
+
+        D, I = result
+        return D, self._to_article_ids(I)
+
+    def info(self) -> Dict[str, Any]:
+        with self._lock:
+            plans = dict(self.plan_counts)
+        return {
+            "index_type": self.metadata.get("index_type", "flat"),
+            "version": self.version,
+            "ntotal": self.ntotal,
+            "dimension": int(self.index.d),
+            "id_mapped": self.id_mapped,
+            "search_params": self.metadata.get("search_params", {}),
+            "filtered_search_plans": plans,
+        }
@@ -1,7 +1,11 @@
 #!/usr/bin/env python3
 """
 Startup script for ArXiv Research Hub Backend API
+
+    python start.py                  # development: one process, reloads on code changes
+    python start.py --workers 4      # production: 4 worker processes sharing the index and model
 """
+import argparse
 import uvicorn
 import sys
 import os
@@ -9,21 +13,46 @@ import os
 # Add current directory to Python path
 sys.path.append(os.path.dirname(__file__))
 
+def split_threads(workers: int):
+    """Divide the cores between workers so their encoder and FAISS thread pools do not oversubscribe them."""
+    threads = str(max(1, (os.cpu_count() or workers) // workers))
+    for name in ("ENCODER_THREADS", "FAISS_THREADS"):
+        os.environ.setdefault(name, threads)
+
+def serve(args):
+    if args.workers < 1:
+        uvicorn.run("main:app", host=args.host, port=args.port, reload=True, log_level=args.log_level)
+        return
+    if not hasattr(os, "fork"):
+        print("Warning: pre-forked workers need os.fork; starting independent workers that load their own copies")
+        uvicorn.run("main:app", host=args.host, port=args.port, workers=args.workers, log_level=args.log_level)
+        return
+    split_threads(args.workers)
+    # Imported only now: config reads the thread settings above at import
+    from main import app
+    from api.routes import search_service
+    from core.prefork import PreforkServer
+    preload = None if args.no_preload else search_service.preload
+    PreforkServer(app, args.host, args.port, args.workers, args.log_level, preload=preload).run()
+
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Start the ArXiv Research Hub API.")
+    parser.add_argument("--host", default=os.getenv("API_HOST", "0.0.0.0"))
+    parser.add_argument("--port", type=int, default=int(os.getenv("API_PORT", "8000")))
+    parser.add_argument("--workers", type=int, default=int(os.getenv("API_WORKERS", "0")),
+                        help="Worker processes for production; 0 runs the auto-reloading development server")
+    parser.add_argument("--no-preload", action="store_true",
+                        help="Let every worker load its own index and model instead of sharing the parent's")
+    parser.add_argument("--log-level", default="info")
+    args = parser.parse_args()
     try:
-        uvicorn.run(
-            "main:app",
-            host="0.0.0.0",
-            port=8000,
-            reload=True,
-            log_level="info"
-        )
+        serve(args)
     except OSError as e:
-        print(f"Error: Port 8000 may already be in use. {e}")
+        print(f"Error: Port {args.port} may already be in use. {e}")
         sys.exit(1)
     except ImportError as e:
         print(f"Error: Failed to import application. {e}")
         sys.exit(1)
     except Exception as e:
         print(f"Error starting server: {e}")
-        sys.exit(1)
\ No newline at end of file
+        sys.exit(1)
@@ -0,0 +1,9 @@
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# The tests import the backend packages and the data scripts the way the app and the pipeline do
+for path in (os.path.join(ROOT, 'backend'), os.path.join(ROOT, 'data', 'scripts')):
+    if path not in sys.path:
+        sys.path.insert(0, path)
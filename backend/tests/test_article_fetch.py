@@ -0,0 +1,55 @@
+import random
+import sqlite3
+
+import pandas as pd
+import pytest
+
+import core.database as database
+from clean_and_store import clean_papers, store_papers
+from core import config
+from core.database import DatabaseManager
+
+ROWS = 50
+
+
+@pytest.fixture(scope='module')
+def db(tmp_path_factory):
+    db_path = str(tmp_path_factory.mktemp('fetch') / 'arxiv_data.db')
+    conn = sqlite3.connect(db_path)
+    store_papers(conn, clean_papers(pd.DataFrame({
+        'arxiv_id': [f'2401.{i:05d}' for i in range(1, ROWS + 1)],
+        'title': [f'Paper {i}' for i in range(1, ROWS + 1)],
+        'abstract': [f'Abstract of paper {i}, long enough to embed.' for i in range(1, ROWS + 1)],
+        'published': ['2024-01-02'] * ROWS,
+        'doi': [''] * ROWS,
+        'authors': [f"['Author {i}', 'Alice Smith']" for i in range(1, ROWS + 1)],
+        'categories': ['cs.LG'] * ROWS,
+    })))
+    conn.close()
+    return DatabaseManager(db_path)
+
+
+@pytest.mark.parametrize('columns', [None, ['id', 'title', 'authors']])
+def test_chunked_fetch_keeps_input_order_and_every_article(db, monkeypatch, columns):
+    monkeypatch.setattr(config, 'DB_FETCH_CHUNK_SIZE', 7)
+    submitted = []
+    submit = database.fetch_executor.submit
+    monkeypatch.setattr(database.fetch_executor, 'submit', lambda *args: submitted.append(args) or submit(*args))
+    ids = list(range(1, ROWS + 1))
+    random.Random(0).shuffle(ids)
+    articles = db.get_articles_by_ids(ids[:20] + [9999] + ids[20:], columns)
+    assert len(submitted) == 7  # 51 ids in chunks of 7, the first read by the calling thread
+    if columns is None:
+        assert [article.id for article in articles] == ids
+        assert all(article.title == f'Paper {article.id}' for article in articles)
+        assert all(f'Author {article.id}' in article.authors for article in articles)
+    else:
+        assert [article['id'] for article in articles] == ids
+        assert all(list(article) == columns and article['title'] == f"Paper {article['id']}" for article in articles)
+
+
+def test_streamed_fetch_matches_the_chunked_fetch(db, monkeypatch):
+    monkeypatch.setattr(config, 'DB_FETCH_CHUNK_SIZE', 7)
+    ids = list(range(ROWS, 0, -3))
+    streamed = [article for chunk in db.iter_articles_by_ids(ids, chunk_size=4) for article in chunk]
+    assert streamed == db.get_articles_by_ids(ids)
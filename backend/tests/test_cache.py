@@ -0,0 +1,53 @@
+from services.cache import TTLCache, normalize_query
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_least_recently_used_entry_is_evicted_first():
+    cache = TTLCache(2, ttl_seconds=60, clock=Clock())
+    cache.set('a', 1)
+    cache.set('b', 2)
+    assert cache.get('a') == 1  # 'b' is now the least recently used
+    cache.set('c', 3)
+    assert cache.get('b') is None
+    assert cache.get('a') == 1 and cache.get('c') == 3
+    cache.set('a', 10)  # overwriting refreshes, it does not grow the cache
+    cache.set('d', 4)
+    assert cache.get('c') is None and cache.get('a') == 10
+    stats = cache.stats()
+    assert stats['entries'] == 2 and stats['evictions'] == 2
+
+
+def test_entries_expire_after_the_ttl():
+    clock = Clock()
+    cache = TTLCache(8, ttl_seconds=30, clock=clock)
+    cache.set('a', 1)
+    clock.now += 29.9
+    assert cache.get('a') == 1
+    clock.now += 0.1
+    assert cache.get('a') is None
+    stats = cache.stats()
+    assert stats['expirations'] == 1 and stats['entries'] == 0 and stats['memory_bytes'] == 0
+    assert (stats['hits'], stats['misses']) == (1, 1)
+
+
+def test_setting_again_restarts_the_ttl():
+    clock = Clock()
+    cache = TTLCache(8, ttl_seconds=30, clock=clock)
+    cache.set('a', 1)
+    clock.now += 20
+    cache.set('a', 2)
+    clock.now += 20
+    assert cache.get('a') == 2
+
+
+def test_normalize_query():
+    assert normalize_query('  Graph   Neural\tNetworks\n') == 'graph neural networks'
+    assert normalize_query('QUANTUM') == normalize_query('quantum')
+    assert normalize_query(None) == ''
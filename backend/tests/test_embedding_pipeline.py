@@ -0,0 +1,94 @@
+import os
+
+import numpy as np
+
+from embedding_pipeline import EmbeddingStore, ShardStore, content_hash
+
+
+class FakeEncoder:
+    """Deterministic 4-dimensional 'embeddings' that record what they were asked to encode."""
+
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, texts):
+        self.calls.append(list(texts))
+        return np.array([[len(text), ord(text[0]), 1.0, -1.0] for text in texts], dtype=np.float32)
+
+
+def refuse(texts):
+    raise AssertionError(f"encoded {texts}")
+
+
+def test_fetch_or_encode_encodes_each_new_text_once(tmp_path):
+    encode = FakeEncoder()
+    store = EmbeddingStore(str(tmp_path), 'test-model')
+    vectors = store.fetch_or_encode(['alpha', 'beta', 'alpha'], encode)
+    assert encode.calls == [['alpha', 'beta']]
+    np.testing.assert_array_equal(vectors, encode(['alpha', 'beta', 'alpha']))
+    assert (store.hits, store.misses, store.count) == (0, 2, 2)
+
+    encode.calls.clear()
+    vectors = store.fetch_or_encode(['beta', 'gamma', 'gamma'], encode)
+    assert encode.calls == [['gamma']]
+    np.testing.assert_array_equal(vectors, FakeEncoder()(['beta', 'gamma', 'gamma']))
+    assert (store.hits, store.misses, store.count) == (1, 3, 3)
+
+
+def test_store_survives_reopen(tmp_path):
+    store = EmbeddingStore(str(tmp_path), 'test-model', dtype='float16')
+    expected = store.fetch_or_encode(['alpha', 'beta'], FakeEncoder())
+    store.close()
+    store = EmbeddingStore(str(tmp_path), 'test-model', dtype='float32')
+    assert store.dtype == np.float16
+    np.testing.assert_array_equal(store.fetch_or_encode(['beta', 'alpha'], refuse), expected[::-1])
+    assert store.hits == 2
+
+
+def test_vectors_without_hashes_are_truncated_on_open(tmp_path):
+    encode = FakeEncoder()
+    store = EmbeddingStore(str(tmp_path), 'test-model')
+    store.fetch_or_encode(['alpha', 'beta'], encode)
+    store.close()
+    # A run that died after appending vectors but before recording their hashes
+    with open(store.vectors_path, 'ab') as f:
+        f.write(np.ones((3, 4), dtype=np.float32).tobytes())
+    store = EmbeddingStore(str(tmp_path), 'test-model')
+    assert os.path.getsize(store.vectors_path) == 2 * 4 * 4
+    vectors = store.fetch_or_encode(['gamma', 'alpha', 'beta'], encode)
+    np.testing.assert_array_equal(vectors, FakeEncoder()(['gamma', 'alpha', 'beta']))
+    assert store.lookup([content_hash('gamma')]).tolist() == [2]
+
+
+def shard(ids):
+    ids = np.asarray(ids, dtype=np.int64)
+    return ids, np.repeat(ids[:, None].astype(np.float32), 4, axis=1)
+
+
+def test_shard_store_resumes_after_the_last_finished_shard(tmp_path):
+    store = ShardStore(str(tmp_path), 'test-model')
+    store.append(*shard([1, 2, 3]), last_id=3)
+    store.append(*shard([5, 8]), last_id=9)
+    store.set_state('changes_applied', 7)
+    # A shard written after the last checkpoint, by a run that crashed before recording it
+    ids_path = store._shard_paths(2)[1]
+    np.save(ids_path, np.array([10], dtype=np.int64))
+
+    store = ShardStore(str(tmp_path), 'test-model')
+    assert store.last_id == 9 and store.checkpoint['changes_applied'] == 7
+    shards = store.shards()
+    assert [ids.tolist() for ids, _ in shards] == [[1, 2, 3], [5, 8]]
+    np.testing.assert_array_equal(shards[1][1], shard([5, 8])[1])
+    store.append(*shard([11]), last_id=11)
+    assert [ids.tolist() for ids, _ in store.shards()] == [[1, 2, 3], [5, 8], [11]]
+    assert store.checkpoint['vectors'] == 6
+
+
+def test_shard_store_starts_over_for_another_model(tmp_path):
+    store = ShardStore(str(tmp_path), 'test-model')
+    store.append(*shard([1, 2]), last_id=2)
+    store = ShardStore(str(tmp_path), 'other-model')
+    assert store.last_id == 0 and store.shards() == []
+    assert not os.path.exists(store._shard_paths(0)[0])
+    store.append(*shard([1]), last_id=1)
+    assert ShardStore(str(tmp_path), 'other-model').checkpoint['vectors'] == 1
@@ -0,0 +1,107 @@
+import queue
+import threading
+import time
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from services.encoder import BatchingEncoder
+
+
+class FakeModel:
+    """Encodes a text as [its number, its length]; the first call waits until released."""
+
+    def __init__(self):
+        self.batches = []
+        self.started = threading.Event()
+        self.release = threading.Event()
+
+    def encode(self, texts):
+        self.batches.append(list(texts))
+        self.started.set()
+        self.release.wait(5)
+        return [[float(text.split()[-1]), float(len(text))] for text in texts]
+
+
+def wait_for(condition, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.001)
+
+
+def test_concurrent_requests_share_a_batch_and_get_their_own_rows():
+    model = FakeModel()
+    encoder = BatchingEncoder(model, max_batch_size=32, max_wait_ms=50)
+    results = {}
+
+    def encode(name, texts):
+        results[name] = encoder.encode(texts)
+
+    first = threading.Thread(target=encode, args=('first', ['query 0']))
+    first.start()
+    model.started.wait(5)
+    # These queue up while the worker is busy with the first request
+    requests = {'a': ['query 1'], 'b': ['query 2', 'query 3'], 'c': ['query 1']}
+    threads = [threading.Thread(target=encode, args=item) for item in requests.items()]
+    for thread in threads:
+        thread.start()
+    wait_for(lambda: encoder._inflight == 4)
+    model.release.set()
+    for thread in [first] + threads:
+        thread.join(5)
+
+    assert model.batches == [['query 0'], ['query 1', 'query 2', 'query 3']]
+    for name, texts in [('first', ['query 0'])] + list(requests.items()):
+        expected = np.array([[float(text.split()[-1]), float(len(text))] for text in texts], dtype=np.float32)
+        np.testing.assert_array_equal(results[name], expected)
+        assert results[name].dtype == np.float32
+    stats = encoder.stats()
+    assert (stats['requests'], stats['batches'], stats['texts_encoded']) == (4, 2, 4)
+    encoder.close()
+
+
+def test_encode_after_close_raises():
+    model = FakeModel()
+    model.release.set()
+    encoder = BatchingEncoder(model)
+    np.testing.assert_array_equal(encoder.encode(['query 7']), [[7.0, 7.0]])
+    encoder.close()
+    encoder.close()
+    with pytest.raises(RuntimeError):
+        encoder.encode(['query 8'])
+
+
+def test_request_queued_while_closing_is_still_served(monkeypatch):
+    import services.encoder as encoder_module
+    closed = threading.Event()
+    encoders = []
+
+    class RacingQueue(queue.Queue):
+        """Closes the encoder just as the first request is queued."""
+
+        def put(self, item, *args, **kwargs):
+            if item is not None and not closed.is_set():
+                threading.Thread(target=lambda: (encoders[0].close(), closed.set()), daemon=True).start()
+                closed.wait(0.5)
+            super().put(item, *args, **kwargs)
+
+    monkeypatch.setattr(encoder_module, 'queue', SimpleNamespace(Queue=RacingQueue, Empty=queue.Empty))
+    model = FakeModel()
+    model.release.set()
+    encoders.append(BatchingEncoder(model))
+    outcome = []
+
+    def encode():
+        try:
+            outcome.append(encoders[0].encode(['query 3']))
+        except RuntimeError as e:
+            outcome.append(e)
+
+    thread = threading.Thread(target=encode, daemon=True)
+    thread.start()
+    thread.join(5)
+    assert not thread.is_alive(), "request queued behind the stop marker was never answered"
+    assert closed.wait(5)
+    np.testing.assert_array_equal(outcome[0], [[3.0, 7.0]])
@@ -0,0 +1,29 @@
+import os
+
+import numpy as np
+import pytest
+
+from services.encoder_backends import DRIFT_QUERIES, MIN_COSINE, OnnxQueryModel, load_query_model, min_cosine_similarity
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+ONNX_PATH = os.path.join(ROOT, 'data', 'models', 'all-MiniLM-L6-v2-onnx')
+
+
+def test_min_cosine_similarity_is_the_worst_row():
+    reference = np.array([[1.0, 0.0], [0.0, 2.0], [3.0, 4.0]], dtype=np.float32)
+    assert min_cosine_similarity(reference, reference * 5) == pytest.approx(1.0)
+    assert min_cosine_similarity(reference, [[1.0, 0.0], [0.0, 1.0], [4.0, 3.0]]) == pytest.approx(24 / 25)
+    assert min_cosine_similarity(reference, [[0.0, 1.0], [0.0, 1.0], [3.0, 4.0]]) == pytest.approx(0.0)
+
+
+@pytest.mark.parametrize('quantized', [False, True], ids=['onnx', 'onnx-int8'])
+def test_exported_encoder_stays_within_tolerance(quantized):
+    """The exported query encoder must embed queries like the PyTorch model the index was built with."""
+    pytest.importorskip('onnxruntime')
+    pytest.importorskip('sentence_transformers')
+    model_file = 'model_int8.onnx' if quantized else 'model.onnx'
+    if not os.path.exists(os.path.join(ONNX_PATH, model_file)):
+        pytest.skip(f"No exported {model_file}; run data/scripts/export_query_encoder.py")
+    reference = load_query_model('torch').encode(DRIFT_QUERIES)
+    vectors = OnnxQueryModel(ONNX_PATH, quantized=quantized).encode(DRIFT_QUERIES)
+    assert min_cosine_similarity(reference, vectors) >= MIN_COSINE
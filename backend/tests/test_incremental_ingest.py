@@ -0,0 +1,63 @@
+import sqlite3
+
+import numpy as np
+import pandas as pd
+
+from clean_and_store import clean_papers, create_tables, get_high_water_mark, migrate_schema, store_papers
+
+
+def papers(*rows):
+    return pd.DataFrame([{
+        'arxiv_id': arxiv_id,
+        'title': title,
+        'abstract': f'{title}: an abstract long enough to embed.',
+        'published': '2024-01-02',
+        'updated': updated,
+        'doi': '',
+        'authors': "['Alice Smith']",
+        'categories': 'cs.LG',
+    } for arxiv_id, title, updated in rows])
+
+
+def test_revision_updates_the_stored_article():
+    conn = sqlite3.connect(':memory:')
+    store_papers(conn, clean_papers(papers(('2401.01234v1', 'First draft', '2024-01-02'))))
+    with conn:
+        conn.execute('DELETE FROM article_changes')
+    store_papers(conn, clean_papers(papers(('2401.01234v2', 'Revised', '2024-03-05'))))
+    assert conn.execute('SELECT arxiv_id, title FROM articles').fetchall() == [('2401.01234', 'Revised')]
+    # The edited abstract is logged for index_abstracts.py --incremental
+    assert conn.execute('SELECT article_id, deleted FROM article_changes').fetchall() == [(1, 0)]
+
+
+def test_latest_version_in_one_extract_wins():
+    df = clean_papers(papers(('2401.01234v2', 'Revised', '2024-03-05'), ('2401.01234v1', 'First draft', '2024-01-02')))
+    assert df[['arxiv_id', 'title']].values.tolist() == [['2401.01234', 'Revised']]
+
+
+def test_migration_drops_superseded_versions():
+    conn = sqlite3.connect(':memory:')
+    create_tables(conn)
+    conn.executemany('INSERT INTO articles (id, arxiv_id, title) VALUES (?, ?, ?)',
+                     [(1, '2401.01234v1', 'First draft'), (2, '2401.01234v2', 'Revised'), (3, '2401.05678v1', 'Other')])
+    conn.execute('DELETE FROM article_changes')
+    migrate_schema(conn)
+    assert conn.execute('SELECT id, arxiv_id FROM articles ORDER BY id').fetchall() == [(2, '2401.01234'), (3, '2401.05678')]
+    assert conn.execute('SELECT article_id, deleted FROM article_changes').fetchall() == [(1, 1)]
+    migrate_schema(conn)
+    assert conn.execute('SELECT COUNT(*) FROM articles').fetchone()[0] == 2
+
+
+def test_high_water_mark_skipped_without_dates():
+    conn = sqlite3.connect(':memory:')
+    df = papers(('2401.01234v1', 'First draft', np.nan))
+    store_papers(conn, clean_papers(df.assign(published=np.nan)))
+    assert get_high_water_mark(conn) is None
+
+
+def test_high_water_mark_is_the_latest_update():
+    conn = sqlite3.connect(':memory:')
+    assert get_high_water_mark(conn) is None
+    store_papers(conn, clean_papers(papers(('2401.01234v1', 'First draft', '2024-01-02'),
+                                           ('2401.05678v3', 'Other', '2024-03-05'))))
+    assert get_high_water_mark(conn).startswith('2024-03-05')
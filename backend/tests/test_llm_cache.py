@@ -0,0 +1,52 @@
+from llm_cache import LLMResponseCache, normalize_query
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1_700_000_000.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_entries_expire_after_the_ttl(tmp_path):
+    clock = Clock()
+    cache = LLMResponseCache(str(tmp_path / 'llm_cache.db'), ttl_seconds=60, clock=clock)
+    cache.set('key', {'limit': 5})
+    clock.now += 60
+    assert cache.get('key') == {'limit': 5}
+    clock.now += 1
+    assert cache.get('key') is None
+    stats = cache.stats()
+    assert (stats['entries'], stats['hits'], stats['misses']) == (0, 1, 1)
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path):
+    clock = Clock()
+    cache = LLMResponseCache(str(tmp_path / 'llm_cache.db'), max_entries=2, clock=clock)
+    cache.set('a', 1)
+    clock.now += 1
+    cache.set('b', 2)
+    clock.now += 1
+    assert cache.get('a') == 1  # 'b' is now the least recently used
+    clock.now += 1
+    cache.set('c', 3)
+    assert cache.get('b') is None
+    assert cache.get('a') == 1 and cache.get('c') == 3
+    assert cache.stats()['entries'] == 2
+
+
+def test_entries_survive_reopening(tmp_path):
+    path = str(tmp_path / 'llm_cache.db')
+    clock = Clock()
+    key = LLMResponseCache.make_key('model', 0.1, normalize_query('  Graph  NEURAL networks '))
+    cache = LLMResponseCache(path, ttl_seconds=60, clock=clock)
+    cache.set(key, {'keywords': ['graph neural networks']})
+    cache.close()
+
+    cache = LLMResponseCache(path, ttl_seconds=60, clock=clock)
+    assert key == LLMResponseCache.make_key('model', 0.1, normalize_query('graph neural networks'))
+    assert cache.get(key) == {'keywords': ['graph neural networks']}
+    cache.close()
+    clock.now += 61
+    assert LLMResponseCache(path, ttl_seconds=60, clock=clock).get(key) is None
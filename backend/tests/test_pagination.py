@@ -0,0 +1,88 @@
+import sqlite3
+
+import numpy as np
+import pandas as pd
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from clean_and_store import clean_papers, store_papers
+from core import config
+from core.database import DatabaseManager
+from services.ranking import decode_cursor, encode_cursor, paginate
+from services.search_service import SearchService
+
+FILTERS = {'year_filter': '2024', 'category_filter': None, 'author_filter': None,
+           'title_filter': None, 'abstract_filter': None}
+
+
+@pytest.mark.parametrize('offset', [0, 10, 123456])
+def test_cursor_round_trip(offset):
+    cursor = encode_cursor(offset)
+    assert '=' not in cursor
+    assert decode_cursor(cursor) == offset
+
+
+@pytest.mark.parametrize('cursor', ['not a cursor', '', encode_cursor(-1), 'cGFnZTozCg', 'b2Zmc2V0OmFiYw'])
+def test_malformed_or_negative_cursor_is_rejected(cursor):
+    # 'cGFnZTozCg' is "page:3", 'b2Zmc2V0OmFiYw' is "offset:abc"
+    with pytest.raises(ValueError):
+        decode_cursor(cursor)
+
+
+def test_paginate_ranks_by_score_before_slicing():
+    ids = np.array([10, 20, 30, 40, 50])
+    scores = np.array([0.1, 0.9, 0.5, 0.7, 0.3], dtype=np.float32)
+    page_ids, page_scores = paginate(ids, scores, limit=2, offset=1)
+    assert page_ids.tolist() == [40, 30]
+    np.testing.assert_allclose(page_scores, [0.7, 0.5])
+    assert paginate(ids, None, limit=2, offset=4)[0].tolist() == [50]
+
+
+@pytest.fixture
+def service(tmp_path, monkeypatch):
+    db_path = str(tmp_path / 'arxiv_data.db')
+    conn = sqlite3.connect(db_path)
+    store_papers(conn, clean_papers(pd.DataFrame({
+        'arxiv_id': [f'2401.0000{i}' for i in range(1, 6)],
+        'title': [f'Paper {i}' for i in range(1, 6)],
+        'abstract': [f'Abstract of paper {i}, long enough to embed.' for i in range(1, 6)],
+        'published': [f'2024-01-0{i}' for i in range(1, 6)],
+        'doi': [''] * 5,
+        'authors': ["['Alice Smith']"] * 5,
+        'categories': ['cs.LG'] * 5,
+    })))
+    conn.close()
+    monkeypatch.setattr(config, 'INDEX_RELOAD_INTERVAL_SECONDS', 0)
+    service = SearchService()
+    service.db_manager = DatabaseManager(db_path)
+    return service
+
+
+def test_pages_follow_next_cursor_to_the_last_page(service):
+    seen, offset, cursors = [], 0, 0
+    while True:
+        page = service.manual_search('', FILTERS, limit=2, offset=offset)
+        seen += [article.id for article in page['articles']]
+        assert page['candidates'] == 5
+        if page['next_cursor'] is None:
+            break
+        offset = decode_cursor(page['next_cursor'])
+        cursors += 1
+    assert cursors == 2 and len(page['articles']) == 1
+    assert sorted(seen) == [1, 2, 3, 4, 5]
+
+
+def test_cursor_overrides_offset(service, monkeypatch):
+    from api import routes
+    monkeypatch.setattr(routes, 'search_service', service)
+    app = FastAPI()
+    app.include_router(routes.router)
+    client = TestClient(app)
+    request = {'query': '', 'year_filter': '2024', 'limit': 2, 'offset': 0}
+    first = client.post('/search', json=request).json()
+    response = client.post('/search', json={**request, 'cursor': encode_cursor(4)}).json()
+    assert response['offset'] == 4 and response['next_cursor'] is None
+    assert len(response['articles']) == 1
+    assert response['articles'][0]['id'] not in [article['id'] for article in first['articles']]
+    assert client.post('/search', json={**request, 'cursor': 'not a cursor'}).status_code == 400
@@ -0,0 +1,54 @@
+from typing import get_args
+
+import pytest
+from pydantic import ValidationError
+
+from core.database import ARTICLE_COLUMNS
+from models.schemas import ArticleField, SearchRequest
+from services.projection import make_snippet, project, projected_columns, snippet_pattern
+
+ABSTRACT = ' '.join(f'word{i}' for i in range(200)) + ' surface codes protect quantum memories ' + \
+    ' '.join(f'tail{i}' for i in range(200))
+
+
+def test_article_fields_are_the_columns_plus_score_and_snippet():
+    assert get_args(ArticleField) == ARTICLE_COLUMNS + ('score', 'snippet')
+
+
+def test_snippet_is_a_window_around_the_first_match():
+    snippet = make_snippet(ABSTRACT, snippet_pattern('Quantum memory'), length=100)
+    assert snippet.startswith('…') and snippet.endswith('…')
+    assert 'quantum memories' in snippet
+    # Cut at word boundaries, with some context before the match
+    words = snippet.strip('…').split()
+    assert all(word in ABSTRACT.split() for word in words)
+    assert words.index('quantum') > 0
+    assert len(snippet) <= 102
+
+
+def test_snippet_without_a_match_is_the_start_of_the_text():
+    snippet = make_snippet(ABSTRACT, snippet_pattern('graphene'), length=50)
+    assert snippet.startswith('word0 word1') and snippet.endswith('…')
+    assert make_snippet(ABSTRACT, None, length=50) == snippet
+    assert snippet_pattern('', None, 'an') is None
+    assert make_snippet('Short\nabstract.', None) == 'Short abstract.'
+    assert make_snippet(None, None) == ''
+
+
+def test_project_keeps_the_id_and_requested_fields_in_order():
+    row = {'id': 7, 'title': 'Surface codes', 'abstract': ABSTRACT, 'published': '2024-01-02'}
+    assert project(row, ['published', 'score', 'title'], 0.5, None) == \
+        {'id': 7, 'published': '2024-01-02', 'score': 0.5, 'title': 'Surface codes'}
+    assert list(project(row, ['snippet'], None, snippet_pattern('quantum'))) == ['id', 'snippet']
+    assert projected_columns(['snippet', 'title']) == ['id', 'title', 'abstract']
+
+
+def test_empty_fields_project_to_the_id():
+    assert projected_columns([]) == ['id']
+    assert project({'id': 7, 'title': 'Surface codes'}, [], None, None) == {'id': 7}
+
+
+def test_unknown_fields_are_rejected_by_the_request_schema():
+    with pytest.raises(ValidationError):
+        SearchRequest(query='quantum', fields=['title', 'doi'])
+    assert SearchRequest(query='quantum', fields=['title', 'snippet']).fields == ['title', 'snippet']
@@ -0,0 +1,48 @@
+import sqlite3
+
+import pandas as pd
+import pytest
+
+from clean_and_store import clean_papers, store_papers
+from core import config
+from core.database import DatabaseManager
+from services.search_service import SearchService
+
+FILTERS = {'year_filter': None, 'category_filter': None, 'author_filter': None,
+           'title_filter': None, 'abstract_filter': None}
+
+
+@pytest.fixture
+def service(tmp_path, monkeypatch):
+    db_path = str(tmp_path / 'arxiv_data.db')
+    conn = sqlite3.connect(db_path)
+    store_papers(conn, clean_papers(pd.DataFrame({
+        'arxiv_id': ['2401.00001', '2401.00002'],
+        'title': ['Quantum error correction', 'Graph neural networks'],
+        'abstract': ['Surface codes protect quantum memories.', 'Message passing over graphs.'],
+        'published': ['2024-01-02', '2024-01-03'],
+        'doi': ['', ''],
+        'authors': ["['Alice Smith']", "['Bob Wang']"],
+        'categories': ['physics.quant-ph', 'cs.LG'],
+    })))
+    conn.close()
+    monkeypatch.setattr(config, 'INDEX_PATH', str(tmp_path / 'missing.index'))
+    monkeypatch.setattr(config, 'INDEX_RELOAD_INTERVAL_SECONDS', 0)
+    service = SearchService()
+    service.db_manager = DatabaseManager(db_path)
+    return service
+
+
+def test_keyword_answers_are_warming_while_loading(service):
+    result = service.manual_search('quantum', FILTERS, limit=10)
+    assert [article.id for article in result['articles']] == [1]
+    assert result['warming'] is True and result['degraded'] is False
+
+
+def test_keyword_answers_are_degraded_after_a_failed_load(service):
+    with pytest.raises(FileNotFoundError):
+        service.start(background=False)
+    assert service.status()['state'] == 'failed'
+    result = service.manual_search('quantum', FILTERS, limit=10)
+    assert [article.id for article in result['articles']] == [1]
+    assert result['warming'] is False and result['degraded'] is True
@@ -0,0 +1,49 @@
+import sqlite3
+
+import pandas as pd
+
+from clean_and_store import clean_papers, refresh_stats, store_papers
+
+RAW_PAPERS = [
+    ('2401.00001v1', 'cs.LG, stat.ML'),
+    ('2401.00002v1', 'stat.ML'),
+    ('2401.00003v1', 'physics, physics.quant-ph'),
+    ('2401.00004v1', 'physics.quant-ph, cs.LG'),
+    ('2401.00005v1', 'cs.AI, cs.LG, stat.ML, math'),
+]
+
+
+def sample_db():
+    df = pd.DataFrame({
+        'arxiv_id': [arxiv_id for arxiv_id, _ in RAW_PAPERS],
+        'title': [f'Paper {i}' for i in range(len(RAW_PAPERS))],
+        'abstract': [f'Abstract of paper {i}, long enough to embed.' for i in range(len(RAW_PAPERS))],
+        'published': ['2024-01-0%d' % (i + 1) for i in range(len(RAW_PAPERS))],
+        'doi': [''] * len(RAW_PAPERS),
+        'authors': ["['Alice Smith', 'Bob Wang']"] * len(RAW_PAPERS),
+        'categories': [categories for _, categories in RAW_PAPERS],
+    })
+    conn = sqlite3.connect(':memory:')
+    store_papers(conn, clean_papers(df))
+    return conn
+
+
+def test_category_counts_match_papers_in_category():
+    conn = sample_db()
+    counts = dict(conn.execute('SELECT category, papers FROM stats_by_category'))
+    assert counts['Machine Learning'] == 4
+    for name, papers in counts.items():
+        # Whole names only: 'Physics' must not match 'Quantum Physics'
+        expected = conn.execute("SELECT COUNT(*) FROM articles WHERE ', ' || categories || ', ' LIKE ?",
+                                (f'%, {name}, %',)).fetchone()[0]
+        assert papers == expected, name
+
+
+def test_category_counts_ignore_names_repeated_in_old_rows():
+    conn = sample_db()
+    updated = conn.execute("UPDATE articles SET categories = 'Machine Learning, Machine Learning' "
+                           "WHERE arxiv_id = '2401.00002'")
+    assert updated.rowcount == 1
+    refresh_stats(conn)
+    papers = conn.execute("SELECT papers FROM stats_by_category WHERE category = 'Machine Learning'").fetchone()[0]
+    assert papers == 4
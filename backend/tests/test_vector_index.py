@@ -0,0 +1,130 @@
+import threading
+
+import faiss
+import numpy as np
+import pytest
+
+from services.vector_index import VectorIndex
+
+
+def ivf_index(tmp_path, rows=2000, dimension=16, id_mapped=False):
+    vectors = np.random.default_rng(0).standard_normal((rows, dimension)).astype(np.float32)
+    faiss.normalize_L2(vectors)
+    index = faiss.IndexIVFFlat(faiss.IndexFlatIP(dimension), dimension, 16, faiss.METRIC_INNER_PRODUCT)
+    index.train(vectors)
+    article_ids = np.arange(1, rows + 1, dtype=np.int64) * 10
+    if id_mapped:
+        index.add_with_ids(vectors, article_ids)
+    else:
+        index.add(vectors)
+    index.nprobe = 16
+    faiss.write_index(index, str(tmp_path / 'index.faiss'))
+    np.save(tmp_path / 'ids.npy', article_ids)
+    if id_mapped:
+        (tmp_path / 'index.meta.json').write_text('{"id_mapped": true}')
+    return vectors, article_ids
+
+
+def test_ivf_direct_map_is_built_at_load(tmp_path):
+    for id_mapped in (False, True):
+        vectors, article_ids = ivf_index(tmp_path, id_mapped=id_mapped)
+        index = VectorIndex.load(str(tmp_path / 'index.faiss'), str(tmp_path / 'ids.npy'), mmap=False)
+        assert index._can_reconstruct is True
+        allowed = article_ids[::50]
+        D, I = index.search_filtered(vectors[:4], allowed, 5, strategy='brute_force')
+        D_sel, I_sel = index.search_filtered(vectors[:4], allowed, 5, strategy='selector')
+        np.testing.assert_array_equal(I, I_sel)
+        assert index.plan_counts['brute_force'] == 1
+
+
+def test_concurrent_first_filtered_searches(tmp_path):
+    vectors, article_ids = ivf_index(tmp_path)
+    index = VectorIndex.load(str(tmp_path / 'index.faiss'), str(tmp_path / 'ids.npy'), mmap=False)
+    index._can_reconstruct = None
+    faiss.extract_index_ivf(index.index).set_direct_map_type(faiss.DirectMap.NoMap)
+    results, errors = [], []
+
+    def search(q):
+        try:
+            results.append(index.search_filtered(vectors[q:q + 1], article_ids[::40], 3, strategy='brute_force')[1])
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=search, args=(q,)) for q in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert not errors and len(results) == 8
+    assert index.plan_counts['brute_force'] == 8
+
+
+def test_planner_chooses_by_candidate_size_and_selectivity(tmp_path, monkeypatch):
+    from core import config
+    vectors, article_ids = ivf_index(tmp_path)
+    index = VectorIndex.load(str(tmp_path / 'index.faiss'), str(tmp_path / 'ids.npy'), mmap=False)
+    # Room for 100 candidate vectors of 16 float32s
+    monkeypatch.setattr(config, 'PLANNER_BRUTE_FORCE_MAX_BYTES', 100 * 16 * 4)
+    monkeypatch.setattr(config, 'PLANNER_SELECTOR_MAX_SELECTIVITY', 0.3)
+    for allowed, strategy in ((article_ids[:100], 'brute_force'), (article_ids[:400], 'selector'),
+                              (article_ids[:1200], 'overfetch')):
+        index.search_filtered(vectors[:2], allowed, 5)
+        assert index.plan_counts[strategy] == 1, strategy
+    assert index.plan(101) == 'selector'
+
+    # Indexes that cannot reconstruct vectors never brute-force
+    index._can_reconstruct = False
+    assert index.plan(10) == 'selector'
+
+
+def test_default_brute_force_budget_is_a_few_thousand_vectors():
+    flat = faiss.IndexFlatIP(384)
+    flat.add(np.zeros((10_000, 384), dtype=np.float32))
+    index = VectorIndex(flat, np.arange(10_000, dtype=np.int64), {})
+    assert index.plan(2000) == 'brute_force'
+    assert index.plan(5000) != 'brute_force'
+
+
+def published_flat_index(tmp_path):
+    from index_builder import write_index_manifest, write_index_metadata
+    vectors = np.random.default_rng(1).standard_normal((100, 8)).astype(np.float32)
+    index = faiss.IndexFlatIP(8)
+    index.add(vectors)
+    index_path, ids_path = str(tmp_path / 'index.faiss'), str(tmp_path / 'ids.npy')
+    faiss.write_index(index, index_path)
+    np.save(ids_path, np.arange(1, 101, dtype=np.int64))
+    write_index_metadata(index_path, index, 'flat', 'test-model', {}, {})
+    write_index_manifest(index_path, ids_path, index.ntotal)
+    return index_path, ids_path
+
+
+def test_load_checks_sizes_and_hashes_only_when_asked(tmp_path, monkeypatch):
+    import services.vector_index as vector_index
+    from services.vector_index import IndexVersionMismatch
+    index_path, ids_path = published_flat_index(tmp_path)
+
+    def no_hashing(path):
+        raise AssertionError(f"{path} was hashed")
+
+    monkeypatch.setattr(vector_index, 'file_sha256', no_hashing)
+    assert VectorIndex.load(index_path, ids_path).version is not None
+    with open(tmp_path / 'index.meta.json', 'a') as f:
+        f.write(' ')
+    with pytest.raises(IndexVersionMismatch):
+        VectorIndex.load(index_path, ids_path)
+    monkeypatch.undo()
+
+    index_path, ids_path = published_flat_index(tmp_path)
+    with open(ids_path, 'r+b') as f:
+        f.seek(-1, 2)
+        f.write(b'\x01')
+    VectorIndex.load(index_path, ids_path)
+    with pytest.raises(IndexVersionMismatch):
+        VectorIndex.load(index_path, ids_path, verify_checksums=True)
+
+
+def test_builder_and_api_share_index_file_names():
+    import index_builder
+    import services.vector_index as vector_index
+    assert index_builder.metadata_path is vector_index.metadata_path
+    assert index_builder.file_sha256 is vector_index.file_sha256
@@ -0,0 +1,83 @@
+"""
+Recall@k vs latency of the approximate index types against the exact flat index.
+
+Uses clustered synthetic embeddings by default, or real ones saved with np.save:
+
+    python benchmarks/bench_ann_index.py --vectors 200000 --dimension 384
+    python benchmarks/bench_ann_index.py --vectors-file embeddings.npy
+"""
+import argparse
+import time
+
+import numpy as np
+
+from synthetic import add_backend_to_path
+
+add_backend_to_path()
+from index_builder import build_index  # noqa: E402
+from services.vector_index import apply_search_params  # noqa: E402
+
+SWEEPS = {
+    'ivf_flat': ('nprobe', [1, 4, 16, 64]),
+    'ivf_pq': ('nprobe', [1, 4, 16, 64]),
+    'hnsw': ('ef_search', [16, 32, 64, 128]),
+}
+
+
+def clustered_vectors(n, dimension, clusters=256, seed=0):
+    rng = np.random.default_rng(seed)
+    centers = rng.standard_normal((clusters, dimension)).astype(np.float32)
+    vectors = centers[rng.integers(0, clusters, n)] + 0.6 * rng.standard_normal((n, dimension)).astype(np.float32)
+    vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors
+
+
+def timed_search(index, queries, k):
+    start = time.perf_counter()
+    _, I = index.search(queries, k)
+    return I, (time.perf_counter() - start) * 1000 / len(queries)
+
+
+def recall_at_k(found, truth):
+    return np.mean([len(set(f) & set(t)) / len(t) for f, t in zip(found, truth)])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--vectors', type=int, default=200_000)
+    parser.add_argument('--dimension', type=int, default=384)
+    parser.add_argument('--vectors-file', help='Benchmark on saved embeddings (.npy) instead of synthetic ones')
+    parser.add_argument('--queries', type=int, default=1000)
+    parser.add_argument('--k', type=int, default=10)
+    parser.add_argument('--types', nargs='+', default=list(SWEEPS))
+    args = parser.parse_args()
+
+    if args.vectors_file:
+        vectors = np.load(args.vectors_file).astype(np.float32)
+    else:
+        vectors = clustered_vectors(args.vectors, args.dimension)
+    rng = np.random.default_rng(1)
+    queries = vectors[rng.choice(len(vectors), args.queries, replace=False)]
+    queries = queries + 0.05 * rng.standard_normal(queries.shape).astype(np.float32)
+    queries /= np.linalg.norm(queries, axis=1, keepdims=True)
+
+    flat = build_index(vectors, 'flat')
+    truth, flat_ms = timed_search(flat, queries, args.k)
+    print(f"{len(vectors)} vectors, {args.queries} queries, recall@{args.k}")
+    print(f"{'index':<10} {'param':<14} {'build s':>8} {'ms/query':>9} {'recall':>7} {'speedup':>8}")
+    print(f"{'flat':<10} {'-':<14} {'-':>8} {flat_ms:>9.3f} {1.0:>7.3f} {1.0:>7.1f}x")
+
+    for index_type in args.types:
+        start = time.perf_counter()
+        index = build_index(vectors, index_type)
+        build_seconds = time.perf_counter() - start
+        param, values = SWEEPS[index_type]
+        for value in values:
+            apply_search_params(index, **{param: value})
+            found, ms = timed_search(index, queries, args.k)
+            print(f"{index_type:<10} {f'{param}={value}':<14} {build_seconds:>8.1f} {ms:>9.3f} "
+                  f"{recall_at_k(found, truth):>7.3f} {flat_ms / ms:>7.1f}x")
+
+
+if __name__ == '__main__':
+    main()
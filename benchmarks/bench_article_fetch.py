@@ -0,0 +1,108 @@
+"""
+Cost of fetching article details for a set of ids: the previous single query
+(one placeholder per id, GROUP_CONCAT join over article_authors/authors)
+against the json_each id list reading the denormalized author_names column,
+in one query and split into chunks read in parallel on pooled connections.
+
+Usage: python benchmarks/bench_article_fetch.py [--rows 100000] [--sizes 20 150 600 5000]
+
+600 ids is an unfiltered AI search (four query variations of 150 results).
+Runs on a migrated copy of the synthetic corpus and checks that every path
+returns the same articles and authors.
+"""
+import argparse
+import os
+import shutil
+import sqlite3
+import statistics
+import tempfile
+import time
+
+import numpy as np
+
+from synthetic import add_backend_to_path, build_corpus
+
+add_backend_to_path()
+from clean_and_store import create_secondary_indexes, migrate_schema  # noqa: E402
+from core import config  # noqa: E402
+from core.database import DatabaseManager, article_row  # noqa: E402
+
+
+def legacy_articles(db, article_ids):
+    """The previous get_articles_by_ids query."""
+    placeholders = ','.join('?' for _ in article_ids)
+    query = f"""
+        SELECT a.id, a.title, a.abstract, a.published, a.categories,
+               GROUP_CONCAT(au.name, '; ') as authors
+        FROM articles a
+        LEFT JOIN article_authors aa ON a.id = aa.article_id
+        LEFT JOIN authors au ON aa.author_id = au.id
+        WHERE a.id IN ({placeholders})
+        GROUP BY a.id, a.title, a.abstract, a.published, a.categories
+        ORDER BY a.published DESC
+    """
+    with db.get_connection() as conn:
+        cursor = conn.cursor()
+        cursor.row_factory = article_row
+        return cursor.execute(query, article_ids).fetchall()
+
+
+def chunked_articles(db, article_ids, chunk_size):
+    config.DB_FETCH_CHUNK_SIZE = chunk_size
+    return db.get_articles_by_ids(article_ids)
+
+
+def signature(articles):
+    return sorted((a.id, frozenset((a.authors or '').split('; '))) for a in articles)
+
+
+def measure(label, func, calls):
+    func()
+    latencies = []
+    for _ in range(calls):
+        start = time.perf_counter()
+        func()
+        latencies.append(time.perf_counter() - start)
+    print(f"  {label:<30} p50 {statistics.median(latencies) * 1e3:>8.3f} ms  "
+          f"p95 {np.percentile(latencies, 95) * 1e3:>8.3f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--rows', type=int, default=100_000)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[20, 150, 600, 5000])
+    parser.add_argument('--calls', type=int, default=100)
+    parser.add_argument('--chunk-size', type=int, default=config.DB_FETCH_CHUNK_SIZE)
+    args = parser.parse_args()
+
+    legacy_path = os.path.join(tempfile.gettempdir(), f'arxiv_bench_{args.rows}.db')
+    if not os.path.exists(legacy_path):
+        build_corpus(legacy_path, args.rows)
+    db_path = os.path.join(tempfile.gettempdir(), f'arxiv_bench_{args.rows}_migrated.db')
+    if not os.path.exists(db_path):
+        shutil.copyfile(legacy_path, db_path)
+    conn = sqlite3.connect(db_path)
+    migrate_schema(conn)  # adds author_names to copies migrated before it existed
+    create_secondary_indexes(conn)
+    conn.close()
+
+    db = DatabaseManager(db_path)
+    print(f"{args.rows} articles, json_each: {db.has_json_each()}, author_names: {db.has_author_names()}, "
+          f"{config.DB_FETCH_WORKERS} fetch workers")
+    rng = np.random.default_rng(0)
+    for size in args.sizes:
+        ids = rng.choice(np.arange(1, args.rows + 1), size=min(size, args.rows), replace=False).tolist()
+        expected = signature(legacy_articles(db, ids))
+        for chunk_size in (len(ids), args.chunk_size):
+            assert signature(chunked_articles(db, ids, chunk_size)) == expected, "results differ"
+        print(f"-- {len(ids)} ids")
+        calls = max(5, args.calls * 20 // max(20, len(ids)))
+        measure('placeholders + GROUP_CONCAT', lambda: legacy_articles(db, ids), calls)
+        measure('json_each + author_names', lambda: chunked_articles(db, ids, len(ids)), calls)
+        if len(ids) > args.chunk_size:
+            measure(f'  in parallel chunks of {args.chunk_size}',
+                    lambda: chunked_articles(db, ids, args.chunk_size), calls)
+
+
+if __name__ == '__main__':
+    main()
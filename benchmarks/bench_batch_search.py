@@ -0,0 +1,59 @@
+"""
+Throughput of POST /search/batch against the same queries sent one by one to
+POST /search, on a running API.
+
+    python benchmarks/bench_batch_search.py --url http://localhost:8000/api/v1 --batch-sizes 10 100 500
+
+Every run uses fresh random queries so the embedding and result caches do
+not answer them.
+"""
+import argparse
+import random
+import time
+
+import httpx
+
+from synthetic import VOCABULARY
+
+
+def random_queries(count, seed):
+    rng = random.Random(seed)
+    return [' '.join(rng.sample(VOCABULARY, rng.randint(2, 4))) for _ in range(count)]
+
+
+def sequential(client, queries, limit, filters):
+    start = time.perf_counter()
+    for query in queries:
+        client.post('/search', json={'query': query, 'limit': limit, **filters}).raise_for_status()
+    return time.perf_counter() - start
+
+
+def batched(client, queries, limit, filters):
+    start = time.perf_counter()
+    response = client.post('/search/batch', json={'queries': queries, 'limit': limit, **filters})
+    response.raise_for_status()
+    assert len(response.json()['results']) == len(queries)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--url', default='http://localhost:8000/api/v1')
+    parser.add_argument('--batch-sizes', type=int, nargs='+', default=[10, 100, 500])
+    parser.add_argument('--limit', type=int, default=10)
+    parser.add_argument('--year', help="Also apply this year filter to every query")
+    args = parser.parse_args()
+    filters = {'year_filter': args.year} if args.year else {}
+
+    seed = int(time.time())
+    print(f"{'queries':>8} {'sequential q/s':>15} {'batch q/s':>10} {'speedup':>8}")
+    with httpx.Client(base_url=args.url, timeout=600) as client:
+        for size in args.batch_sizes:
+            one_by_one = sequential(client, random_queries(size, seed), args.limit, filters)
+            at_once = batched(client, random_queries(size, seed + 1), args.limit, filters)
+            seed += 2
+            print(f"{size:>8} {size / one_by_one:>15.1f} {size / at_once:>10.1f} {one_by_one / at_once:>7.1f}x")
+
+
+if __name__ == '__main__':
+    main()
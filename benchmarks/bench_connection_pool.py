@@ -0,0 +1,70 @@
+"""
+Benchmark per-call sqlite3.connect against the pooled read-only connections.
+
+Usage: python benchmarks/bench_connection_pool.py [--rows 100000] [--calls 2000] [--threads 8]
+"""
+import argparse
+import os
+import sqlite3
+import statistics
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from synthetic import add_backend_to_path, build_corpus
+
+add_backend_to_path()
+from core.pool import ConnectionPool  # noqa: E402
+
+QUERY = "SELECT id, title FROM articles WHERE id = ?"
+
+
+def fresh_connection_call(db_path, article_id):
+    conn = sqlite3.connect(db_path)
+    try:
+        return conn.execute(QUERY, (article_id,)).fetchone()
+    finally:
+        conn.close()
+
+
+def pooled_call(pool, article_id):
+    with pool.connection() as conn:
+        return conn.execute(QUERY, (article_id,)).fetchone()
+
+
+def run(label, func, calls, threads):
+    latencies = []
+
+    def timed(i):
+        start = time.perf_counter()
+        func(i % 1000 + 1)
+        latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        list(executor.map(timed, range(calls)))
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+    print(f"{label:<18} {calls / elapsed:>10.0f} calls/s  p50 {statistics.median(latencies) * 1e6:>8.1f}us  "
+          f"p99 {latencies[int(len(latencies) * 0.99) - 1] * 1e6:>8.1f}us")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--rows', type=int, default=100_000)
+    parser.add_argument('--calls', type=int, default=2000)
+    parser.add_argument('--threads', type=int, default=8)
+    args = parser.parse_args()
+
+    db_path = os.path.join(tempfile.gettempdir(), f'arxiv_bench_{args.rows}.db')
+    if not os.path.exists(db_path):
+        build_corpus(db_path, args.rows)
+
+    run('sqlite3.connect', lambda i: fresh_connection_call(db_path, i), args.calls, args.threads)
+    pool = ConnectionPool(db_path, max_size=args.threads)
+    run('ConnectionPool', lambda i: pooled_call(pool, i), args.calls, args.threads)
+    print(f"pool stats: {pool.stats()}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,97 @@
+"""
+Cold start, memory and per-query latency of the query encoder backends, plus how far
+their embeddings drift from the PyTorch model the index was built with.
+
+Usage: python benchmarks/bench_encoder_backends.py [--backends torch torch-int8 onnx onnx-int8] [--queries 200]
+
+Each backend is loaded in a fresh interpreter so import time counts towards cold
+start. The onnx backends need the export from data/scripts/export_query_encoder.py.
+"""
+import argparse
+import multiprocessing
+import random
+import statistics
+import time
+
+import numpy as np
+
+from synthetic import add_backend_to_path, VOCABULARY
+
+add_backend_to_path()
+from services.encoder_backends import MIN_COSINE, min_cosine_similarity  # noqa: E402
+
+
+def rss_mb():
+    with open('/proc/self/status') as f:
+        for line in f:
+            if line.startswith('VmRSS:'):
+                return int(line.split()[1]) / 1024
+    return 0.0
+
+
+def worker(backend, queries, results):
+    try:
+        results.put(measure(backend, queries))
+    except Exception as e:
+        results.put(e)
+
+
+def measure(backend, queries):
+    start = time.perf_counter()
+    from services.encoder_backends import load_query_model
+    model = load_query_model(backend)
+    model.encode(['warm up'])
+    cold_start = time.perf_counter() - start
+    latencies = []
+    for query in queries:
+        started = time.perf_counter()
+        model.encode([query])
+        latencies.append(time.perf_counter() - started)
+    latencies.sort()
+    embeddings = np.asarray(model.encode(queries), dtype=np.float32)
+    return (cold_start, rss_mb(), statistics.median(latencies) * 1000,
+            latencies[int(len(latencies) * 0.99) - 1] * 1000, embeddings)
+
+
+def run(backend, queries):
+    context = multiprocessing.get_context('spawn')
+    results = context.Queue()
+    proc = context.Process(target=worker, args=(backend, queries, results))
+    proc.start()
+    try:
+        result = results.get(timeout=600)
+    finally:
+        proc.join()
+    if isinstance(result, Exception):
+        raise result
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--backends', nargs='+', default=['torch', 'torch-int8', 'onnx', 'onnx-int8'])
+    parser.add_argument('--queries', type=int, default=200)
+    parser.add_argument('--min-cosine', type=float, default=MIN_COSINE)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    queries = [' '.join(rng.sample(VOCABULARY, rng.randint(1, 6))) for _ in range(args.queries)]
+    reference = None
+    print(f"{'backend':<11} {'cold start s':>12} {'RSS MB':>8} {'p50 ms':>8} {'p99 ms':>8} {'min cosine':>11}")
+    for backend in args.backends:
+        try:
+            cold_start, rss, p50, p99, embeddings = run(backend, queries)
+        except Exception as e:
+            print(f"{backend:<11} failed: {e}")
+            continue
+        if reference is None:
+            reference = embeddings
+        cosine = min_cosine_similarity(reference, embeddings)
+        flag = '' if cosine >= args.min_cosine else '  BELOW TOLERANCE'
+        print(f"{backend:<11} {cold_start:>12.2f} {rss:>8.0f} {p50:>8.2f} {p99:>8.2f} {cosine:>11.5f}{flag}")
+    print(f"cosine is measured against the first backend ({args.backends[0]}); "
+          f"indexes are compatible above {args.min_cosine}")
+
+
+if __name__ == '__main__':
+    main()
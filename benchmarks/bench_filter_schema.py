@@ -0,0 +1,76 @@
+"""
+Filtered search on the legacy schema versus the migrated one (indexed year
+column, article_categories, author indexes).
+
+Usage: python benchmarks/bench_filter_schema.py [--rows 200000] [--repeat 20]
+
+backend/tests/test_query_plans.py asserts that these filters no longer scan
+the articles or link tables on the migrated schema.
+"""
+import argparse
+import os
+import shutil
+import sqlite3
+import statistics
+import tempfile
+import time
+
+from synthetic import add_backend_to_path, build_corpus
+
+add_backend_to_path()
+from clean_and_store import create_secondary_indexes, migrate_schema  # noqa: E402
+from core.database import DatabaseManager  # noqa: E402
+
+FILTERS = {
+    'year': {'year_filter': '2023'},
+    'category': {'category_filter': 'Quantum Physics'},
+    'category code': {'category_filter': 'physics.quant-ph'},
+    'author': {'author_filter': 'Sato42'},
+    'year + category': {'year_filter': '2023', 'category_filter': 'Optics'},
+    'year + author': {'year_filter': '2023', 'author_filter': 'Sato42'},
+}
+
+
+def time_filters(db, repeat):
+    timings = {}
+    for label, filters in FILTERS.items():
+        latencies = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            ids = db.search_articles(filters)
+            latencies.append(time.perf_counter() - start)
+        timings[label] = (statistics.median(latencies), len(ids))
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--rows', type=int, default=200_000)
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    legacy_path = os.path.join(tempfile.gettempdir(), f'arxiv_bench_{args.rows}.db')
+    if not os.path.exists(legacy_path):
+        build_corpus(legacy_path, args.rows)
+    migrated_path = os.path.join(tempfile.gettempdir(), f'arxiv_bench_{args.rows}_migrated.db')
+    shutil.copyfile(legacy_path, migrated_path)
+    conn = sqlite3.connect(migrated_path)
+    start = time.perf_counter()
+    migrate_schema(conn)
+    create_secondary_indexes(conn)
+    conn.close()
+    print(f"Migrated {args.rows} rows in {time.perf_counter() - start:.2f} s")
+
+    # Category and author filters are answered by FTS when it exists; compare the SQL paths
+    legacy = DatabaseManager(legacy_path, use_fts=False)
+    migrated = DatabaseManager(migrated_path, use_fts=False)
+    before = time_filters(legacy, args.repeat)
+    after = time_filters(migrated, args.repeat)
+    print(f"{'filter':<16} {'legacy ms':>10} {'migrated ms':>12} {'matches':>16}")
+    for label in FILTERS:
+        (old_time, old_count), (new_time, new_count) = before[label], after[label]
+        print(f"{label:<16} {old_time * 1e3:>10.2f} {new_time * 1e3:>12.2f} {old_count:>7} -> {new_count:<7}")
+
+
+if __name__ == '__main__':
+    main()
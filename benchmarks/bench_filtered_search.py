@@ -0,0 +1,71 @@
+"""
+Filtered vector search: latency and recall of each planner strategy, and of the old
+"top-200 then intersect" approach, for filters of different selectivity.
+
+Usage: python benchmarks/bench_filtered_search.py [--vectors 500000] [--k 20]
+"""
+import argparse
+import time
+
+import numpy as np
+
+from synthetic import add_backend_to_path
+
+add_backend_to_path()
+import faiss  # noqa: E402
+from services.vector_index import VectorIndex  # noqa: E402
+
+SELECTIVITIES = [0.0001, 0.001, 0.01, 0.1, 0.5]
+STRATEGIES = ['intersect', 'brute_force', 'selector', 'overfetch', 'auto']
+
+
+def intersect_search(vector_index, queries, allowed_ids, k, fetch=200):
+    """The previous approach: fixed top-200, then keep the allowed ids."""
+    _, ids = vector_index.search(queries, fetch)
+    keep = np.isin(ids, allowed_ids)
+    return [row[mask][:k] for row, mask in zip(ids, keep)]
+
+
+def recall(found, truth):
+    return np.mean([len(set(f.tolist()) & set(t.tolist())) / max(1, len(t)) for f, t in zip(found, truth)])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--vectors', type=int, default=500_000)
+    parser.add_argument('--dimension', type=int, default=384)
+    parser.add_argument('--queries', type=int, default=50)
+    parser.add_argument('--k', type=int, default=20)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    vectors = rng.standard_normal((args.vectors, args.dimension), dtype=np.float32)
+    vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+    index = faiss.IndexFlatIP(args.dimension)
+    index.add(vectors)
+    article_ids = rng.permutation(args.vectors * 2)[:args.vectors].astype(np.int64) + 1
+    vector_index = VectorIndex(index, article_ids, {"index_type": "flat"})
+    queries = vectors[rng.choice(args.vectors, args.queries)] + 0.1 * rng.standard_normal((args.queries, args.dimension), dtype=np.float32)
+
+    print(f"{'selectivity':>11} {'allowed':>8} " + " ".join(f"{s + ' ms/recall':>24}" for s in STRATEGIES))
+    for selectivity in SELECTIVITIES:
+        allowed_rows = rng.choice(args.vectors, max(1, int(args.vectors * selectivity)), replace=False)
+        allowed_ids = article_ids[allowed_rows]
+        exact = vectors[allowed_rows] @ queries.T
+        truth = [allowed_ids[np.argsort(-exact[:, q])[:args.k]] for q in range(args.queries)]
+
+        cells = []
+        for strategy in STRATEGIES:
+            start = time.perf_counter()
+            if strategy == 'intersect':
+                found = intersect_search(vector_index, queries, allowed_ids, args.k)
+            else:
+                _, ids = vector_index.search_filtered(queries, allowed_ids, args.k, strategy=strategy)
+                found = [row[row >= 0] for row in ids]
+            ms = (time.perf_counter() - start) * 1000 / args.queries
+            cells.append(f"{ms:>14.3f} / {recall(found, truth):>6.3f}")
+        print(f"{selectivity:>11} {len(allowed_ids):>8} " + " ".join(f"{c:>24}" for c in cells))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,61 @@
+"""
+Benchmark DatabaseManager.search_articles with the FTS5 index against the LIKE scan path.
+
+Usage: python benchmarks/bench_fts_search.py [--rows 1000000] [--repeat 5]
+"""
+import argparse
+import os
+import statistics
+import tempfile
+import time
+
+from synthetic import add_backend_to_path, build_corpus
+
+add_backend_to_path()
+from core.database import DatabaseManager  # noqa: E402
+
+FILTER_CASES = [
+    {'title_filter': 'quantum'},
+    {'abstract_filter': 'neural network'},
+    {'category_filter': 'Machine Learning'},
+    {'author_filter': 'Sato'},
+    {'title_filter': 'graph', 'year_filter': '2023'},
+]
+
+
+def time_search(db_manager, filters, repeat):
+    timings = []
+    count = 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        count = len(db_manager.search_articles(dict(filters)))
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings), count
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--rows', type=int, default=1_000_000)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--db', help='Reuse an existing synthetic database instead of generating one')
+    args = parser.parse_args()
+
+    db_path = args.db or os.path.join(tempfile.gettempdir(), f'arxiv_bench_{args.rows}.db')
+    if not args.db:
+        print(f"Building synthetic corpus with {args.rows} rows at {db_path}...")
+        start = time.perf_counter()
+        build_corpus(db_path, args.rows)
+        print(f"Corpus built in {time.perf_counter() - start:.1f}s")
+
+    fts = DatabaseManager(db_path)
+    like = DatabaseManager(db_path, use_fts=False)
+    print(f"{'filters':<50} {'LIKE ms':>10} {'FTS ms':>10} {'speedup':>8} {'rows LIKE/FTS':>16}")
+    for filters in FILTER_CASES:
+        like_time, like_rows = time_search(like, filters, args.repeat)
+        fts_time, fts_rows = time_search(fts, filters, args.repeat)
+        print(f"{str(filters):<50} {like_time * 1000:>10.1f} {fts_time * 1000:>10.1f} "
+              f"{like_time / fts_time:>7.1f}x {like_rows:>8}/{fts_rows:<7}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,93 @@
+"""
+Cold-start time and memory per worker when N processes load the FAISS index and id map,
+with memory-mapping (shared page cache) versus reading everything into each process.
+
+Usage: python benchmarks/bench_index_startup.py [--vectors 500000] [--workers 1 2 4 8]
+
+PSS (proportional set size) splits shared pages between the processes mapping
+them, so the PSS total is the real memory cost of N workers. Linux only.
+"""
+import argparse
+import multiprocessing
+import os
+import tempfile
+import time
+
+import numpy as np
+
+from synthetic import add_backend_to_path
+
+add_backend_to_path()
+
+
+def memory_mb():
+    values = {}
+    with open('/proc/self/smaps_rollup') as f:
+        for line in f:
+            parts = line.split()
+            if parts[0] in ('Rss:', 'Pss:'):
+                values[parts[0][:-1]] = int(parts[1]) / 1024
+    return values.get('Rss', 0.0), values.get('Pss', 0.0)
+
+
+def worker(index_path, ids_path, mmap, ready, done, results):
+    from services.vector_index import VectorIndex
+    start = time.perf_counter()
+    vector_index = VectorIndex.load(index_path, ids_path, mmap=mmap)
+    # Touch the data the way a first query would
+    vector_index.search(np.ones((1, vector_index.index.d), dtype=np.float32), 10)
+    load_ms = (time.perf_counter() - start) * 1000
+    ready.wait()
+    rss, pss = memory_mb()
+    results.put((load_ms, rss, pss))
+    done.wait()
+
+
+def run(index_path, ids_path, mmap, workers):
+    ready = multiprocessing.Barrier(workers + 1)
+    done = multiprocessing.Event()
+    results = multiprocessing.Queue()
+    procs = [multiprocessing.Process(target=worker, args=(index_path, ids_path, mmap, ready, done, results))
+             for _ in range(workers)]
+    for proc in procs:
+        proc.start()
+    ready.wait()
+    rows = [results.get() for _ in procs]
+    done.set()
+    for proc in procs:
+        proc.join()
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--vectors', type=int, default=500_000)
+    parser.add_argument('--dimension', type=int, default=384)
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4, 8])
+    args = parser.parse_args()
+
+    import faiss
+    workdir = tempfile.mkdtemp()
+    index_path = os.path.join(workdir, 'faiss_index.index')
+    ids_path = os.path.join(workdir, 'article_ids.npy')
+    rng = np.random.default_rng(0)
+    index = faiss.IndexFlatIP(args.dimension)
+    for start in range(0, args.vectors, 100_000):
+        index.add(rng.random((min(100_000, args.vectors - start), args.dimension), dtype=np.float32))
+    faiss.write_index(index, index_path)
+    np.save(ids_path, np.arange(1, args.vectors + 1, dtype=np.int64))
+    del index
+    print(f"index: {args.vectors} x {args.dimension} ({os.path.getsize(index_path) / 2**20:.0f} MB)")
+
+    print(f"{'mode':<6} {'workers':>7} {'load ms':>9} {'RSS MB/worker':>14} {'PSS MB total':>13}")
+    for mmap in (False, True):
+        for workers in args.workers:
+            rows = run(index_path, ids_path, mmap, workers)
+            load_ms = max(row[0] for row in rows)
+            rss = sum(row[1] for row in rows) / len(rows)
+            pss = sum(row[2] for row in rows)
+            print(f"{'mmap' if mmap else 'read':<6} {workers:>7} {load_ms:>9.1f} {rss:>14.0f} {pss:>13.0f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,83 @@
+"""
+Benchmark the bulk loader in clean_and_store.py against the previous per-row insert path.
+
+Usage: python benchmarks/bench_ingestion.py [--rows 100000] [--legacy-rows 20000]
+"""
+import argparse
+import logging
+import os
+import sqlite3
+import tempfile
+import time
+
+import pandas as pd
+
+from synthetic import add_backend_to_path, generate_papers
+
+add_backend_to_path()
+from clean_and_store import create_fts_index, create_tables, store_papers  # noqa: E402
+
+
+def legacy_store(conn, df):
+    """The original loader: per-row INSERT/SELECT round trips, committing every 100 rows."""
+    conn.execute('PRAGMA journal_mode=WAL')
+    create_tables(conn)
+    create_fts_index(conn)
+    c = conn.cursor()
+    for i, (_, row) in enumerate(df.iterrows()):
+        c.execute('INSERT OR IGNORE INTO articles (arxiv_id, title, abstract, published, doi, categories) VALUES (?, ?, ?, ?, ?, ?)',
+                  (row['arxiv_id'], row['title'], row['abstract'], row['published'], row['doi'], row['categories']))
+        article_id = c.execute('SELECT id FROM articles WHERE arxiv_id = ?', (row['arxiv_id'],)).fetchone()[0]
+        for author_name in row['authors']:
+            result = c.execute('SELECT id FROM authors WHERE name = ?', (author_name,)).fetchone()
+            if result:
+                author_id = result[0]
+            else:
+                author_id = c.execute('INSERT INTO authors (name) VALUES (?)', (author_name,)).lastrowid
+            c.execute('INSERT OR IGNORE INTO article_authors (article_id, author_id) VALUES (?, ?)',
+                      (article_id, author_id))
+        if (i + 1) % 100 == 0:
+            conn.commit()
+    conn.commit()
+    c.execute("INSERT INTO articles_fts (articles_fts) VALUES ('optimize')")
+    conn.commit()
+
+
+def run(label, loader, df, db_path):
+    if os.path.exists(db_path):
+        os.remove(db_path)
+    conn = sqlite3.connect(db_path)
+    start = time.perf_counter()
+    loader(conn, df)
+    elapsed = time.perf_counter() - start
+    counts = [conn.execute(f'SELECT COUNT(*) FROM {table}').fetchone()[0]
+              for table in ('articles', 'authors', 'article_authors', 'articles_fts')]
+    conn.close()
+    print(f"{label:<10} {len(df):>10} {elapsed:>9.2f} {len(df) / elapsed:>12.0f}   "
+          f"articles={counts[0]} authors={counts[1]} links={counts[2]} fts={counts[3]}")
+    return counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--rows', type=int, default=100_000)
+    parser.add_argument('--legacy-rows', type=int, default=20_000,
+                        help='Rows for the per-row path, which is too slow for the full --rows')
+    args = parser.parse_args()
+    logging.getLogger().setLevel(logging.WARNING)
+
+    db_path = os.path.join(tempfile.gettempdir(), 'arxiv_bench_ingestion.db')
+    df = pd.DataFrame(generate_papers(max(args.rows, args.legacy_rows)))
+
+    print(f"{'loader':<10} {'rows':>10} {'seconds':>9} {'rows/sec':>12}")
+    legacy = run('per-row', legacy_store, df.head(args.legacy_rows), db_path)
+    bulk = run('bulk', store_papers, df.head(args.legacy_rows), db_path)
+    if legacy != bulk:
+        print("WARNING: bulk and per-row loads produced different row counts")
+    if args.rows != args.legacy_rows:
+        run('bulk', store_papers, df.head(args.rows), db_path)
+    os.remove(db_path)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,69 @@
+"""
+Measure the effect of the persistent LLM response cache on query interpretation latency,
+the slowest step of AI search, using the local stub LLM server.
+
+Usage: python benchmarks/bench_llm_cache.py [--requests 200] [--distinct 40] [--delay-ms 800]
+"""
+import argparse
+import logging
+import os
+import random
+import statistics
+import tempfile
+import time
+
+from synthetic import add_backend_to_path
+from stub_llm_server import start_stub_server
+
+add_backend_to_path()
+from connect_llm import LLMConnect  # noqa: E402
+from llm_cache import LLMResponseCache  # noqa: E402
+
+TOPICS = ['machine learning', 'quantum computing', 'graph neural networks', 'dark matter', 'protein folding',
+          'large language models', 'option pricing', 'causal inference', 'robot navigation', 'image segmentation']
+
+
+def workload(requests, distinct, seed=0):
+    """Zipf-like repeated queries, the way real traffic repeats popular topics."""
+    rng = random.Random(seed)
+    pool = [f"find me {n} papers about {topic}" for n in (5, 10, 20, 50) for topic in TOPICS][:distinct]
+    weights = [1 / (rank + 1) for rank in range(len(pool))]
+    return rng.choices(pool, weights=weights, k=requests)
+
+
+def run(llm, queries):
+    latencies = []
+    for query in queries:
+        start = time.perf_counter()
+        llm.query_llm(query)
+        latencies.append(time.perf_counter() - start)
+    latencies.sort()
+    return statistics.mean(latencies) * 1000, statistics.median(latencies) * 1000, latencies[int(len(latencies) * 0.99) - 1] * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--requests', type=int, default=200)
+    parser.add_argument('--distinct', type=int, default=40)
+    parser.add_argument('--delay-ms', type=float, default=800)
+    args = parser.parse_args()
+
+    logging.getLogger().setLevel(logging.WARNING)
+    server, url, counter = start_stub_server(delay_ms=args.delay_ms)
+    queries = workload(args.requests, args.distinct)
+    cache_path = os.path.join(tempfile.mkdtemp(), 'llm_cache.db')
+
+    print(f"{'mode':<14} {'mean ms':>9} {'p50 ms':>9} {'p99 ms':>9} {'LLM calls':>10}")
+    for label, cache in (('no cache', None), ('cold cache', LLMResponseCache(cache_path)),
+                         ('warm restart', LLMResponseCache(cache_path))):
+        llm = LLMConnect(api_key='stub', api_url=url, cache=cache)
+        before = counter['requests']
+        mean, p50, p99 = run(llm, queries)
+        print(f"{label:<14} {mean:>9.1f} {p50:>9.1f} {p99:>9.1f} {counter['requests'] - before:>10}")
+        if cache:
+            print(f"{'':<14} {cache.stats()}")
+    server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,77 @@
+"""
+Response size and build time of a search result page with full articles
+against the projected list views of SearchRequest.fields.
+
+Usage: python benchmarks/bench_projection.py [--rows 100000] [--pages 20 100 500]
+
+Each variant fetches the same ranked page from the database and serializes
+it the way the route does: full pages through the SearchResponse model,
+projected pages as plain dicts with json.dumps.
+"""
+import argparse
+import json
+import os
+import statistics
+import tempfile
+import time
+
+import numpy as np
+
+from synthetic import add_backend_to_path, build_corpus
+
+add_backend_to_path()
+from core.database import DatabaseManager  # noqa: E402
+from models.schemas import SearchResponse  # noqa: E402
+from services.projection import snippet_pattern  # noqa: E402
+from services.search_service import SearchService  # noqa: E402
+
+VIEWS = {
+    'full articles': None,
+    'list view with snippet': ['id', 'title', 'published', 'authors', 'score', 'snippet'],
+    'id, title, published': ['id', 'title', 'published'],
+}
+
+
+def respond(service, ids, scores, fields, pattern):
+    result = service._ranked_page("manual", ids, scores, None, fields=fields, pattern=pattern)
+    if fields:
+        return json.dumps(result)
+    return json.dumps(SearchResponse(**result).model_dump(mode="json"))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--rows', type=int, default=100_000)
+    parser.add_argument('--pages', type=int, nargs='+', default=[20, 100, 500], help="Articles per response")
+    parser.add_argument('--calls', type=int, default=50)
+    parser.add_argument('--query', default="graph neural network")
+    args = parser.parse_args()
+
+    db_path = os.path.join(tempfile.gettempdir(), f'arxiv_bench_{args.rows}.db')
+    if not os.path.exists(db_path):
+        build_corpus(db_path, args.rows)
+    service = SearchService()
+    service.db_manager = DatabaseManager(db_path)
+    pattern = snippet_pattern(args.query)
+    rng = np.random.default_rng(0)
+
+    for page in args.pages:
+        ids = rng.choice(np.arange(1, args.rows + 1), size=min(page, args.rows), replace=False).astype(np.int64)
+        scores = np.sort(rng.random(len(ids)).astype(np.float32))[::-1]
+        print(f"-- {len(ids)} articles")
+        baseline = None
+        for label, fields in VIEWS.items():
+            body = respond(service, ids, scores, fields, pattern)
+            latencies = []
+            for _ in range(args.calls):
+                start = time.perf_counter()
+                respond(service, ids, scores, fields, pattern)
+                latencies.append(time.perf_counter() - start)
+            size, latency = len(body.encode()), statistics.median(latencies)
+            baseline = baseline or (size, latency)
+            print(f"  {label:<24} {size / 1024:>9.1f} KiB ({baseline[0] / size:>5.1f}x smaller)  "
+                  f"{latency * 1e3:>8.2f} ms ({baseline[1] / latency:>5.1f}x faster)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,62 @@
+"""
+Benchmark per-request model.encode calls against the shared BatchingEncoder.
+
+Usage: python benchmarks/bench_query_encoder.py [--concurrency 1 4 16 64] [--requests 512]
+"""
+import argparse
+import random
+import statistics
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from synthetic import add_backend_to_path, VOCABULARY
+
+add_backend_to_path()
+from core import config  # noqa: E402
+from services.encoder import BatchingEncoder  # noqa: E402
+
+
+def run(encode, concurrency, requests):
+    rng = random.Random(0)
+    queries = [' '.join(rng.sample(VOCABULARY, 3)) for _ in range(requests)]
+    latencies = []
+    lock = threading.Lock()
+
+    def one(query):
+        start = time.perf_counter()
+        encode([query])
+        with lock:
+            latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        list(executor.map(one, queries))
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+    return requests / elapsed, statistics.median(latencies) * 1000, latencies[int(len(latencies) * 0.99) - 1] * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--concurrency', type=int, nargs='+', default=[1, 4, 16, 64])
+    parser.add_argument('--requests', type=int, default=512)
+    parser.add_argument('--max-wait-ms', type=float, default=config.ENCODER_MAX_WAIT_MS)
+    parser.add_argument('--max-batch-size', type=int, default=config.ENCODER_MAX_BATCH_SIZE)
+    args = parser.parse_args()
+
+    from sentence_transformers import SentenceTransformer
+    model = SentenceTransformer(config.MODEL_NAME)
+    model.encode(['warm up'])
+    encoder = BatchingEncoder(model, max_batch_size=args.max_batch_size, max_wait_ms=args.max_wait_ms)
+    print(f"{'clients':>8} {'mode':>9} {'req/s':>9} {'p50 ms':>9} {'p99 ms':>9}")
+    for concurrency in args.concurrency:
+        for label, encode in (('direct', model.encode), ('batched', encoder.encode)):
+            throughput, p50, p99 = run(encode, concurrency, args.requests)
+            print(f"{concurrency:>8} {label:>9} {throughput:>9.1f} {p50:>9.2f} {p99:>9.2f}")
+    print(f"encoder stats: {encoder.stats()}")
+    encoder.close()
+
+
+if __name__ == '__main__':
+    main()
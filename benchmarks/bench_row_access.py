@@ -0,0 +1,110 @@
+"""
+Per-request overhead of the database row access layer: the previous pandas
+path (read_sql_query, to_numpy, to_dict('records')) against sqlite3 cursors
+with row factories and numpy id arrays.
+
+Usage: python benchmarks/bench_row_access.py [--rows 100000] [--calls 200]
+
+For each operation it reports the median latency, the peak memory allocated
+during one call and the number of memory blocks still held by its result,
+both measured with tracemalloc.
+"""
+import argparse
+import os
+import shutil
+import sqlite3
+import statistics
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+from synthetic import add_backend_to_path, build_corpus
+
+add_backend_to_path()
+from clean_and_store import create_secondary_indexes, migrate_schema  # noqa: E402
+from core.database import DatabaseManager  # noqa: E402
+
+# Served by idx_articles_year, so the cost measured is turning rows into ids
+FILTERS = {'year_filter': '2023', 'category_filter': None, 'author_filter': None,
+           'title_filter': None, 'abstract_filter': None}
+
+
+def legacy_search_ids(db, filters):
+    """The pandas version of SearchService._filtered_ids."""
+    db._inspect_schema()
+    with db.get_connection() as conn:
+        sql_query, params = db.build_search_query(conn, filters)
+        df = pd.read_sql_query(sql_query, conn, params=params)
+    return np.empty(0, dtype=np.int64) if df.empty else df['id'].to_numpy(dtype=np.int64)
+
+
+def legacy_articles(db, article_ids):
+    """The pandas version of fetching a page of articles as response records."""
+    placeholders = ','.join('?' for _ in article_ids)
+    query = f"""
+        SELECT a.id, a.title, a.abstract, a.published, a.categories,
+               GROUP_CONCAT(au.name, '; ') as authors
+        FROM articles a
+        LEFT JOIN article_authors aa ON a.id = aa.article_id
+        LEFT JOIN authors au ON aa.author_id = au.id
+        WHERE a.id IN ({placeholders})
+        GROUP BY a.id, a.title, a.abstract, a.published, a.categories
+        ORDER BY a.published DESC
+    """
+    with db.get_connection() as conn:
+        df = pd.read_sql_query(query, conn, params=article_ids)
+    return df.to_dict('records')
+
+
+def measure(label, func, calls):
+    func()  # warm statement caches and imports
+    latencies = []
+    for _ in range(calls):
+        start = time.perf_counter()
+        func()
+        latencies.append(time.perf_counter() - start)
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    tracemalloc.reset_peak()
+    result = func()
+    peak = tracemalloc.get_traced_memory()[1]
+    held = sum(stat.count_diff for stat in tracemalloc.take_snapshot().compare_to(before, 'filename'))
+    tracemalloc.stop()
+    del result
+    print(f"{label:<28} {statistics.median(latencies) * 1e3:>9.3f} ms  peak {peak / 1024:>9.1f} KiB  "
+          f"blocks held {held:>7}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--rows', type=int, default=100_000)
+    parser.add_argument('--calls', type=int, default=200)
+    parser.add_argument('--page', type=int, default=20, help="Articles fetched per page")
+    args = parser.parse_args()
+
+    legacy_path = os.path.join(tempfile.gettempdir(), f'arxiv_bench_{args.rows}.db')
+    if not os.path.exists(legacy_path):
+        build_corpus(legacy_path, args.rows)
+    db_path = os.path.join(tempfile.gettempdir(), f'arxiv_bench_{args.rows}_migrated.db')
+    if not os.path.exists(db_path):
+        shutil.copyfile(legacy_path, db_path)
+        conn = sqlite3.connect(db_path)
+        migrate_schema(conn)
+        create_secondary_indexes(conn)
+        conn.close()
+    db = DatabaseManager(db_path, use_fts=False)
+    ids = db.search_articles(FILTERS)
+    page = ids[:args.page]
+    print(f"{len(ids)} filtered ids, pages of {len(page)} articles")
+
+    measure('filtered ids: pandas', lambda: legacy_search_ids(db, FILTERS), args.calls)
+    measure('filtered ids: cursor', lambda: db.search_articles(FILTERS), args.calls)
+    measure('article page: pandas', lambda: legacy_articles(db, page.tolist()), args.calls)
+    measure('article page: row factory', lambda: db.get_articles_by_ids(page), args.calls)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,79 @@
+"""
+Load test the running API and report p50/p99 latency per concurrency level.
+
+Run it once against the old server and once against the new one to compare:
+
+    python benchmarks/bench_search_load.py --url http://localhost:8000/api/v1 --concurrency 1 16 64
+"""
+import argparse
+import asyncio
+import random
+import statistics
+import time
+
+import httpx
+
+QUERIES = [
+    'machine learning', 'quantum computing', 'graph neural networks', 'protein folding',
+    'reinforcement learning for robotics', 'dark matter', 'large language models', 'option pricing',
+]
+
+
+def make_request(kind, rng):
+    if kind == 'stats':
+        return 'GET', '/stats', None
+    if kind == 'years':
+        return 'GET', '/years', None
+    return 'POST', '/search', {'query': rng.choice(QUERIES), 'search_type': kind, 'limit': 20}
+
+
+async def worker(client, kind, deadline_count, latencies, errors, rng):
+    while len(latencies) + len(errors) < deadline_count:
+        method, path, body = make_request(kind, rng)
+        start = time.perf_counter()
+        try:
+            response = await client.request(method, path, json=body)
+            response.raise_for_status()
+            latencies.append(time.perf_counter() - start)
+        except httpx.HTTPError as e:
+            errors.append(str(e))
+
+
+async def run_level(url, kind, concurrency, requests_per_level):
+    latencies, errors = [], []
+    limits = httpx.Limits(max_connections=concurrency)
+    async with httpx.AsyncClient(base_url=url, timeout=120, limits=limits) as client:
+        start = time.perf_counter()
+        await asyncio.gather(*(
+            worker(client, kind, requests_per_level, latencies, errors, random.Random(i))
+            for i in range(concurrency)
+        ))
+        elapsed = time.perf_counter() - start
+    latencies.sort()
+    p99_index = max(0, int(len(latencies) * 0.99) - 1)
+    return {
+        'concurrency': concurrency,
+        'throughput': len(latencies) / elapsed,
+        'p50_ms': statistics.median(latencies) * 1000 if latencies else float('nan'),
+        'p99_ms': latencies[p99_index] * 1000 if latencies else float('nan'),
+        'errors': len(errors),
+    }
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--url', default='http://localhost:8000/api/v1')
+    parser.add_argument('--kind', choices=['manual', 'ai', 'stats', 'years'], default='manual')
+    parser.add_argument('--concurrency', type=int, nargs='+', default=[1, 16, 64])
+    parser.add_argument('--requests', type=int, default=200, help='Requests per concurrency level')
+    args = parser.parse_args()
+
+    print(f"{'clients':>8} {'req/s':>10} {'p50 ms':>10} {'p99 ms':>10} {'errors':>8}")
+    for level in args.concurrency:
+        result = await run_level(args.url, args.kind, level, args.requests)
+        print(f"{result['concurrency']:>8} {result['throughput']:>10.1f} {result['p50_ms']:>10.1f} "
+              f"{result['p99_ms']:>10.1f} {result['errors']:>8}")
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
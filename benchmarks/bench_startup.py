@@ -0,0 +1,85 @@
+"""
+Time to first response and time to readiness of a freshly started API process,
+with background resource loading versus loading everything before serving.
+
+Usage: python benchmarks/bench_startup.py [--rows 20000] [--dimension 384] [--runs 3]
+
+Each run starts uvicorn on a synthetic corpus and a random index of the given
+dimension (it must match the query encoder), then polls /stats and /ready.
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+import httpx
+import numpy as np
+
+from synthetic import BACKEND_PATH, build_corpus
+
+
+def wait_for(client, path, deadline, accept=(200,)):
+    while time.perf_counter() < deadline:
+        try:
+            response = client.get(path)
+            if response.status_code in accept:
+                return time.perf_counter(), response
+        except httpx.TransportError:
+            pass
+        time.sleep(0.01)
+    raise TimeoutError(f"{path} did not answer in time")
+
+
+def run(env, port, background):
+    env = dict(env, SEARCH_BACKGROUND_LOAD='true' if background else 'false')
+    start = time.perf_counter()
+    proc = subprocess.Popen([sys.executable, '-m', 'uvicorn', 'main:app', '--port', str(port), '--log-level', 'warning'],
+                            cwd=BACKEND_PATH, env=env, stderr=subprocess.DEVNULL)
+    try:
+        with httpx.Client(base_url=f'http://127.0.0.1:{port}/api/v1', timeout=5) as client:
+            deadline = start + 300
+            first, _ = wait_for(client, '/stats', deadline)
+            search = client.post('/search', json={'query': 'quantum neural network', 'limit': 10}).json()
+            ready, _ = wait_for(client, '/ready', deadline)
+        return first - start, ready - start, search.get('warming', False)
+    finally:
+        proc.terminate()
+        proc.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=20_000)
+    parser.add_argument('--dimension', type=int, default=384)
+    parser.add_argument('--runs', type=int, default=3)
+    parser.add_argument('--port', type=int, default=8765)
+    args = parser.parse_args()
+
+    import faiss
+    workdir = tempfile.mkdtemp()
+    db_path = os.path.join(workdir, 'arxiv_data.db')
+    index_path = os.path.join(workdir, 'faiss_index.index')
+    ids_path = os.path.join(workdir, 'article_ids.npy')
+    build_corpus(db_path, args.rows)
+    vectors = np.random.default_rng(0).standard_normal((args.rows, args.dimension)).astype(np.float32)
+    faiss.normalize_L2(vectors)
+    index = faiss.IndexFlatIP(args.dimension)
+    index.add(vectors)
+    faiss.write_index(index, index_path)
+    np.save(ids_path, np.arange(1, args.rows + 1, dtype=np.int64))
+    env = dict(os.environ, ARXIV_DB_PATH=db_path, FAISS_INDEX_PATH=index_path, ARTICLE_IDS_PATH=ids_path)
+
+    print(f"{'loading':<11} {'first response s':>17} {'ready s':>9} {'first search':>13}")
+    for background in (False, True):
+        rows = [run(env, args.port, background) for _ in range(args.runs)]
+        first = statistics.median(row[0] for row in rows)
+        ready = statistics.median(row[1] for row in rows)
+        mode = 'keyword' if rows[-1][2] else 'semantic'
+        print(f"{'background' if background else 'blocking':<11} {first:>17.2f} {ready:>9.2f} {mode:>13}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,64 @@
+"""
+Latency of /stats and /years payloads: aggregating the articles table on every
+call, reading the summary tables written at ingestion, and the in-process cache.
+
+Usage: python benchmarks/bench_stats.py [--rows 200000] [--calls 200]
+"""
+import argparse
+import os
+import shutil
+import sqlite3
+import statistics
+import tempfile
+import time
+
+from synthetic import add_backend_to_path, build_corpus
+
+add_backend_to_path()
+from clean_and_store import refresh_stats  # noqa: E402
+from core.database import DatabaseManager  # noqa: E402
+from services.stats_service import StatsService  # noqa: E402
+
+
+def run(label, func, calls):
+    latencies = []
+    for _ in range(calls):
+        start = time.perf_counter()
+        func()
+        latencies.append(time.perf_counter() - start)
+    latencies.sort()
+    print(f"{label:<22} p50 {statistics.median(latencies) * 1e3:>9.3f} ms  "
+          f"p99 {latencies[int(len(latencies) * 0.99) - 1] * 1e3:>9.3f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--rows', type=int, default=200_000)
+    parser.add_argument('--calls', type=int, default=200)
+    args = parser.parse_args()
+
+    live_path = os.path.join(tempfile.gettempdir(), f'arxiv_bench_{args.rows}.db')
+    if not os.path.exists(live_path):
+        build_corpus(live_path, args.rows)
+    summary_path = os.path.join(tempfile.gettempdir(), f'arxiv_bench_{args.rows}_stats.db')
+    shutil.copyfile(live_path, summary_path)
+    conn = sqlite3.connect(summary_path)
+    start = time.perf_counter()
+    refresh_stats(conn)
+    print(f"refresh_stats over {args.rows} rows: {time.perf_counter() - start:.2f} s (once per ingestion)")
+    conn.close()
+
+    live = DatabaseManager(live_path)
+    summary = DatabaseManager(summary_path)
+    cached = StatsService(summary)
+    run('live stats', live.get_stats, args.calls)
+    run('live years', live.get_years, args.calls)
+    run('summary stats', summary.get_stats, args.calls)
+    run('summary years', summary.get_years, args.calls)
+    run('cached stats', lambda: cached.get('stats'), args.calls)
+    run('cached years', lambda: cached.get('years'), args.calls)
+    print(f"cache: {cached.stats()}")
+
+
+if __name__ == '__main__':
+    main()
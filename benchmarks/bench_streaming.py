@@ -0,0 +1,83 @@
+"""
+Time to first result and peak memory of a large search page, sent as one
+JSON document against streamed as NDJSON.
+
+Usage: python benchmarks/bench_streaming.py [--rows 100000] [--pages 100 1000 10000]
+
+Both paths start from the same ranked ids and scores. The JSON path fetches
+every article, builds the SearchResponse and serializes it, so its first
+byte is its last; the streamed path reads STREAM_CHUNK_SIZE articles at a
+time and encodes each as it arrives. Peak memory is measured with tracemalloc.
+"""
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+
+from synthetic import add_backend_to_path, build_corpus
+
+add_backend_to_path()
+from api.routes import NDJSON, stream_search_events  # noqa: E402
+from core import config  # noqa: E402
+from core.database import DatabaseManager  # noqa: E402
+from models.schemas import SearchResponse  # noqa: E402
+from services.search_service import SearchService  # noqa: E402
+
+
+def buffered(service, ids, scores):
+    start = time.perf_counter()
+    body = SearchResponse(**service._ranked_page("manual", ids, scores, None)).model_dump_json()
+    elapsed = time.perf_counter() - start
+    return elapsed, elapsed, len(body)
+
+
+async def streamed(service, ids, scores):
+    start = time.perf_counter()
+    first, size = None, 0
+    meta = {"candidates": len(ids), "offset": 0, "next_cursor": None, "search_type": "manual"}
+    async for part in stream_search_events(NDJSON, meta, service._scored_chunks(ids, scores)):
+        if first is None and '"article"' in part:
+            first = time.perf_counter() - start
+        size += len(part)
+    return first, time.perf_counter() - start, size
+
+
+def measure(label, func):
+    func()  # warm statement caches
+    tracemalloc.start()
+    first, total, size = func()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    print(f"{label:<10} first result {first * 1e3:>9.2f} ms  total {total * 1e3:>9.2f} ms  "
+          f"peak {peak / 2 ** 20:>8.2f} MiB  body {size / 2 ** 20:>7.2f} MiB")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--rows', type=int, default=100_000)
+    parser.add_argument('--pages', type=int, nargs='+', default=[100, 1000, 10000],
+                        help="Articles per response")
+    args = parser.parse_args()
+
+    db_path = os.path.join(tempfile.gettempdir(), f'arxiv_bench_{args.rows}.db')
+    if not os.path.exists(db_path):
+        build_corpus(db_path, args.rows)
+    service = SearchService()
+    service.db_manager = DatabaseManager(db_path)
+    rng = np.random.default_rng(0)
+    print(f"{args.rows} articles, streamed in chunks of {config.STREAM_CHUNK_SIZE}")
+
+    for page in args.pages:
+        ids = rng.choice(np.arange(1, args.rows + 1), size=min(page, args.rows), replace=False).astype(np.int64)
+        scores = np.sort(rng.random(len(ids)).astype(np.float32))[::-1]
+        print(f"-- {len(ids)} articles")
+        measure('json', lambda: buffered(service, ids, scores))
+        measure('ndjson', lambda: asyncio.run(streamed(service, ids, scores)))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,154 @@
+"""
+Throughput, latency and memory of the API served by 1..N worker processes
+(``start.py --workers N``), with the index and model preloaded and shared
+copy-on-write by the workers versus loaded by each worker itself.
+
+Usage: python benchmarks/bench_workers.py [--workers 1 2 4] [--rows 20000] [--dimension 384]
+
+Each run starts the server on a synthetic corpus and a random index of the
+given dimension (it must match the query encoder), waits for every worker to
+finish starting, sends fresh random queries at a fixed concurrency and reads
+the resident (RSS) and proportional (PSS, shared pages split between the
+processes sharing them) memory of the parent and every worker from
+/proc/<pid>/smaps_rollup, so Linux only.
+"""
+import argparse
+import asyncio
+import os
+import random
+import signal
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+import httpx
+import numpy as np
+
+from synthetic import BACKEND_PATH, VOCABULARY, build_corpus
+
+
+def memory_kib(pid):
+    """(RSS, PSS) of a process in KiB."""
+    values = {}
+    with open(f'/proc/{pid}/smaps_rollup') as f:
+        for line in f:
+            key, _, rest = line.partition(':')
+            if key in ('Rss', 'Pss'):
+                values[key] = int(rest.split()[0])
+    return values['Rss'], values['Pss']
+
+
+def children(pid):
+    with open(f'/proc/{pid}/task/{pid}/children') as f:
+        return [int(child) for child in f.read().split()]
+
+
+def start_server(env, port, workers, preload):
+    """Start the server and return it once all of its workers have started the application."""
+    command = [sys.executable, 'start.py', '--workers', str(workers), '--port', str(port), '--host', '127.0.0.1']
+    if not preload:
+        command.append('--no-preload')
+    started = time.perf_counter()
+    proc = subprocess.Popen(command, cwd=BACKEND_PATH, env=env,
+                            stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+    ready = threading.Event()
+
+    def watch_log():
+        up = 0
+        for line in proc.stderr:
+            if 'Application startup complete' in line:
+                up += 1
+                if up == workers:
+                    ready.set()
+        ready.set()
+
+    threading.Thread(target=watch_log, daemon=True).start()
+    if not ready.wait(300) or proc.poll() is not None:
+        proc.kill()
+        raise RuntimeError(f"Server with {workers} workers did not start")
+    return proc, time.perf_counter() - started
+
+
+async def load(url, concurrency, requests, seed):
+    rng = random.Random(seed)
+    queries = [' '.join(rng.sample(VOCABULARY, rng.randint(2, 4))) for _ in range(requests)]
+    latencies = []
+
+    async def client_loop(client):
+        while queries:
+            query = queries.pop()
+            start = time.perf_counter()
+            response = await client.post('/search', json={'query': query, 'limit': 20})
+            response.raise_for_status()
+            latencies.append(time.perf_counter() - start)
+
+    limits = httpx.Limits(max_connections=concurrency)
+    async with httpx.AsyncClient(base_url=url, timeout=120, limits=limits) as client:
+        start = time.perf_counter()
+        await asyncio.gather(*(client_loop(client) for _ in range(concurrency)))
+        elapsed = time.perf_counter() - start
+    latencies.sort()
+    return len(latencies) / elapsed, statistics.median(latencies) * 1000, latencies[int(len(latencies) * 0.99) - 1] * 1000
+
+
+def run(env, args, workers, preload):
+    proc, startup = start_server(env, args.port, workers, preload)
+    try:
+        url = f'http://127.0.0.1:{args.port}/api/v1'
+        throughput, p50, p99 = asyncio.run(load(url, args.concurrency, args.requests, seed=workers))
+        worker_memory = [memory_kib(pid) for pid in children(proc.pid)]
+        parent_rss, parent_pss = memory_kib(proc.pid)
+        return {
+            'startup': startup,
+            'throughput': throughput,
+            'p50': p50,
+            'p99': p99,
+            'worker_rss': statistics.mean(rss for rss, _ in worker_memory) / 1024,
+            'worker_pss': statistics.mean(pss for _, pss in worker_memory) / 1024,
+            'total_pss': (parent_pss + sum(pss for _, pss in worker_memory)) / 1024,
+        }
+    finally:
+        proc.send_signal(signal.SIGTERM)
+        proc.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4])
+    parser.add_argument('--rows', type=int, default=20_000)
+    parser.add_argument('--dimension', type=int, default=384)
+    parser.add_argument('--concurrency', type=int, default=32)
+    parser.add_argument('--requests', type=int, default=2000)
+    parser.add_argument('--port', type=int, default=8765)
+    args = parser.parse_args()
+
+    import faiss
+    workdir = tempfile.mkdtemp()
+    db_path = os.path.join(workdir, 'arxiv_data.db')
+    index_path = os.path.join(workdir, 'faiss_index.index')
+    ids_path = os.path.join(workdir, 'article_ids.npy')
+    build_corpus(db_path, args.rows)
+    vectors = np.random.default_rng(0).standard_normal((args.rows, args.dimension)).astype(np.float32)
+    faiss.normalize_L2(vectors)
+    index = faiss.IndexFlatIP(args.dimension)
+    index.add(vectors)
+    faiss.write_index(index, index_path)
+    np.save(ids_path, np.arange(1, args.rows + 1, dtype=np.int64))
+    env = dict(os.environ, ARXIV_DB_PATH=db_path, FAISS_INDEX_PATH=index_path, ARTICLE_IDS_PATH=ids_path,
+               SEARCH_BACKGROUND_LOAD='false', INDEX_RELOAD_INTERVAL_SECONDS='0')
+
+    print(f"{'workers':>7} {'loading':<9} {'startup s':>9} {'req/s':>7} {'p50 ms':>7} {'p99 ms':>7} "
+          f"{'RSS/worker MiB':>15} {'PSS/worker MiB':>15} {'total PSS MiB':>14}")
+    for workers in args.workers:
+        for preload in (True, False):
+            row = run(env, args, workers, preload)
+            print(f"{workers:>7} {'shared' if preload else 'own':<9} {row['startup']:>9.2f} {row['throughput']:>7.1f} "
+                  f"{row['p50']:>7.1f} {row['p99']:>7.1f} {row['worker_rss']:>15.1f} {row['worker_pss']:>15.1f} "
+                  f"{row['total_pss']:>14.1f}")
+
+
+if __name__ == '__main__':
+    main()
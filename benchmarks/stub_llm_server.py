@@ -0,0 +1,77 @@
+"""
+Local stand-in for the chat completions API used by LLMConnect.
+
+It answers with the same JSON shape the real model is prompted to return,
+after an artificial delay, so AI search can be exercised without network
+access or an API key:
+
+    python benchmarks/stub_llm_server.py --port 8089 --delay-ms 800
+    TOGETHER_API_KEY=stub  # and point LLMConnect(api_url=...) at the stub
+"""
+import argparse
+import json
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+STOP_WORDS = {'find', 'me', 'give', 'show', 'i', 'want', 'need', 'papers', 'paper', 'articles',
+              'article', 'results', 'about', 'on', 'in', 'from', 'some', 'the'}
+
+
+def interpret(user_query):
+    """Cheap rule-based imitation of the LLM's query parse."""
+    limit = re.search(r'\b(\d+)\s*(?:papers?|articles?|results?)', user_query.lower())
+    year = re.search(r'\b(20\d{2})\b', user_query)
+    words = [w for w in re.findall(r'[A-Za-z][\w-]*', user_query) if w.lower() not in STOP_WORDS]
+    return {
+        "explanation": "",
+        "search_params": {
+            "query": " ".join(words),
+            "limit": limit.group(1) if limit else "",
+            "year": year.group(1) if year else "",
+            "category": "", "author": "", "title": "", "abstract": "",
+        },
+    }
+
+
+def make_handler(delay_seconds, counter):
+    class StubHandler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            body = json.loads(self.rfile.read(int(self.headers.get('Content-Length', 0))) or b'{}')
+            user_query = body.get('messages', [{}])[-1].get('content', '')
+            counter['requests'] += 1
+            time.sleep(delay_seconds)
+            content = "```json\n" + json.dumps(interpret(user_query)) + "\n```"
+            payload = json.dumps({"choices": [{"message": {"role": "assistant", "content": content}}]}).encode()
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def log_message(self, format, *args):
+            pass
+
+    return StubHandler
+
+
+def start_stub_server(port=0, delay_ms=800):
+    """Start the stub in a background thread; returns (server, url, request counter)."""
+    counter = {'requests': 0}
+    server = ThreadingHTTPServer(('127.0.0.1', port), make_handler(delay_ms / 1000, counter))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}/v1/chat/completions", counter
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--port', type=int, default=8089)
+    parser.add_argument('--delay-ms', type=float, default=800)
+    args = parser.parse_args()
+    server, url, _ = start_stub_server(args.port, args.delay_ms)
+    print(f"Stub LLM listening on {url}")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
@@ -0,0 +1,95 @@
+"""
+Synthetic arXiv-like corpus used by the benchmarks.
+"""
+import os
+import random
+import sqlite3
+import sys
+
+BACKEND_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'backend')
+SCRIPTS_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data', 'scripts')
+
+VOCABULARY = [
+    'neural', 'network', 'quantum', 'computing', 'learning', 'deep', 'graph', 'model', 'language',
+    'vision', 'transformer', 'optimization', 'stochastic', 'bayesian', 'inference', 'entanglement',
+    'lattice', 'topology', 'protein', 'market', 'volatility', 'causal', 'reinforcement', 'robust',
+    'sparse', 'kernel', 'manifold', 'spectral', 'diffusion', 'attention', 'convex', 'gradient',
+    'estimation', 'sampling', 'photonic', 'superconducting', 'galaxy', 'dark', 'matter', 'signal',
+]
+CATEGORIES = [
+    'Artificial Intelligence', 'Computation and Language', 'Computer Vision and Pattern Recognition',
+    'Machine Learning', 'Quantum Physics', 'Optics', 'Combinatorics', 'Neurons and Cognition',
+    'Quantitative Finance', 'Statistics', 'Economics',
+]
+FIRST_NAMES = ['Alice', 'Bob', 'Chen', 'Dmitri', 'Emma', 'Fatima', 'Hiro', 'Ines', 'Jonas', 'Lea']
+LAST_NAMES = ['Smith', 'Wang', 'Garcia', 'Ivanov', 'Martin', 'Khan', 'Sato', 'Silva', 'Muller', 'Rossi']
+
+
+def add_backend_to_path():
+    """Make the backend packages importable from a benchmark script."""
+    for path in (BACKEND_PATH, SCRIPTS_PATH):
+        if path not in sys.path:
+            sys.path.append(path)
+
+
+def random_text(rng, words):
+    return ' '.join(rng.choice(VOCABULARY) for _ in range(words))
+
+
+def generate_papers(rows, seed=0):
+    """Yield synthetic paper dicts shaped like the rows of arxiv_data_raw.csv."""
+    rng = random.Random(seed)
+    for i in range(rows):
+        authors = [f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}{rng.randint(0, 5000)}"
+                   for _ in range(rng.randint(1, 4))]
+        yield {
+            'arxiv_id': f"{2000 + i // 100000}.{i % 100000:05d}",
+            'title': random_text(rng, 8).capitalize(),
+            'abstract': random_text(rng, 120),
+            'published': f"{rng.randint(2020, 2025)}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}",
+            'doi': '',
+            'authors': authors,
+            'categories': ', '.join(rng.sample(CATEGORIES, rng.randint(1, 3))),
+        }
+
+
+def build_corpus(db_path, rows, seed=0, with_fts=True):
+    """Create a synthetic arxiv_data.db with the same schema as clean_and_store.py."""
+    if os.path.exists(db_path):
+        os.remove(db_path)
+    conn = sqlite3.connect(db_path)
+    c = conn.cursor()
+    c.execute('PRAGMA journal_mode = OFF')
+    c.execute('PRAGMA synchronous = OFF')
+    c.execute('''CREATE TABLE articles
+                 (id INTEGER PRIMARY KEY, arxiv_id TEXT UNIQUE, title TEXT, abstract TEXT, published TEXT, doi TEXT, categories TEXT)''')
+    c.execute('CREATE TABLE authors (id INTEGER PRIMARY KEY, name TEXT)')
+    c.execute('''CREATE TABLE article_authors
+                 (article_id INTEGER, author_id INTEGER, PRIMARY KEY (article_id, author_id))''')
+
+    author_ids = {}
+    articles, links = [], []
+    for article_id, paper in enumerate(generate_papers(rows, seed), start=1):
+        articles.append((article_id, paper['arxiv_id'], paper['title'], paper['abstract'],
+                         paper['published'], paper['doi'], paper['categories']))
+        for name in paper['authors']:
+            author_id = author_ids.setdefault(name, len(author_ids) + 1)
+            links.append((article_id, author_id))
+        if len(articles) >= 50000:
+            c.executemany('INSERT INTO articles VALUES (?, ?, ?, ?, ?, ?, ?)', articles)
+            c.executemany('INSERT OR IGNORE INTO article_authors VALUES (?, ?)', links)
+            articles, links = [], []
+    c.executemany('INSERT INTO articles VALUES (?, ?, ?, ?, ?, ?, ?)', articles)
+    c.executemany('INSERT OR IGNORE INTO article_authors VALUES (?, ?)', links)
+    c.executemany('INSERT INTO authors VALUES (?, ?)', ((i, name) for name, i in author_ids.items()))
+
+    if with_fts:
+        c.execute('CREATE VIRTUAL TABLE articles_fts USING fts5(title, abstract, categories, authors)')
+        c.execute('''INSERT INTO articles_fts (rowid, title, abstract, categories, authors)
+                     SELECT a.id, a.title, a.abstract, a.categories, COALESCE(GROUP_CONCAT(au.name, '; '), '')
+                     FROM articles a
+                     LEFT JOIN article_authors aa ON a.id = aa.article_id
+                     LEFT JOIN authors au ON aa.author_id = au.id
+                     GROUP BY a.id''')
+    conn.commit()
+    conn.close()
@@ -3,6 +3,8 @@ import sqlite3
 import logging
 import json
 import ast
+import argparse
+import re
 
  
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
@@ -29,25 +31,101 @@ category_map = {
      
 }
 
+def split_category_codes(categories):
+    """The arXiv category codes of a raw comma-separated categories value."""
+    if not isinstance(categories, str):
+        return []
+    return list(dict.fromkeys(cat.strip() for cat in categories.split(',') if cat.strip()))
+
+def codes_for_names(names):
+    """Category codes for a stored ", "-separated list of names.
+    
+    Only used to backfill databases loaded before codes were kept. Names
+    shared by several codes (Machine Learning) map to all of them, and
+    unknown names were stored as their code.
+    """
+    codes = []
+    for name in (names or '').split(','):
+        name = name.strip()
+        if name:
+            codes.extend([code for code, mapped in category_map.items() if mapped == name] or [name])
+    return list(dict.fromkeys(codes))
+
+ARXIV_VERSION = re.compile(r'(.*\d)v(\d+)')
+
+def arxiv_base_id(arxiv_id):
+    """An arXiv id without its version suffix (2401.01234v2 -> 2401.01234), so revisions key to one article."""
+    match = ARXIV_VERSION.fullmatch(str(arxiv_id))
+    return match.group(1) if match else arxiv_id
+
 def convert_categories(categories):
     """Convert category abbreviations to full names."""
     if not isinstance(categories, str) or not categories.strip():
         logging.warning(f"Invalid category format: {categories}, storing as empty")
         return ''
     cats = [cat.strip() for cat in categories.split(',')]
-    converted = [category_map.get(cat, cat) for cat in cats]   
+    # Several codes share a name (cs.LG and stat.ML are both Machine Learning); keep each name once
+    converted = dict.fromkeys(category_map.get(cat, cat) for cat in cats)
     return ', '.join(converted)
 
-try:
-     
-    logging.info("Reading arxiv_data_raw.csv...")
-    df = pd.read_csv('arxiv_data_raw.csv')
-    logging.info(f"Loaded {len(df)} papers from arxiv_data_raw.csv")
+def create_fts_index(conn):
+    """Create the articles_fts full-text index and the triggers that keep it in sync."""
+    c = conn.cursor()
+    exists = c.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'articles_fts'").fetchone()
+    try:
+        c.execute('''CREATE VIRTUAL TABLE IF NOT EXISTS articles_fts
+                     USING fts5(title, abstract, categories, authors)''')
+    except sqlite3.OperationalError as e:
+        logging.warning(f"FTS5 is not available, search will fall back to LIKE scans: {e}")
+        return False
 
-     
-    logging.info("Cleaning data...")
+    authors_of = '''(SELECT COALESCE(GROUP_CONCAT(au.name, '; '), '')
+                     FROM article_authors aa JOIN authors au ON aa.author_id = au.id
+                     WHERE aa.article_id = {ref})'''
+    c.executescript(f'''
+        CREATE TRIGGER IF NOT EXISTS articles_fts_insert AFTER INSERT ON articles BEGIN
+            INSERT INTO articles_fts (rowid, title, abstract, categories, authors)
+            VALUES (new.id, new.title, new.abstract, new.categories, '');
+        END;
+        CREATE TRIGGER IF NOT EXISTS articles_fts_delete AFTER DELETE ON articles BEGIN
+            DELETE FROM articles_fts WHERE rowid = old.id;
+        END;
+        CREATE TRIGGER IF NOT EXISTS articles_fts_update AFTER UPDATE OF title, abstract, categories ON articles BEGIN
+            UPDATE articles_fts SET title = new.title, abstract = new.abstract, categories = new.categories
+            WHERE rowid = new.id;
+        END;
+        CREATE TRIGGER IF NOT EXISTS article_authors_fts_insert AFTER INSERT ON article_authors BEGIN
+            UPDATE articles_fts SET authors = {authors_of.format(ref='new.article_id')} WHERE rowid = new.article_id;
+        END;
+        CREATE TRIGGER IF NOT EXISTS article_authors_fts_delete AFTER DELETE ON article_authors BEGIN
+            UPDATE articles_fts SET authors = {authors_of.format(ref='old.article_id')} WHERE rowid = old.article_id;
+        END;
+    ''')
+
+    if not exists:
+        # Index rows that were stored before the full-text index existed
+        c.execute('''INSERT INTO articles_fts (rowid, title, abstract, categories, authors)
+                     SELECT a.id, a.title, a.abstract, a.categories, COALESCE(GROUP_CONCAT(au.name, '; '), '')
+                     FROM articles a
+                     LEFT JOIN article_authors aa ON a.id = aa.article_id
+                     LEFT JOIN authors au ON aa.author_id = au.id
+                     GROUP BY a.id''')
+        logging.info(f"Indexed {c.rowcount} existing articles in articles_fts")
+    conn.commit()
+    return True
+
+FTS_TRIGGERS = ['articles_fts_insert', 'articles_fts_delete', 'articles_fts_update',
+                'article_authors_fts_insert', 'article_authors_fts_delete']
+BULK_CHUNK_SIZE = 50000
+
+def clean_papers(df):
+    """Deduplicate and normalize the raw arXiv dataframe."""
     try:
-        df = df.drop_duplicates(subset=['arxiv_id'])
+        df = df.assign(arxiv_id=df['arxiv_id'].map(arxiv_base_id))
+        if 'updated' in df:
+            # Several versions of a paper in one extract: keep the latest revision
+            df = df.sort_values('updated', kind='stable')
+        df = df.drop_duplicates(subset=['arxiv_id'], keep='last')
         df['title'] = df['title'].str.strip()
         df['abstract'] = df['abstract'].str.strip()
         df['doi'] = df['doi'].fillna('')
@@ -62,8 +140,9 @@ try:
                 return []
         
         df['authors'] = df['authors'].apply(safe_parse_authors)
+        df['category_codes'] = df['categories'].apply(split_category_codes)
         df['categories'] = df['categories'].apply(convert_categories)
-        logging.info(f"After cleaning, {len(df)} unique papers remain")
+        return df
     except KeyError as e:
         logging.error(f"Missing required column: {e}")
         raise
@@ -71,58 +150,398 @@ try:
         logging.error(f"Data type error during cleaning: {e}")
         raise
 
-   
-    logging.info("Connecting to arxiv_data.db...")
-    conn = sqlite3.connect('arxiv_data.db')
-    c = conn.cursor()
+# Publication year, derived from published by SQLite so it never drifts and can be indexed
+YEAR_COLUMN = "year INTEGER GENERATED ALWAYS AS (CAST(strftime('%Y', published) AS INTEGER)) VIRTUAL"
 
-     
-    logging.info("Creating database tables...")
-    c.execute('''CREATE TABLE IF NOT EXISTS articles
-                 (id INTEGER PRIMARY KEY, arxiv_id TEXT UNIQUE, title TEXT, abstract TEXT, published TEXT, doi TEXT, categories TEXT)''')
+def author_names_of(authors):
+    """The author string the API serves for a paper: names in paper order, without repeats; None without authors."""
+    names = list(dict.fromkeys(authors)) if isinstance(authors, list) else []
+    return '; '.join(names) if names else None
+
+def create_tables(conn):
+    """Create the articles, authors, article_authors and article_categories tables."""
+    c = conn.cursor()
+    c.execute(f'''CREATE TABLE IF NOT EXISTS articles
+                  (id INTEGER PRIMARY KEY, arxiv_id TEXT UNIQUE, title TEXT, abstract TEXT, published TEXT, doi TEXT, categories TEXT,
+                   {YEAR_COLUMN}, author_names TEXT)''')
     c.execute('''CREATE TABLE IF NOT EXISTS authors
                  (id INTEGER PRIMARY KEY, name TEXT)''')
     c.execute('''CREATE TABLE IF NOT EXISTS article_authors
                  (article_id INTEGER, author_id INTEGER, PRIMARY KEY (article_id, author_id))''')
+    # Clustered by code, so a category filter reads one contiguous range
+    c.execute('''CREATE TABLE IF NOT EXISTS article_categories
+                 (code TEXT NOT NULL, article_id INTEGER NOT NULL, PRIMARY KEY (code, article_id)) WITHOUT ROWID''')
+    c.execute('''CREATE TABLE IF NOT EXISTS category_names
+                 (code TEXT PRIMARY KEY, name TEXT NOT NULL)''')
+    c.executemany('INSERT OR REPLACE INTO category_names (code, name) VALUES (?, ?)', category_map.items())
+    c.execute('''CREATE TRIGGER IF NOT EXISTS articles_categories_delete AFTER DELETE ON articles BEGIN
+                     DELETE FROM article_categories WHERE article_id = old.id;
+                 END''')
+    c.execute('''CREATE TABLE IF NOT EXISTS ingest_state
+                 (key TEXT PRIMARY KEY, value TEXT)''')
+    # Change log consumed by index_abstracts.py --incremental: embeddings depend only on the abstract
+    c.executescript('''
+        CREATE TABLE IF NOT EXISTS article_changes
+            (seq INTEGER PRIMARY KEY AUTOINCREMENT, article_id INTEGER NOT NULL, deleted INTEGER NOT NULL DEFAULT 0);
+        CREATE TRIGGER IF NOT EXISTS articles_changes_insert AFTER INSERT ON articles BEGIN
+            INSERT INTO article_changes (article_id, deleted) VALUES (new.id, 0);
+        END;
+        CREATE TRIGGER IF NOT EXISTS articles_changes_update AFTER UPDATE OF abstract ON articles
+        WHEN old.abstract IS NOT new.abstract BEGIN
+            INSERT INTO article_changes (article_id, deleted) VALUES (new.id, 0);
+        END;
+        CREATE TRIGGER IF NOT EXISTS articles_changes_delete AFTER DELETE ON articles BEGIN
+            INSERT INTO article_changes (article_id, deleted) VALUES (old.id, 1);
+        END;
+    ''')
+    conn.commit()
 
-    def insert_article(conn, article):
-        c = conn.cursor()
-        c.execute('INSERT OR IGNORE INTO articles (arxiv_id, title, abstract, published, doi, categories) VALUES (?, ?, ?, ?, ?, ?)',
-                  (article['arxiv_id'], article['title'], article['abstract'], article['published'], article['doi'], article['categories']))
-        c.execute('SELECT id FROM articles WHERE arxiv_id = ?', (article['arxiv_id'],))
-        return c.fetchone()[0]
-
-    def get_or_insert_author(conn, author_name):
-        c = conn.cursor()
-        c.execute('SELECT id FROM authors WHERE name = ?', (author_name,))
-        result = c.fetchone()
-        if result:
-            return result[0]
-        c.execute('INSERT INTO authors (name) VALUES (?)', (author_name,))
-        return c.lastrowid
-
-    def insert_article_authors(conn, article_id, authors):
-        c = conn.cursor()
-        for author_name in authors:
-            author_id = get_or_insert_author(conn, author_name)
-            c.execute('INSERT OR IGNORE INTO article_authors (article_id, author_id) VALUES (?, ?)',
-                      (article_id, author_id))
- 
+STATS_TOP_AUTHORS = 50
+
+def refresh_stats(conn):
+    """Recompute the summary tables served by the API's /stats and /years endpoints.
+    
+    Runs once per ingestion, in one transaction, so readers see either the
+    old or the new aggregates. The stats generation in ingest_state is bumped
+    so the API knows to drop its cached copy.
+    """
+    with conn:
+        conn.executescript('''
+            CREATE TABLE IF NOT EXISTS ingest_state (key TEXT PRIMARY KEY, value TEXT);
+            CREATE TABLE IF NOT EXISTS stats_totals (key TEXT PRIMARY KEY, value INTEGER NOT NULL);
+            CREATE TABLE IF NOT EXISTS stats_by_year (year TEXT PRIMARY KEY, papers INTEGER NOT NULL);
+            CREATE TABLE IF NOT EXISTS stats_by_category (category TEXT PRIMARY KEY, papers INTEGER NOT NULL);
+            CREATE TABLE IF NOT EXISTS stats_top_authors
+                (author_id INTEGER PRIMARY KEY, name TEXT, papers INTEGER NOT NULL);
+        ''')
+        conn.execute('DELETE FROM stats_totals')
+        conn.execute('''INSERT INTO stats_totals (key, value)
+                        SELECT 'total_papers', COUNT(*) FROM articles
+                        UNION ALL SELECT 'total_authors', COUNT(*) FROM authors''')
+        conn.execute('DELETE FROM stats_by_year')
+        conn.execute('''INSERT INTO stats_by_year (year, papers)
+                        SELECT strftime('%Y', published) AS year, COUNT(*) FROM articles
+                        GROUP BY year HAVING year IS NOT NULL''')
+        # Categories are stored as a ", "-separated list of names, which older loads may repeat
+        # within a paper, so papers are counted by id
+        conn.execute('DELETE FROM stats_by_category')
+        conn.execute('''WITH RECURSIVE split(id, category, rest) AS (
+                            SELECT id, '', categories || ', ' FROM articles WHERE categories != ''
+                            UNION ALL
+                            SELECT id, substr(rest, 1, instr(rest, ', ') - 1), substr(rest, instr(rest, ', ') + 2)
+                            FROM split WHERE rest != ''
+                        )
+                        INSERT INTO stats_by_category (category, papers)
+                        SELECT category, COUNT(DISTINCT id) FROM split WHERE category != '' GROUP BY category''')
+        conn.execute('DELETE FROM stats_top_authors')
+        conn.execute('''INSERT INTO stats_top_authors (author_id, name, papers)
+                        SELECT au.id, au.name, top.papers
+                        FROM (SELECT author_id, COUNT(*) AS papers FROM article_authors
+                              GROUP BY author_id ORDER BY papers DESC LIMIT ?) top
+                        JOIN authors au ON au.id = top.author_id''', (STATS_TOP_AUTHORS,))
+        conn.execute('''INSERT INTO ingest_state (key, value) VALUES ('stats_generation', '1')
+                        ON CONFLICT (key) DO UPDATE SET value = CAST(value AS INTEGER) + 1''')
+
+def get_high_water_mark(conn):
+    """Latest update date already ingested, or None when nothing was ingested incrementally yet."""
+    try:
+        row = conn.execute("SELECT value FROM ingest_state WHERE key = 'high_water_mark'").fetchone()
+        return row[0] if row else None
+    except sqlite3.OperationalError:
+        return None
+
+def set_high_water_mark(conn, value):
+    with conn:
+        conn.execute("INSERT OR REPLACE INTO ingest_state (key, value) VALUES ('high_water_mark', ?)", (value,))
+
+def unversion_arxiv_ids(conn):
+    """Key stored articles by their unversioned arxiv_id, keeping only the latest version of each paper.
+    
+    Older loads stored ids such as 2401.01234v2, so a revision was inserted
+    as a second article. The older rows are deleted; the change-log trigger
+    records the deletions so index_abstracts.py --incremental drops their vectors.
+    """
+    rows = conn.execute("SELECT id, arxiv_id FROM articles WHERE arxiv_id GLOB '*[0-9]v[0-9]*'").fetchall()
+    latest = {}
+    for article_id, arxiv_id in rows:
+        match = ARXIV_VERSION.fullmatch(arxiv_id)
+        if match:
+            latest.setdefault(match.group(1), []).append((int(match.group(2)), article_id))
+    if not latest:
+        return
+    conn.execute('CREATE TEMP TABLE IF NOT EXISTS unversioned (arxiv_id TEXT PRIMARY KEY)')
+    conn.execute('DELETE FROM unversioned')
+    conn.executemany('INSERT INTO unversioned (arxiv_id) VALUES (?)', ((base_id,) for base_id in latest))
+    # An unversioned row was stored by a newer load than any of the versioned ones
+    current = {arxiv_id for (arxiv_id,) in conn.execute(
+        'SELECT a.arxiv_id FROM articles a JOIN unversioned u ON a.arxiv_id = u.arxiv_id')}
+    keep, stale = [], []
+    for base_id, versions in latest.items():
+        versions.sort()
+        older = [article_id for _, article_id in versions]
+        if base_id not in current:
+            keep.append((base_id, older.pop()))
+        stale.extend(older)
+    logging.info(f"Stripping version suffixes from {len(keep)} arxiv_ids and deleting {len(stale)} superseded versions...")
+    has_fts = conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'articles_fts'").fetchone()
+    with conn:
+        stale_rows = [(article_id,) for article_id in stale]
+        conn.executemany('DELETE FROM article_authors WHERE article_id = ?', stale_rows)
+        conn.executemany('DELETE FROM articles WHERE id = ?', stale_rows)
+        if has_fts:
+            conn.executemany('DELETE FROM articles_fts WHERE rowid = ?', stale_rows)
+        conn.executemany('UPDATE articles SET arxiv_id = ? WHERE id = ?', keep)
+    if stale:
+        refresh_stats(conn)
+
+def migrate_schema(conn):
+    """Bring a database created by an older version of this script up to the current schema.
+    
+    Strips version suffixes from stored arxiv_ids, adds the generated year
+    column, fills article_categories from the stored category names and the
+    denormalized author_names from article_authors. Safe to run repeatedly.
+    """
+    create_tables(conn)
+    unversion_arxiv_ids(conn)
+    columns = {row[1] for row in conn.execute('PRAGMA table_xinfo(articles)')}
+    if 'year' not in columns:
+        logging.info("Adding the year column to articles...")
+        conn.execute(f'ALTER TABLE articles ADD COLUMN {YEAR_COLUMN}')
+    if 'author_names' not in columns:
+        logging.info("Adding and backfilling the author_names column of articles...")
+        with conn:
+            conn.execute('ALTER TABLE articles ADD COLUMN author_names TEXT')
+            conn.execute('''UPDATE articles SET author_names =
+                                (SELECT GROUP_CONCAT(au.name, '; ') FROM article_authors aa
+                                 JOIN authors au ON au.id = aa.author_id WHERE aa.article_id = articles.id)''')
+    if not conn.execute('SELECT 1 FROM article_categories LIMIT 1').fetchone():
+        rows = conn.execute("SELECT id, categories FROM articles WHERE categories != ''")
+        links = [(code, article_id) for article_id, names in rows for code in codes_for_names(names)]
+        if links:
+            logging.info(f"Backfilling {len(links)} article categories...")
+            with conn:
+                conn.executemany('INSERT OR IGNORE INTO article_categories (code, article_id) VALUES (?, ?)', links)
+                conn.executemany('INSERT OR IGNORE INTO category_names (code, name) VALUES (?, ?)',
+                                 ((code, code) for code in {code for code, _ in links}))
+    conn.commit()
+
+def create_secondary_indexes(conn):
+    """Create lookup indexes; built once after a bulk load rather than maintained row by row."""
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_authors_name ON authors(name)')
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_article_authors_author ON article_authors(author_id)')
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_articles_year ON articles(year)')
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_article_categories_article ON article_categories(article_id)')
+    conn.commit()
+
+def category_codes_of(df):
+    """Category codes per paper: kept by clean_papers, else recovered from the names."""
+    if 'category_codes' in df:
+        return df['category_codes']
+    return df['categories'].map(codes_for_names)
+
+def bulk_insert(conn, df, chunk_size=BULK_CHUNK_SIZE):
+    """Insert cleaned papers with set-based statements.
+    
+    Article and author ids are assigned in memory so each chunk is three
+    executemany calls in one transaction. Papers whose arxiv_id is already
+    stored are skipped. The per-row FTS triggers are dropped for the load and
+    the new rows are indexed in one pass afterwards. Each article also keeps
+    its author list as one string, so serving it needs no join.
+    
+    Returns the number of new articles and the arxiv_ids that were skipped.
+    """
+    c = conn.cursor()
+    has_fts = c.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'articles_fts'").fetchone()
+    for trigger in FTS_TRIGGERS:
+        c.execute(f'DROP TRIGGER IF EXISTS {trigger}')
+    
+    known_articles = {arxiv_id for (arxiv_id,) in c.execute('SELECT arxiv_id FROM articles')}
+    author_ids = {name: author_id for author_id, name in c.execute('SELECT id, name FROM authors')}
+    first_article_id = (c.execute('SELECT MAX(id) FROM articles').fetchone()[0] or 0) + 1
+    next_article_id = first_article_id
+    next_author_id = max(author_ids.values(), default=0) + 1
+    
+    known_codes = {code for (code,) in c.execute('SELECT code FROM category_names')}
+    
+    columns = zip(df['arxiv_id'], df['title'], df['abstract'], df['published'], df['doi'],
+                  df['categories'], df['authors'], category_codes_of(df))
+    articles, new_authors, links, category_links, new_codes = [], [], [], [], []
+    skipped = []
+    
+    def flush():
+        with conn:
+            conn.executemany('INSERT INTO articles (id, arxiv_id, title, abstract, published, doi, categories, '
+                             'author_names) VALUES (?, ?, ?, ?, ?, ?, ?, ?)', articles)
+            conn.executemany('INSERT INTO authors (id, name) VALUES (?, ?)', new_authors)
+            conn.executemany('INSERT OR IGNORE INTO article_authors (article_id, author_id) VALUES (?, ?)', links)
+            conn.executemany('INSERT OR IGNORE INTO article_categories (code, article_id) VALUES (?, ?)', category_links)
+            conn.executemany('INSERT OR IGNORE INTO category_names (code, name) VALUES (?, ?)', new_codes)
+        logging.info(f"Processed {next_article_id - first_article_id} articles")
+        for rows in (articles, new_authors, links, category_links, new_codes):
+            rows.clear()
+    
+    for arxiv_id, title, abstract, published, doi, categories, authors, codes in columns:
+        if arxiv_id in known_articles:
+            skipped.append(arxiv_id)
+            continue
+        known_articles.add(arxiv_id)
+        article_id = next_article_id
+        next_article_id += 1
+        articles.append((article_id, arxiv_id, title, abstract, published, doi, categories, author_names_of(authors)))
+        for author_name in authors if isinstance(authors, list) else []:
+            author_id = author_ids.get(author_name)
+            if author_id is None:
+                author_id = author_ids[author_name] = next_author_id
+                next_author_id += 1
+                new_authors.append((author_id, author_name))
+            links.append((article_id, author_id))
+        for code in codes:
+            category_links.append((code, article_id))
+            if code not in known_codes:
+                known_codes.add(code)
+                new_codes.append((code, code))
+        if len(articles) >= chunk_size:
+            flush()
+    if articles:
+        flush()
+    
+    if has_fts:
+        # Index the new rows in one statement instead of one trigger call per row
+        with conn:
+            conn.execute('''INSERT INTO articles_fts (rowid, title, abstract, categories, authors)
+                            SELECT id, title, abstract, categories, COALESCE(author_names, '')
+                            FROM articles WHERE id >= ?''', (first_article_id,))
+    return next_article_id - first_article_id, skipped
+
+def upsert_papers(conn, df):
+    """Update stored papers whose metadata or author list changed; returns the number updated.
+    
+    Runs with the FTS and change-log triggers in place, which is cheap for the
+    handful of revised papers in a refresh.
+    """
+    c = conn.cursor()
+    c.execute('CREATE TEMP TABLE IF NOT EXISTS incoming (arxiv_id TEXT PRIMARY KEY)')
+    c.execute('DELETE FROM incoming')
+    c.executemany('INSERT OR IGNORE INTO incoming (arxiv_id) VALUES (?)', ((arxiv_id,) for arxiv_id in df['arxiv_id']))
+    stored = {}
+    for article_id, arxiv_id, title, abstract, published, doi, categories, authors in c.execute('''
+            SELECT a.id, a.arxiv_id, a.title, a.abstract, a.published, a.doi, a.categories, GROUP_CONCAT(au.name, char(31))
+            FROM articles a
+            JOIN incoming i ON a.arxiv_id = i.arxiv_id
+            LEFT JOIN article_authors aa ON a.id = aa.article_id
+            LEFT JOIN authors au ON aa.author_id = au.id
+            GROUP BY a.id''').fetchall():
+        stored[arxiv_id] = (article_id, (title, abstract, published, doi, categories),
+                            set(authors.split(chr(31))) if authors else set())
+    
+    updated = 0
+    with conn:
+        columns = zip(df['arxiv_id'], df['title'], df['abstract'], df['published'], df['doi'],
+                      df['categories'], df['authors'], category_codes_of(df))
+        for arxiv_id, title, abstract, published, doi, categories, authors, codes in columns:
+            if arxiv_id not in stored:
+                continue
+            article_id, old_fields, old_authors = stored[arxiv_id]
+            fields = (title, abstract, published, doi, categories)
+            authors = authors if isinstance(authors, list) else []
+            if fields == old_fields and set(authors) == old_authors:
+                continue
+            c.execute('UPDATE articles SET title = ?, abstract = ?, published = ?, doi = ?, categories = ? WHERE id = ?',
+                      fields + (article_id,))
+            if categories != old_fields[4]:
+                c.execute('DELETE FROM article_categories WHERE article_id = ?', (article_id,))
+                c.executemany('INSERT OR IGNORE INTO article_categories (code, article_id) VALUES (?, ?)',
+                              ((code, article_id) for code in codes))
+                c.executemany('INSERT OR IGNORE INTO category_names (code, name) VALUES (?, ?)',
+                              ((code, code) for code in codes))
+            if set(authors) != old_authors:
+                c.execute('UPDATE articles SET author_names = ? WHERE id = ?', (author_names_of(authors), article_id))
+                c.execute('DELETE FROM article_authors WHERE article_id = ?', (article_id,))
+                for author_name in authors:
+                    result = c.execute('SELECT id FROM authors WHERE name = ?', (author_name,)).fetchone()
+                    author_id = result[0] if result else c.execute('INSERT INTO authors (name) VALUES (?)', (author_name,)).lastrowid
+                    c.execute('INSERT OR IGNORE INTO article_authors (article_id, author_id) VALUES (?, ?)',
+                              (article_id, author_id))
+            updated += 1
+    return updated
+
+def store_papers(conn, df):
+    """Bulk load cleaned papers, then build secondary and full-text indexes."""
+    c = conn.cursor()
+    fresh = not c.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'articles'").fetchone()
+    # A fresh database can be rebuilt from the CSV, so skip the rollback journal while loading it;
+    # otherwise stay in WAL so the API's read-only connections keep serving during the load
+    c.execute(f"PRAGMA journal_mode={'OFF' if fresh else 'WAL'}")
+    c.execute('PRAGMA synchronous=OFF')
+    c.execute('PRAGMA temp_store=MEMORY')
+    c.execute('PRAGMA cache_size=-262144')
+    
+    logging.info("Creating database tables...")
+    migrate_schema(conn)
+    
     logging.info("Inserting data into database...")
-    batch_size = 100
-    for i, (_, row) in enumerate(df.iterrows()):
-        article_id = insert_article(conn, row)
-        insert_article_authors(conn, article_id, row['authors'])
-        
-        if (i + 1) % batch_size == 0:
-            conn.commit()
-            logging.info(f"Processed {i + 1} articles")
-    
-    conn.commit()  # Final commit for remaining records
-
-    conn.close()
-    logging.info("Data cleaned and stored in arxiv_data.db")
-except Exception as e:
-    logging.error(f"Error during cleaning/storage: {e}")
-    if 'conn' in locals():
-        conn.close()
\ No newline at end of file
+    inserted, skipped = bulk_insert(conn, df)
+    logging.info(f"Inserted {inserted} new articles")
+    
+    logging.info("Creating indexes...")
+    create_secondary_indexes(conn)
+    logging.info("Creating full-text search index...")
+    has_fts = create_fts_index(conn)
+    if skipped:
+        updated = upsert_papers(conn, df[df['arxiv_id'].isin(skipped)])
+        logging.info(f"Updated {updated} changed articles of {len(skipped)} already stored")
+    if len(df):
+        marks = df['updated'] if 'updated' in df else df['published']
+        if marks.notna().any():
+            set_high_water_mark(conn, max(str(mark) for mark in marks.dropna()))
+    if has_fts:
+        c.execute("INSERT INTO articles_fts (articles_fts) VALUES ('optimize')")
+        conn.commit()
+    logging.info("Refreshing summary statistics...")
+    refresh_stats(conn)
+    
+    c.execute('PRAGMA synchronous=NORMAL')
+    # WAL lets the API's read-only connections keep serving while this script writes
+    c.execute('PRAGMA journal_mode=WAL')
+    return inserted
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Clean extracted papers and load them into SQLite.")
+    parser.add_argument('--input', default='arxiv_data_raw.csv',
+                        help="CSV written by extract_data.py; a delta CSV adds new papers and updates revised ones")
+    parser.add_argument('--db', default='arxiv_data.db')
+    parser.add_argument('--refresh-stats', action='store_true',
+                        help="Only rebuild the summary statistics of an existing database")
+    parser.add_argument('--migrate', action='store_true',
+                        help="Only upgrade an existing database to the current schema and build its indexes")
+    args = parser.parse_args()
+    try:
+        if args.migrate or args.refresh_stats:
+            conn = sqlite3.connect(args.db)
+            if args.migrate:
+                migrate_schema(conn)
+                create_secondary_indexes(conn)
+                logging.info(f"Schema of {args.db} is up to date")
+            if args.refresh_stats:
+                refresh_stats(conn)
+                logging.info(f"Summary statistics refreshed in {args.db}")
+            conn.close()
+        else:
+            logging.info(f"Reading {args.input}...")
+            df = pd.read_csv(args.input)
+            logging.info(f"Loaded {len(df)} papers from {args.input}")
+            
+            logging.info("Cleaning data...")
+            df = clean_papers(df)
+            logging.info(f"After cleaning, {len(df)} unique papers remain")
+            
+            logging.info(f"Connecting to {args.db}...")
+            conn = sqlite3.connect(args.db)
+            store_papers(conn, df)
+            
+            conn.close()
+            logging.info(f"Data cleaned and stored in {args.db}")
+    except Exception as e:
+        logging.error(f"Error during cleaning/storage: {e}")
+        if 'conn' in locals():
+            conn.close()
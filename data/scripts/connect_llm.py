@@ -1,27 +1,69 @@
 import requests
+import asyncio
 import json
 import re
 import logging
 import os
 
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+from llm_cache import LLMResponseCache, normalize_query
+
  
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
 API_KEY = os.getenv("TOGETHER_API_KEY")
+API_URL = os.getenv("LLM_API_URL", "https://api.together.xyz/v1/chat/completions")
+LLM_MODEL = "lgai/exaone-3-5-32b-instruct"
+# Bump when the prompt changes so stale parses are not served from the cache
+PROMPT_VERSION = 1
+
+# Response cache; set LLM_CACHE_PATH to an empty string to disable it
+LLM_CACHE_PATH = os.getenv("LLM_CACHE_PATH", os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'database', 'llm_cache.db'))
+LLM_CACHE_MAX_ENTRIES = int(os.getenv("LLM_CACHE_MAX_ENTRIES", "10000"))
+LLM_CACHE_TTL_SECONDS = float(os.getenv("LLM_CACHE_TTL_SECONDS", str(7 * 24 * 3600)))
+LLM_CACHE_TEMPERATURE_ZERO = os.getenv("LLM_CACHE_TEMPERATURE_ZERO", "true").lower() == "true"
+
+def default_cache():
+    """Build the response cache configured by the environment, or None if disabled."""
+    if not LLM_CACHE_PATH:
+        return None
+    try:
+        return LLMResponseCache(LLM_CACHE_PATH, LLM_CACHE_MAX_ENTRIES, LLM_CACHE_TTL_SECONDS)
+    except Exception as e:
+        logging.warning(f"LLM response cache disabled: {e}")
+        return None
+
 class LLMConnect:
-    def __init__(self, api_key=API_KEY, api_url="https://api.together.xyz/v1/chat/completions"):
-        """Initialize the LLMConnect class with the cloud API endpoint and key."""
+    def __init__(self, api_key=API_KEY, api_url=API_URL, timeout=30.0,
+                 cache="default", temperature_zero=LLM_CACHE_TEMPERATURE_ZERO):
+        """Initialize the LLMConnect class with the cloud API endpoint and key.
+
+        cache is an LLMResponseCache, None to disable caching, or "default" for
+        the cache configured by LLM_CACHE_PATH. With temperature_zero, cached
+        calls are made at temperature 0 so the stored parse is deterministic.
+        """
         if not api_key:
             raise ValueError("API key is required for cloud LLM connection. Set TOGETHER_API_KEY environment variable.")
         self.api_url = api_url
         self.api_key = api_key
+        self.timeout = timeout
+        self.cache = default_cache() if cache == "default" else cache
+        self.temperature = 0.0 if self.cache and temperature_zero else 0.7
+        self._async_client = None
         logging.info("LLMConnect initialized for cloud API.")
 
-    def query_llm(self, user_query):
-        """Send a query to the cloud LLM API and parse the response."""
-        try:
-             
-            prompt = f"""
+    def _cache_key(self, user_query):
+        if not self.cache:
+            return None
+        return LLMResponseCache.make_key(LLM_MODEL, self.temperature, PROMPT_VERSION, normalize_query(user_query))
+
+    def _build_request(self, user_query):
+        """Build the chat completion payload and headers for a user query."""
+        prompt = f"""
 You are an AI assistant for an ArXiv research chatbot. The user has asked: "{user_query}"
 Your task is to:
 1. Extract the MAIN TOPIC the user wants to search for (ignore words like "find", "give me", "show me", "papers", "articles", numbers)
@@ -89,68 +131,115 @@ Output:
   }}
 }}
 """
+         
+        payload = {
+            "model": LLM_MODEL,
+            "messages": [
+                {"role": "system", "content": prompt},
+                {"role": "user", "content": user_query}
+            ],
+            "max_tokens": 300,
+            "temperature": self.temperature
+        }
+        headers = {
+            "Authorization": f"Bearer {self.api_key}",
+            "Content-Type": "application/json"
+        }
+        return payload, headers
+
+    def _parse_response(self, result, user_query):
+        """Parse the chat completion JSON into explanation and search_params.
+
+        Returns the parsed response and whether it is worth caching.
+        """
+        response_text = result["choices"][0]["message"]["content"]
+        logging.info("Received response from LLM: %s", response_text)
+
+         
+        response_text = re.sub(r'^```json\n|```$', '', response_text, flags=re.MULTILINE).strip()
+        try:
+            parsed_response = json.loads(response_text)
+            return parsed_response, True
+        except json.JSONDecodeError:
+            logging.error("Failed to parse LLM response as JSON: %s", response_text)
              
-            payload = {
-                "model": "lgai/exaone-3-5-32b-instruct",  
-                "messages": [
-                    {"role": "system", "content": prompt},
-                    {"role": "user", "content": user_query}
-                ],
-                "max_tokens": 300,
-                "temperature": 0.7
-            }
-            headers = {
-                "Authorization": f"Bearer {self.api_key}",
-                "Content-Type": "application/json"
+            search_params = {
+                "query": user_query,
+                "limit": "",
+                "year": "",
+                "category": "",
+                "author": "",
+                "title": "",
+                "abstract": ""
             }
-
              
-            response = requests.post(self.api_url, json=payload, headers=headers)
-            response.raise_for_status()
-            result = response.json()
+            year_match = re.search(r'\b(20\d{2})\b', user_query)
+            if year_match:
+                search_params["year"] = year_match.group(1)
+            return {
+                "explanation": "",
+                "search_params": search_params
+            }, False
 
-             
-            response_text = result["choices"][0]["message"]["content"]
-            logging.info("Received response from LLM: %s", response_text)
+    def _error_response(self, user_query, error):
+        """Fallback response used when the LLM call fails."""
+        logging.error("Error querying LLM: %s", error, exc_info=True)
+        return {
+            "explanation": "",
+            "search_params": {
+                "query": user_query,
+                "limit": "",
+                "year": "",
+                "category": "",
+                "author": "",
+                "title": "",
+                "abstract": ""
+            },
+            "error": str(error)
+        }
 
-             
-            response_text = re.sub(r'^```json\n|```$', '', response_text, flags=re.MULTILINE).strip()
-            try:
-                parsed_response = json.loads(response_text)
-                return parsed_response
-            except json.JSONDecodeError:
-                logging.error("Failed to parse LLM response as JSON: %s", response_text)
-                 
-                search_params = {
-                    "query": user_query,
-                    "limit": "",
-                    "year": "",
-                    "category": "",
-                    "author": "",
-                    "title": "",
-                    "abstract": ""
-                }
-                 
-                year_match = re.search(r'\b(20\d{2})\b', user_query)
-                if year_match:
-                    search_params["year"] = year_match.group(1)
-                return {
-                    "explanation": "",
-                    "search_params": search_params
-                }
+    def query_llm(self, user_query):
+        """Send a query to the cloud LLM API and parse the response."""
+        cache_key = self._cache_key(user_query)
+        if cache_key:
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                return cached
+        try:
+            payload, headers = self._build_request(user_query)
+            response = requests.post(self.api_url, json=payload, headers=headers, timeout=self.timeout)
+            response.raise_for_status()
+            parsed_response, cacheable = self._parse_response(response.json(), user_query)
+        except Exception as e:
+            return self._error_response(user_query, e)
+        if cache_key and cacheable:
+            self.cache.set(cache_key, parsed_response)
+        return parsed_response
 
+    async def aquery_llm(self, user_query):
+        """Async variant of query_llm that does not block the event loop."""
+        if httpx is None:
+            return await asyncio.to_thread(self.query_llm, user_query)
+        cache_key = self._cache_key(user_query)
+        if cache_key:
+            cached = await asyncio.to_thread(self.cache.get, cache_key)
+            if cached is not None:
+                return cached
+        try:
+            payload, headers = self._build_request(user_query)
+            if self._async_client is None:
+                self._async_client = httpx.AsyncClient(timeout=self.timeout)
+            response = await self._async_client.post(self.api_url, json=payload, headers=headers)
+            response.raise_for_status()
+            parsed_response, cacheable = self._parse_response(response.json(), user_query)
         except Exception as e:
-            logging.error("Error querying LLM: %s", e, exc_info=True)
-            return {
-                "explanation": "",
-                "search_params": {
-                    "query": user_query,
-                    "limit": "",
-                    "year": "",
-                    "category": "",
-                    "author": "",
-                    "title": "",
-                    "abstract": ""
-                },
-                "error": str(e)
-            }
\ No newline at end of file
+            return self._error_response(user_query, e)
+        if cache_key and cacheable:
+            await asyncio.to_thread(self.cache.set, cache_key, parsed_response)
+        return parsed_response
+
+    async def aclose(self):
+        """Close the pooled async HTTP client."""
+        if self._async_client is not None:
+            await self._async_client.aclose()
+            self._async_client = None
@@ -0,0 +1,279 @@
+import hashlib
+import json
+import logging
+import multiprocessing
+import os
+import shutil
+import sqlite3
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+MIN_ABSTRACT_LENGTH = 10
+MAX_ABSTRACT_LENGTH = 5000
+
+
+def prepare_abstract(abstract):
+    """Strip and truncate an abstract, or return None when it is too short to embed."""
+    abstract = str(abstract).strip()
+    if len(abstract) <= MIN_ABSTRACT_LENGTH:  # Minimum length validation
+        return None
+    return abstract[:MAX_ABSTRACT_LENGTH]  # Truncate to prevent memory issues
+
+
+def iter_abstract_chunks(conn, chunk_size=10000, after_id=0):
+    """Yield (article ids, abstracts) chunks in id order, reading one chunk at a time.
+
+    Keyset pagination on the primary key keeps every query an index range
+    scan, so resuming after ``after_id`` costs nothing extra.
+    """
+    while True:
+        rows = conn.execute('''SELECT id, abstract FROM articles
+                               WHERE id > ? AND abstract IS NOT NULL AND abstract != ""
+                               ORDER BY id LIMIT ?''', (after_id, chunk_size)).fetchall()
+        if not rows:
+            return
+        after_id = rows[-1][0]
+        ids, abstracts = [], []
+        for article_id, abstract in rows:
+            abstract = prepare_abstract(abstract)
+            if abstract is not None:
+                ids.append(article_id)
+                abstracts.append(abstract)
+        yield np.asarray(ids, dtype=np.int64), abstracts, after_id
+
+
+_worker_model = None
+
+
+def _init_worker(model_name, threads):
+    """Load the model once per worker process and keep the processes from oversubscribing cores."""
+    global _worker_model
+    try:
+        import torch
+        torch.set_num_threads(threads)
+    except ImportError:
+        pass
+    from sentence_transformers import SentenceTransformer
+    _worker_model = SentenceTransformer(model_name)
+
+
+def _encode_batch(texts):
+    return np.asarray(_worker_model.encode(texts, batch_size=len(texts), normalize_embeddings=True), dtype=np.float32)
+
+
+class ChunkEncoder:
+    """Encode abstracts into normalized float32 vectors, in batches, optionally across worker processes."""
+
+    def __init__(self, model_name, batch_size=256, workers=1):
+        self.model_name = model_name
+        self.batch_size = batch_size
+        self.workers = workers
+        self._model = None
+        self._pool = None
+
+    def _start(self):
+        """Load the model (or start the worker pool) on first use, so fully cached runs never load it."""
+        if self.workers > 1:
+            threads = max(1, (os.cpu_count() or self.workers) // self.workers)
+            # Fork so workers do not re-run the calling script; the parent never loads the model itself
+            context = multiprocessing.get_context('fork') if 'fork' in multiprocessing.get_all_start_methods() else None
+            self._pool = ProcessPoolExecutor(self.workers, mp_context=context, initializer=_init_worker,
+                                             initargs=(self.model_name, threads))
+        else:
+            from sentence_transformers import SentenceTransformer
+            self._model = SentenceTransformer(self.model_name)
+
+    def encode(self, texts):
+        if not texts:
+            return np.empty((0, 0), dtype=np.float32)
+        if self._pool is None and self._model is None:
+            self._start()
+        if self._pool is None:
+            return np.asarray(self._model.encode(texts, batch_size=self.batch_size, normalize_embeddings=True),
+                              dtype=np.float32)
+        batches = [texts[i:i + self.batch_size] for i in range(0, len(texts), self.batch_size)]
+        return np.vstack(list(self._pool.map(_encode_batch, batches)))
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class ShardStore:
+    """Embeddings written to disk as numbered .npy shards, with a checkpoint of the last finished one.
+
+    Each shard is a float32 vector matrix plus the matching int64 article ids.
+    A shard is written under a temporary name and renamed before the
+    checkpoint moves past it, so a crash loses at most the chunk in progress.
+    Shards are read back memory-mapped.
+    """
+
+    def __init__(self, directory, model_name):
+        self.directory = directory
+        self.model_name = model_name
+        self.checkpoint_path = os.path.join(directory, 'checkpoint.json')
+        os.makedirs(directory, exist_ok=True)
+        self.checkpoint = self._read_checkpoint()
+
+    def _read_checkpoint(self):
+        if os.path.exists(self.checkpoint_path):
+            with open(self.checkpoint_path) as f:
+                checkpoint = json.load(f)
+            if checkpoint.get('model_name') == self.model_name:
+                return checkpoint
+            logging.info("Embedding checkpoint was written by another model, starting over")
+            self.reset()
+        return {'model_name': self.model_name, 'shards': 0, 'vectors': 0, 'last_id': 0}
+
+    def _write_checkpoint(self):
+        tmp_path = self.checkpoint_path + '.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump(self.checkpoint, f)
+        os.replace(tmp_path, self.checkpoint_path)
+
+    def _shard_paths(self, number):
+        stem = os.path.join(self.directory, f'shard_{number:05d}')
+        return stem + '.vectors.npy', stem + '.ids.npy'
+
+    @property
+    def last_id(self):
+        """Highest article id read by the finished shards; resume reading after it."""
+        return self.checkpoint['last_id']
+
+    def set_state(self, key, value):
+        """Keep extra build state (such as the change-log position) in the checkpoint."""
+        self.checkpoint[key] = value
+        self._write_checkpoint()
+
+    def append(self, ids, vectors, last_id):
+        """Write one shard and advance the checkpoint to ``last_id``."""
+        vectors_path, ids_path = self._shard_paths(self.checkpoint['shards'])
+        for path, array in ((vectors_path, np.asarray(vectors, dtype=np.float32)),
+                            (ids_path, np.asarray(ids, dtype=np.int64))):
+            with open(path + '.tmp', 'wb') as f:
+                np.save(f, array)
+            os.replace(path + '.tmp', path)
+        self.checkpoint['shards'] += 1
+        self.checkpoint['vectors'] += len(ids)
+        self.checkpoint['last_id'] = int(last_id)
+        self._write_checkpoint()
+
+    def shards(self):
+        """(ids, vectors) of every finished shard, memory-mapped."""
+        return [(np.load(ids_path, mmap_mode='r'), np.load(vectors_path, mmap_mode='r'))
+                for vectors_path, ids_path in map(self._shard_paths, range(self.checkpoint['shards']))]
+
+    def reset(self):
+        shutil.rmtree(self.directory, ignore_errors=True)
+        os.makedirs(self.directory, exist_ok=True)
+        self.checkpoint = {'model_name': self.model_name, 'shards': 0, 'vectors': 0, 'last_id': 0}
+
+
+def content_hash(text):
+    """Key of an abstract in the embedding store: a hash of the exact text that is encoded."""
+    return hashlib.blake2b(text.encode('utf-8'), digest_size=16).hexdigest()
+
+
+class EmbeddingStore:
+    """Persistent embeddings keyed by (model name, hash of the truncated abstract).
+
+    Each model gets its own directory holding the vectors as one raw float32 or
+    float16 file, read back as a memmap, and a small SQLite table mapping
+    content hashes to rows of that file. Unchanged abstracts are therefore
+    never encoded twice, whatever index is built from them.
+    """
+
+    def __init__(self, directory, model_name, dtype='float32'):
+        self.directory = os.path.join(directory, model_name.replace('/', '__'))
+        os.makedirs(self.directory, exist_ok=True)
+        self.manifest_path = os.path.join(self.directory, 'manifest.json')
+        self.vectors_path = os.path.join(self.directory, 'vectors.bin')
+        if os.path.exists(self.manifest_path):
+            with open(self.manifest_path) as f:
+                self.manifest = json.load(f)
+            if self.manifest['dtype'] != dtype:
+                logging.info(f"Embedding store keeps its existing {self.manifest['dtype']} vectors")
+        else:
+            self.manifest = {'model_name': model_name, 'dtype': dtype, 'dimension': None}
+        self.dtype = np.dtype(self.manifest['dtype'])
+        self._conn = sqlite3.connect(os.path.join(self.directory, 'hashes.db'))
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('''CREATE TABLE IF NOT EXISTS embeddings
+                              (content_hash TEXT PRIMARY KEY, row INTEGER NOT NULL)''')
+        self.count = self._conn.execute('SELECT COUNT(*) FROM embeddings').fetchone()[0]
+        self._mmap = None
+        self.hits = 0
+        self.misses = 0
+        if self.manifest['dimension'] and os.path.exists(self.vectors_path):
+            # Drop vectors appended by a run that died before recording their hashes
+            with open(self.vectors_path, 'r+b') as f:
+                f.truncate(self.count * self.manifest['dimension'] * self.dtype.itemsize)
+
+    def _write_manifest(self):
+        tmp_path = self.manifest_path + '.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump(self.manifest, f)
+        os.replace(tmp_path, self.manifest_path)
+
+    def lookup(self, hashes):
+        """Store rows for the given content hashes, -1 where the hash is not stored."""
+        found = {}
+        for start in range(0, len(hashes), 500):
+            batch = hashes[start:start + 500]
+            query = f"SELECT content_hash, row FROM embeddings WHERE content_hash IN ({','.join('?' * len(batch))})"
+            found.update(self._conn.execute(query, batch).fetchall())
+        return np.fromiter((found.get(h, -1) for h in hashes), dtype=np.int64, count=len(hashes))
+
+    def vectors(self, rows):
+        """Stored vectors for the given rows as float32."""
+        if self._mmap is None or len(self._mmap) < self.count:
+            self._mmap = np.memmap(self.vectors_path, dtype=self.dtype, mode='r',
+                                   shape=(self.count, self.manifest['dimension']))
+        return np.asarray(self._mmap[np.asarray(rows, dtype=np.int64)], dtype=np.float32)
+
+    def add(self, hashes, vectors):
+        """Append vectors for new content hashes and return their rows."""
+        vectors = np.ascontiguousarray(vectors, dtype=self.dtype)
+        if self.manifest['dimension'] is None:
+            self.manifest['dimension'] = int(vectors.shape[1])
+            self._write_manifest()
+        with open(self.vectors_path, 'ab') as f:
+            f.write(vectors.tobytes())
+            f.flush()
+            os.fsync(f.fileno())
+        rows = np.arange(self.count, self.count + len(hashes), dtype=np.int64)
+        with self._conn:
+            self._conn.executemany('INSERT INTO embeddings (content_hash, row) VALUES (?, ?)',
+                                   zip(hashes, rows.tolist()))
+        self.count += len(hashes)
+        return rows
+
+    def fetch_or_encode(self, texts, encode):
+        """Vectors for ``texts``, calling ``encode`` only for texts the store has not seen."""
+        hashes = [content_hash(text) for text in texts]
+        rows = self.lookup(hashes)
+        missing = {}
+        for position in np.flatnonzero(rows < 0):
+            missing.setdefault(hashes[position], texts[position])
+        self.hits += len(texts) - int((rows < 0).sum())
+        self.misses += len(missing)
+        if missing:
+            new_rows = dict(zip(missing, self.add(list(missing), encode(list(missing.values())))))
+            rows = np.fromiter((new_rows[h] if row < 0 else row for h, row in zip(hashes, rows)),
+                               dtype=np.int64, count=len(hashes))
+        return self.vectors(rows)
+
+    def close(self):
+        self._mmap = None
+        self._conn.close()
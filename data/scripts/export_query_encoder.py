@@ -0,0 +1,82 @@
+import argparse
+import json
+import logging
+import os
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), 'backend'))
+from services.encoder_backends import DRIFT_QUERIES, MIN_COSINE, OnnxQueryModel, min_cosine_similarity  # noqa: E402
+
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+MODEL_NAME = 'all-MiniLM-L6-v2'
+OUTPUT_DIR = '../models/all-MiniLM-L6-v2-onnx'
+
+parser = argparse.ArgumentParser(description="Export the query encoder to ONNX (and int8) for CPU serving.")
+parser.add_argument('--model', default=MODEL_NAME)
+parser.add_argument('--output', default=OUTPUT_DIR)
+parser.add_argument('--opset', type=int, default=17)
+parser.add_argument('--no-quantize', action='store_true', help="Skip writing the dynamically int8-quantized model_int8.onnx")
+parser.add_argument('--min-cosine', type=float, default=MIN_COSINE,
+                    help="Fail when an exported model's embeddings drift below this cosine similarity")
+args = parser.parse_args()
+
+
+def check_compatibility(reference, model_dir, quantized):
+    """Minimum cosine similarity between the PyTorch and ONNX embeddings of the drift queries."""
+    return min_cosine_similarity(reference, OnnxQueryModel(model_dir, quantized=quantized).encode(DRIFT_QUERIES))
+
+
+try:
+    import torch
+    from sentence_transformers import SentenceTransformer, models
+
+    logging.info(f"Loading {args.model}...")
+    model = SentenceTransformer(args.model, device='cpu')
+    transformer = model[0]
+    pooling = next((m for m in model if isinstance(m, models.Pooling)), None)
+    if pooling is not None and pooling.get_pooling_mode_str() != 'mean':
+        raise ValueError(f"Only mean pooling is supported, {args.model} uses {pooling.get_pooling_mode_str()}")
+
+    os.makedirs(args.output, exist_ok=True)
+    onnx_path = os.path.join(args.output, 'model.onnx')
+    logging.info(f"Exporting transformer to {onnx_path}...")
+    features = model.tokenizer(['a sample query'], return_tensors='pt')
+    input_names = [name for name in ('input_ids', 'attention_mask', 'token_type_ids') if name in features]
+    dynamic_axes = {name: {0: 'batch', 1: 'sequence'} for name in input_names}
+    dynamic_axes['last_hidden_state'] = {0: 'batch', 1: 'sequence'}
+    transformer.auto_model.eval()
+    with torch.no_grad():
+        torch.onnx.export(transformer.auto_model, tuple(features[name] for name in input_names), onnx_path,
+                          input_names=input_names, output_names=['last_hidden_state'],
+                          dynamic_axes=dynamic_axes, opset_version=args.opset)
+
+    model.tokenizer.save_pretrained(args.output)
+    with open(os.path.join(args.output, 'encoder_config.json'), 'w') as f:
+        json.dump({
+            'model_name': args.model,
+            'dimension': model.get_sentence_embedding_dimension(),
+            'max_seq_length': model.max_seq_length,
+            'pad_token_id': model.tokenizer.pad_token_id or 0,
+            'pooling': 'mean',
+            'normalize': any(isinstance(m, models.Normalize) for m in model),
+        }, f, indent=2)
+
+    if not args.no_quantize:
+        from onnxruntime.quantization import QuantType, quantize_dynamic
+        logging.info("Writing dynamically int8-quantized model_int8.onnx...")
+        quantize_dynamic(onnx_path, os.path.join(args.output, 'model_int8.onnx'), weight_type=QuantType.QInt8)
+
+    reference = model.encode(DRIFT_QUERIES)
+    for quantized in ([False] if args.no_quantize else [False, True]):
+        cosine = check_compatibility(reference, args.output, quantized)
+        label = 'int8' if quantized else 'fp32'
+        logging.info(f"ONNX {label} encoder: minimum cosine similarity to PyTorch {cosine:.5f}")
+        if cosine < args.min_cosine:
+            raise ValueError(f"ONNX {label} embeddings drift too far from the index (cosine {cosine:.5f} < {args.min_cosine})")
+    logging.info(f"Query encoder exported to {args.output}")
+except ValueError as e:
+    logging.error(f"Export validation error: {e}")
+except ImportError as e:
+    logging.error(f"Exporting needs torch, sentence-transformers, onnxruntime and tokenizers: {e}")
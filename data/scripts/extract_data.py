@@ -4,9 +4,14 @@ import logging
 import csv
 from datetime import datetime
 import time
+import argparse
+import re
+import sqlite3
 
  
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s', filename='extract_data.log')
+# Imported once logging is configured, so clean_and_store's own basicConfig does not replace the log file
+from clean_and_store import get_high_water_mark  # noqa: E402
 
  
 start_date = datetime(2020, 1, 1)
@@ -20,6 +25,31 @@ categories = [
      
 ]
 
+parser = argparse.ArgumentParser(description="Fetch papers from the arXiv API into a CSV.")
+parser.add_argument('--incremental', action='store_true',
+                    help="Only fetch papers updated since the high-water mark recorded in --db")
+parser.add_argument('--db', default='arxiv_data.db')
+parser.add_argument('--output', help="CSV path (default: arxiv_data_raw.csv, or arxiv_data_delta.csv with --incremental)")
+args = parser.parse_args()
+output_path = args.output or ('arxiv_data_delta.csv' if args.incremental else 'arxiv_data_raw.csv')
+
+def read_high_water_mark(db_path):
+    """Latest update date stored by clean_and_store.py, or None when nothing was ingested yet."""
+    try:
+        conn = sqlite3.connect(f'file:{db_path}?mode=ro', uri=True)
+    except sqlite3.OperationalError:
+        return None
+    try:
+        return get_high_water_mark(conn)
+    finally:
+        conn.close()
+
+high_water_mark = read_high_water_mark(args.db) if args.incremental else None
+if high_water_mark:
+    start_date = datetime.fromisoformat(high_water_mark[:10])
+    end_date = datetime.now()
+    logging.info(f"Incremental extraction of papers updated since {high_water_mark}")
+
 all_papers = []
 
 try:
@@ -28,14 +58,23 @@ try:
         try:
             logging.info(f"Fetching papers for category: {category}")
             try:
-                search = arxiv.Search(
-                    query=f"cat:{category}",
-                    max_results=max_results_per_category,
-                    sort_by=arxiv.SortCriterion.SubmittedDate,
-                    iterative=True,
-                    created__gte=start_date,
-                    created__lte=end_date
-                )
+                if high_water_mark:
+                    # Newest updates first, so the scan can stop at the high-water mark
+                    search = arxiv.Search(
+                        query=f"cat:{category}",
+                        max_results=max_results_per_category,
+                        sort_by=arxiv.SortCriterion.LastUpdatedDate,
+                        sort_order=arxiv.SortOrder.Descending
+                    )
+                else:
+                    search = arxiv.Search(
+                        query=f"cat:{category}",
+                        max_results=max_results_per_category,
+                        sort_by=arxiv.SortCriterion.SubmittedDate,
+                        iterative=True,
+                        created__gte=start_date,
+                        created__lte=end_date
+                    )
             except ValueError as e:
                 logging.error(f"Invalid search parameters for category {category}: {e}")
                 continue
@@ -43,11 +82,15 @@ try:
             papers = []
             try:
                 for result in search.results():
+                    if high_water_mark and result.updated.date().isoformat() < high_water_mark[:10]:
+                        break
                     paper = {
-                        'arxiv_id': result.entry_id.split('/')[-1],
+                        # Unversioned, so a revision updates the stored paper instead of adding another
+                        'arxiv_id': re.sub(r'v\d+$', '', result.get_short_id()),
                         'title': result.title,
                         'abstract': result.summary,
                         'published': result.published.date().isoformat(),
+                        'updated': result.updated.date().isoformat(),
                         'doi': result.doi if result.doi else '',
                         'authors': [author.name for author in result.authors],
                         'categories': ', '.join(result.categories)   
@@ -73,8 +116,8 @@ try:
         raise ValueError("No papers were successfully extracted")
      
     df = pd.DataFrame(all_papers)
-    df.to_csv('arxiv_data_raw.csv', index=False, quoting=csv.QUOTE_NONNUMERIC)
-    logging.info(f"Extracted and saved {len(df)} papers to arxiv_data_raw.csv")
+    df.to_csv(output_path, index=False, quoting=csv.QUOTE_NONNUMERIC)
+    logging.info(f"Extracted and saved {len(df)} papers to {output_path}")
 except ValueError as e:
     logging.error(f"Data validation error: {e}")
 except PermissionError as e:
@@ -1,58 +1,200 @@
 import pandas as pd
 import sqlite3
 import numpy as np
-from sentence_transformers import SentenceTransformer
 import faiss
 import logging
+import argparse
+import os
+
+from index_builder import (INDEX_TYPES, add_vectors, build_index_from_shards, remove_vectors,
+                           write_index_manifest, write_index_metadata)
+from index_files import load_index_metadata
+from embedding_pipeline import ChunkEncoder, EmbeddingStore, ShardStore, iter_abstract_chunks, prepare_abstract
 
  
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
-try:
-     
-    logging.info("Connecting to arxiv_data.db...")
-    conn = sqlite3.connect('arxiv_data.db')
-    df = pd.read_sql('SELECT id, abstract FROM articles WHERE abstract IS NOT NULL AND abstract != ""', conn)
-    conn.close()
+MODEL_NAME = 'all-MiniLM-L6-v2'
+INDEX_PATH = '../indexes/faiss_index.index'
+
+parser = argparse.ArgumentParser(description="Embed abstracts and build the FAISS index.")
+parser.add_argument('--index-type', choices=INDEX_TYPES, default='flat',
+                    help="flat is exact; ivf_flat, ivf_pq and hnsw are approximate and scale to millions of vectors")
+parser.add_argument('--nlist', type=int, help="IVF lists (default: about 4*sqrt(n))")
+parser.add_argument('--pq-m', type=int, default=16, help="IVF-PQ sub-quantizers, must divide the dimension")
+parser.add_argument('--pq-nbits', type=int, default=8, help="IVF-PQ bits per sub-quantizer code")
+parser.add_argument('--hnsw-m', type=int, default=32, help="HNSW neighbors per node")
+parser.add_argument('--ef-construction', type=int, default=200, help="HNSW build-time search depth")
+parser.add_argument('--train-sample', type=int, default=100000, help="Vectors sampled to train IVF indexes")
+parser.add_argument('--nprobe', type=int, default=16, help="Default IVF lists probed per query, stored in the metadata")
+parser.add_argument('--ef-search', type=int, default=64, help="Default HNSW query depth, stored in the metadata")
+parser.add_argument('--incremental', action='store_true',
+                    help="Apply the article change log to the existing index instead of re-embedding everything")
+parser.add_argument('--db', default='arxiv_data.db')
+parser.add_argument('--chunk-size', type=int, default=10000, help="Abstracts read from SQLite and checkpointed per shard")
+parser.add_argument('--batch-size', type=int, default=256, help="Abstracts per model.encode call")
+parser.add_argument('--workers', type=int, default=1, help="Encoder processes; each loads its own copy of the model")
+parser.add_argument('--restart', action='store_true', help="Discard a checkpointed partial build and start over")
+parser.add_argument('--keep-shards', action='store_true', help="Keep the embedding shards after the index is written")
+parser.add_argument('--store-dtype', choices=('float32', 'float16'), default='float32',
+                    help="Precision of newly created embedding stores; float16 halves their size")
+args = parser.parse_args()
+
+IDS_PATH = '../database/article_ids.npy'
+SHARDS_DIR = '../embeddings/build'
+STORE_DIR = '../embeddings/store'
+
+def load_abstracts(conn, article_ids):
+    """Read, validate and truncate the abstracts of the given article ids."""
+    conn.execute('CREATE TEMP TABLE IF NOT EXISTS wanted_ids (id INTEGER PRIMARY KEY)')
+    conn.execute('DELETE FROM wanted_ids')
+    conn.executemany('INSERT OR IGNORE INTO wanted_ids (id) VALUES (?)', ((int(i),) for i in article_ids))
+    abstracts = []
+    valid_ids = []
+    rows = conn.execute('SELECT id, abstract FROM articles WHERE abstract IS NOT NULL AND abstract != "" '
+                        'AND id IN (SELECT id FROM wanted_ids)')
+    for article_id, abstract in rows:
+        abstract = prepare_abstract(abstract)
+        if abstract is not None:
+            abstracts.append(abstract)
+            valid_ids.append(article_id)
+    return valid_ids, abstracts
+
+def read_changes(conn):
+    """Latest change-log sequence number plus the changed and deleted article ids up to it."""
+    try:
+        rows = conn.execute('SELECT seq, article_id, deleted FROM article_changes ORDER BY seq').fetchall()
+    except sqlite3.OperationalError:
+        return None, np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+    latest = {article_id: deleted for _, article_id, deleted in rows}
+    changed = np.fromiter((i for i, deleted in latest.items() if not deleted), dtype=np.int64)
+    deleted = np.fromiter((i for i, deleted in latest.items() if deleted), dtype=np.int64)
+    return (rows[-1][0] if rows else None), changed, deleted
+
+def clear_changes(conn, last_seq):
+    """Drop change-log entries that are now reflected in the index."""
+    if last_seq is not None:
+        with conn:
+            conn.execute('DELETE FROM article_changes WHERE seq <= ?', (last_seq,))
+
+def replace_file(path, write):
+    """Write to a temporary file and rename it over ``path`` so readers never see a partial file."""
+    tmp_path = path + '.tmp'
+    write(tmp_path)
+    os.replace(tmp_path, path)
+
+def save_index(index, article_ids, index_type, build_params, search_params):
+    os.makedirs('../indexes', exist_ok=True)
+    os.makedirs('../database', exist_ok=True)
+    article_ids = np.asarray(article_ids, dtype=np.int64)
+    replace_file(INDEX_PATH, lambda path: faiss.write_index(index, path))
+    # Raw int64 id list that the API memory-maps; the CSV is kept for other tools
+    def write_ids(path):
+        with open(path, 'wb') as f:
+            np.save(f, article_ids)
+    replace_file(IDS_PATH, write_ids)
+    pd.DataFrame({'id': article_ids}).to_csv('../database/article_ids.csv', index=False)
+    write_index_metadata(INDEX_PATH, index, index_type, MODEL_NAME, build_params, search_params, id_mapped=True)
+    # Written last: a running API reloads the index once this new version appears
+    manifest = write_index_manifest(INDEX_PATH, IDS_PATH, index.ntotal)
+    logging.info(f"Published index version {manifest['version']}")
+
+def build_full(conn, embed):
+    """Embed every abstract chunk by chunk into checkpointed shards, then build the index from them."""
+    store = ShardStore(SHARDS_DIR, MODEL_NAME)
+    if args.restart:
+        store.reset()
+    if store.checkpoint['shards']:
+        logging.info(f"Resuming from checkpoint: {store.checkpoint['vectors']} abstracts already embedded")
+    else:
+        # Changes logged from here on are not guaranteed to be in the build
+        last_seq, _, _ = read_changes(conn)
+        store.set_state('change_seq', last_seq)
     
-    if df.empty:
+    logging.info("Generating embeddings with SentenceTransformer...")
+    for ids, abstracts, last_id in iter_abstract_chunks(conn, args.chunk_size, after_id=store.last_id):
+        if not abstracts:
+            store.set_state('last_id', last_id)
+            continue
+        store.append(ids, embed(abstracts), last_id)
+        logging.info(f"Embedded {store.checkpoint['vectors']} abstracts")
+    if not store.checkpoint['vectors']:
         raise ValueError("No valid abstracts found in database")
+    logging.info(f"Generated normalized embeddings for {store.checkpoint['vectors']} abstracts")
+    
+    logging.info(f"Creating {args.index_type} FAISS index...")
+    # All index types use inner product on normalized vectors
+    build_params = {'train_sample': args.train_sample}
+    if args.index_type in ('ivf_flat', 'ivf_pq'):
+        build_params['nlist'] = args.nlist
+    if args.index_type == 'ivf_pq':
+        build_params.update(pq_m=args.pq_m, pq_nbits=args.pq_nbits)
+    if args.index_type == 'hnsw':
+        build_params.update(hnsw_m=args.hnsw_m, ef_construction=args.ef_construction)
+    # Labelled with article ids so later refreshes can add and remove vectors in place
+    shards = store.shards()
+    index = build_index_from_shards(shards, args.index_type, **build_params)
+    logging.info("FAISS index created")
     
-    logging.info(f"Loaded {len(df)} valid abstracts from arxiv_data.db")
+    logging.info("Saving FAISS index and article IDs...")
+    article_ids = np.concatenate([ids for ids, _ in shards])
+    save_index(index, article_ids, args.index_type, build_params, {'nprobe': args.nprobe, 'ef_search': args.ef_search})
+    clear_changes(conn, store.checkpoint.get('change_seq'))
+    if not args.keep_shards:
+        store.reset()
+    logging.info(f"Abstracts indexed and saved to {INDEX_PATH} and {IDS_PATH}")
 
-     
-    logging.info("Generating embeddings with SentenceTransformer...")
-    model = SentenceTransformer('all-MiniLM-L6-v2')
+def update_incremental(conn, embed):
+    """Re-embed only added or edited abstracts and patch the existing index in place."""
+    metadata = load_index_metadata(INDEX_PATH)
+    if not metadata.get('id_mapped'):
+        raise ValueError("The existing index is not labelled with article ids; rebuild it once without --incremental")
+    last_seq, changed, deleted = read_changes(conn)
+    if last_seq is None:
+        logging.info("No article changes since the last index build")
+        return
     
-    # Validate and sanitize abstracts
-    abstracts = []
-    valid_ids = []
-    for idx, row in df.iterrows():
-        abstract = str(row['abstract']).strip()
-        if len(abstract) > 10:  # Minimum length validation
-            abstracts.append(abstract[:5000])  # Truncate to prevent memory issues
-            valid_ids.append(row['id'])
+    index = faiss.read_index(INDEX_PATH)
+    current_ids = np.load(IDS_PATH)
+    stale = np.concatenate([changed, deleted])
+    stale = stale[np.isin(stale, current_ids)]
+    if len(stale):
+        if metadata.get('index_type') == 'hnsw':
+            raise ValueError("HNSW indexes cannot remove vectors; rebuild without --incremental to apply edits and deletions")
+        removed = remove_vectors(index, stale)
+        logging.info(f"Removed {removed} stale vectors")
     
-    if not abstracts:
-        raise ValueError("No valid abstracts after filtering")
+    new_ids = []
+    for start in range(0, len(changed), args.chunk_size):
+        ids, abstracts = load_abstracts(conn, changed[start:start + args.chunk_size])
+        if abstracts:
+            logging.info(f"Embedding {len(abstracts)} new or edited abstracts...")
+            add_vectors(index, embed(abstracts), ids)
+            new_ids.extend(ids)
     
-    vectors = model.encode(abstracts, show_progress_bar=True, normalize_embeddings=True)
-    logging.info(f"Generated normalized embeddings for {len(vectors)} abstracts")
-
-     
-    logging.info("Creating FAISS index...")
-    dimension = vectors.shape[1]
-    index = faiss.IndexFlatIP(dimension)  # Use inner product for normalized vectors
-    index.add(np.array(vectors, dtype=np.float32))
-    logging.info("FAISS index created")
+    kept_ids = current_ids[~np.isin(current_ids, stale)]
+    article_ids = np.concatenate([kept_ids, np.asarray(new_ids, dtype=np.int64)])
+    save_index(index, article_ids, metadata.get('index_type', 'flat'),
+               metadata.get('build_params', {}), metadata.get('search_params', {}))
+    clear_changes(conn, last_seq)
+    logging.info(f"Index now holds {index.ntotal} vectors (+{len(new_ids)} embedded, -{len(stale)} removed)")
 
+try:
      
-    logging.info("Saving FAISS index and article IDs...")
-    import os
-    os.makedirs('../indexes', exist_ok=True)
-    faiss.write_index(index, '../indexes/faiss_index.index')
-    pd.DataFrame({'id': valid_ids}).to_csv('../database/article_ids.csv', index=False)
-    logging.info("Abstracts indexed and saved to ../indexes/faiss_index.index and ../database/article_ids.csv")
+    logging.info(f"Connecting to {args.db}...")
+    conn = sqlite3.connect(args.db)
+    embedding_store = EmbeddingStore(STORE_DIR, MODEL_NAME, dtype=args.store_dtype)
+    with ChunkEncoder(MODEL_NAME, batch_size=args.batch_size, workers=args.workers) as encoder:
+        # Only abstracts the store has never seen are encoded
+        def embed(abstracts):
+            return embedding_store.fetch_or_encode(abstracts, encoder.encode)
+        if args.incremental:
+            update_incremental(conn, embed)
+        else:
+            build_full(conn, embed)
+    logging.info(f"Embedding store: {embedding_store.hits} reused, {embedding_store.misses} encoded")
+    embedding_store.close()
+    conn.close()
 except ValueError as e:
     logging.error(f"Data validation error: {e}")
 except MemoryError as e:
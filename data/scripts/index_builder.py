@@ -0,0 +1,162 @@
+import logging
+import math
+import os
+import time
+
+import faiss
+import numpy as np
+
+from index_files import file_sha256, manifest_path, metadata_path, write_json_atomic
+
+ 
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+INDEX_TYPES = ('flat', 'ivf_flat', 'ivf_pq', 'hnsw')
+
+
+def default_nlist(n_vectors):
+    """Rule-of-thumb IVF list count, capped so every list gets enough training points."""
+    return max(1, min(int(4 * math.sqrt(n_vectors)), n_vectors // 39))
+
+
+def create_index(index_type, dimension, n_vectors, nlist=None, pq_m=16, pq_nbits=8, hnsw_m=32, ef_construction=200):
+    """Create an empty inner-product index of the requested type."""
+    if index_type == 'flat':
+        return faiss.IndexFlatIP(dimension)
+    if index_type == 'hnsw':
+        index = faiss.IndexHNSWFlat(dimension, hnsw_m, faiss.METRIC_INNER_PRODUCT)
+        index.hnsw.efConstruction = ef_construction
+        return index
+    if index_type in ('ivf_flat', 'ivf_pq'):
+        nlist = nlist or default_nlist(n_vectors)
+        quantizer = faiss.IndexFlatIP(dimension)
+        if index_type == 'ivf_flat':
+            return faiss.IndexIVFFlat(quantizer, dimension, nlist, faiss.METRIC_INNER_PRODUCT)
+        if dimension % pq_m != 0:
+            raise ValueError(f"PQ sub-quantizers ({pq_m}) must divide the vector dimension ({dimension})")
+        return faiss.IndexIVFPQ(quantizer, dimension, nlist, pq_m, pq_nbits, faiss.METRIC_INNER_PRODUCT)
+    raise ValueError(f"Unknown index type '{index_type}', expected one of {INDEX_TYPES}")
+
+
+def train_index(index, vectors, train_sample=100000, seed=42):
+    """Train the index on a random sample of the vectors if it needs training."""
+    if index.is_trained:
+        return
+    if len(vectors) > train_sample:
+        rng = np.random.default_rng(seed)
+        sample = vectors[np.sort(rng.choice(len(vectors), train_sample, replace=False))]
+    else:
+        sample = vectors
+    logging.info(f"Training index on {len(sample)} sample vectors...")
+    index.train(np.ascontiguousarray(sample, dtype=np.float32))
+
+
+def build_index(vectors, index_type='flat', train_sample=100000, ids=None, **params):
+    """Create, train and populate an index from a float32 matrix of normalized vectors.
+    
+    With ``ids`` the index is labelled with those article ids instead of row
+    numbers, so it can later be updated in place with add_vectors/remove_vectors.
+    """
+    vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+    index = create_index(index_type, vectors.shape[1], len(vectors), **params)
+    train_index(index, vectors, train_sample)
+    if ids is None:
+        index.add(vectors)
+        return index
+    if faiss.try_extract_index_ivf(index) is None:
+        # IVF indexes store ids natively; flat and HNSW need an id map around them
+        index = faiss.IndexIDMap2(index)
+    add_vectors(index, vectors, ids)
+    return index
+
+
+def build_index_from_shards(shards, index_type='flat', train_sample=100000, seed=42, **params):
+    """Build an article-id labelled index from (ids, vectors) shards without loading them all at once.
+    
+    Shards are typically memory-mapped, so only the training sample and one
+    shard at a time are resident besides the index itself.
+    """
+    shards = [(ids, vectors) for ids, vectors in shards if len(ids)]
+    if not shards:
+        raise ValueError("No vectors to index")
+    n_vectors = sum(len(ids) for ids, _ in shards)
+    index = create_index(index_type, shards[0][1].shape[1], n_vectors, **params)
+    if not index.is_trained:
+        # Sample training vectors across all shards by global position
+        rng = np.random.default_rng(seed)
+        positions = np.sort(rng.choice(n_vectors, min(train_sample, n_vectors), replace=False))
+        offsets = np.cumsum([0] + [len(ids) for ids, _ in shards])
+        sample = np.vstack([vectors[positions[(positions >= start) & (positions < end)] - start]
+                            for (_, vectors), start, end in zip(shards, offsets[:-1], offsets[1:])])
+        train_index(index, sample, train_sample)
+    if faiss.try_extract_index_ivf(index) is None:
+        index = faiss.IndexIDMap2(index)
+    for ids, vectors in shards:
+        add_vectors(index, vectors, ids)
+    return index
+
+
+def add_vectors(index, vectors, ids):
+    """Append vectors labelled with article ids to an id-mapped index."""
+    index.add_with_ids(np.ascontiguousarray(vectors, dtype=np.float32), np.ascontiguousarray(ids, dtype=np.int64))
+
+
+def remove_vectors(index, ids):
+    """Remove article ids from an id-mapped index; returns how many vectors were removed.
+    
+    HNSW graphs do not support removal, so callers must rebuild those indexes instead.
+    """
+    ids = np.ascontiguousarray(ids, dtype=np.int64)
+    if len(ids) == 0:
+        return 0
+    return index.remove_ids(faiss.IDSelectorBatch(ids))
+
+
+def write_index_metadata(index_path, index, index_type, model_name, build_params, search_params, id_mapped=False):
+    """Store how the index was built next to it, including default search parameters.
+    
+    ``id_mapped`` records that the index labels are article ids rather than row numbers.
+    """
+    metadata = {
+        'index_type': index_type,
+        'faiss_class': type(faiss.downcast_index(index)).__name__,
+        'metric': 'inner_product',
+        'dimension': index.d,
+        'ntotal': int(index.ntotal),
+        'id_mapped': id_mapped,
+        'model_name': model_name,
+        'build_params': build_params,
+        'search_params': search_params,
+        'created_at': time.strftime('%Y-%m-%dT%H:%M:%S'),
+    }
+    # A running API may be reading the current metadata
+    write_json_atomic(metadata_path(index_path), metadata)
+    return metadata
+
+
+def write_index_manifest(index_path, ids_path, ntotal):
+    """Publish a new index version once the index, id map and metadata are all written.
+    
+    The manifest records a checksum of each file and the vector count, and is
+    renamed into place last, so a reader that sees it can verify it loaded one
+    consistent version rather than a mix of old and new files.
+    """
+    directory = os.path.dirname(os.path.abspath(index_path))
+    files = {}
+    for role, path in (('index', index_path), ('ids', ids_path), ('metadata', metadata_path(index_path))):
+        files[role] = {
+            'path': os.path.relpath(os.path.abspath(path), directory),
+            'sha256': file_sha256(path),
+            'size': os.path.getsize(path),
+        }
+    created_at = time.strftime('%Y-%m-%dT%H:%M:%S')
+    manifest = {
+        'version': f"{created_at.replace('-', '').replace(':', '')}-{files['index']['sha256'][:12]}",
+        'ntotal': int(ntotal),
+        'files': files,
+        'created_at': created_at,
+    }
+    write_json_atomic(manifest_path(index_path), manifest)
+    return manifest
+
+
@@ -0,0 +1,54 @@
+"""
+Names and readers of the files published next to a FAISS index: the build
+metadata and the version manifest.
+
+Shared by the index builder, which writes them, and the API
+(backend/services/vector_index.py), which reads them, so the two cannot
+disagree about where the files are or what they contain.
+"""
+import hashlib
+import json
+import os
+
+
+def metadata_path(index_path):
+    """Path of the build metadata written next to the index."""
+    return os.path.splitext(index_path)[0] + '.meta.json'
+
+
+def manifest_path(index_path):
+    """Path of the version manifest published next to the index."""
+    return os.path.splitext(index_path)[0] + '.manifest.json'
+
+
+def file_sha256(path, chunk_size=1 << 20):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(chunk_size), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def write_json_atomic(path, data):
+    """Write a JSON file under a temporary name and rename it into place, so readers never see it half written."""
+    with open(path + '.tmp', 'w') as f:
+        json.dump(data, f, indent=2)
+    os.replace(path + '.tmp', path)
+
+
+def load_index_metadata(index_path):
+    """Read the index build metadata; indexes built before it existed are plain flat indexes."""
+    path = metadata_path(index_path)
+    if not os.path.exists(path):
+        return {'index_type': 'flat', 'search_params': {}}
+    with open(path) as f:
+        return json.load(f)
+
+
+def load_index_manifest(index_path):
+    """Read the index version manifest, or None for indexes published without one."""
+    path = manifest_path(index_path)
+    if not os.path.exists(path):
+        return None
+    with open(path) as f:
+        return json.load(f)
@@ -0,0 +1,99 @@
+import sqlite3
+import threading
+import hashlib
+import json
+import time
+import logging
+
+ 
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+
+def normalize_query(user_query):
+    """Normalize a user query so trivially different spellings share a cache entry."""
+    return " ".join((user_query or "").lower().split())
+
+
+class LLMResponseCache:
+    """Disk-backed cache of parsed LLM responses with TTL and size-bounded LRU eviction.
+
+    Entries live in a small SQLite database so they survive restarts and are
+    shared by every API worker on the machine. ``clock`` returns the current
+    time in seconds (``time.time`` by default, since entries outlive the process).
+    """
+
+    def __init__(self, path, max_entries=10000, ttl_seconds=7 * 24 * 3600, clock=time.time):
+        self.path = path
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.clock = clock
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=5)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA synchronous=NORMAL')
+        self._conn.execute('''CREATE TABLE IF NOT EXISTS llm_cache
+                              (key TEXT PRIMARY KEY, response TEXT, created_at REAL, last_used REAL)''')
+        self._conn.execute('CREATE INDEX IF NOT EXISTS idx_llm_cache_last_used ON llm_cache (last_used)')
+        self._conn.commit()
+
+    @staticmethod
+    def make_key(*parts):
+        """Hash the model settings and normalized query into a cache key."""
+        return hashlib.sha256(json.dumps(parts, sort_keys=True).encode('utf-8')).hexdigest()
+
+    def get(self, key):
+        """Return the cached response, or None when missing or expired."""
+        now = self.clock()
+        with self._lock:
+            try:
+                row = self._conn.execute('SELECT response, created_at FROM llm_cache WHERE key = ?', (key,)).fetchone()
+                if row is None or now - row[1] > self.ttl_seconds:
+                    if row is not None:
+                        self._conn.execute('DELETE FROM llm_cache WHERE key = ?', (key,))
+                        self._conn.commit()
+                    self._misses += 1
+                    return None
+                self._conn.execute('UPDATE llm_cache SET last_used = ? WHERE key = ?', (now, key))
+                self._conn.commit()
+                self._hits += 1
+                return json.loads(row[0])
+            except (sqlite3.Error, json.JSONDecodeError) as e:
+                logging.warning(f"LLM cache read failed: {e}")
+                self._misses += 1
+                return None
+
+    def set(self, key, response):
+        now = self.clock()
+        with self._lock:
+            try:
+                self._conn.execute('INSERT OR REPLACE INTO llm_cache (key, response, created_at, last_used) VALUES (?, ?, ?, ?)',
+                                   (key, json.dumps(response), now, now))
+                self._conn.execute('DELETE FROM llm_cache WHERE created_at < ?', (now - self.ttl_seconds,))
+                self._conn.execute('''DELETE FROM llm_cache WHERE key IN
+                                      (SELECT key FROM llm_cache ORDER BY last_used DESC LIMIT -1 OFFSET ?)''',
+                                   (self.max_entries,))
+                self._conn.commit()
+            except sqlite3.Error as e:
+                logging.warning(f"LLM cache write failed: {e}")
+
+    def stats(self):
+        with self._lock:
+            lookups = self._hits + self._misses
+            try:
+                entries = self._conn.execute('SELECT COUNT(*) FROM llm_cache').fetchone()[0]
+            except sqlite3.Error:
+                entries = None
+            return {
+                "entries": entries,
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_rate": round(self._hits / lookups, 4) if lookups else 0.0,
+            }
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
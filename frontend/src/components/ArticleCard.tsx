@@ -1,7 +1,8 @@
-import React from 'react';
+import React, { useState } from 'react';
 import { motion } from 'framer-motion';
 import { Calendar, User, Tag, FileText, ExternalLink } from 'lucide-react';
 import { Article } from '../types';
+import { getArticle } from '../services/api';
 
 interface ArticleCardProps {
   article: Article;
@@ -9,6 +10,9 @@ interface ArticleCardProps {
 }
 
 const ArticleCard: React.FC<ArticleCardProps> = ({ article, index }) => {
+  const [abstract, setAbstract] = useState<string | undefined>(undefined);
+  const [expanded, setExpanded] = useState(false);
+
   const formatDate = (dateString: string) => {
     return new Date(dateString).toLocaleDateString('en-US', {
       year: 'numeric',
@@ -26,6 +30,22 @@ const ArticleCard: React.FC<ArticleCardProps> = ({ article, index }) => {
     return categories.split(',').map(cat => cat.trim()).slice(0, 3);
   };
 
+  // Search results carry a snippet; the full abstract is fetched the first time the card is expanded
+  const toggleAbstract = async () => {
+    if (!expanded && abstract === undefined && article.abstract === undefined) {
+      try {
+        setAbstract((await getArticle(article.id)).abstract);
+      } catch (error) {
+        console.error('Failed to load abstract:', error);
+        return;
+      }
+    }
+    setExpanded(!expanded);
+  };
+
+  const fullAbstract = abstract ?? article.abstract;
+  const summary = article.snippet ?? truncateText(article.abstract || '', 300);
+
   return (
     <motion.div
       initial={{ opacity: 0, y: 20 }}
@@ -33,6 +53,7 @@ const ArticleCard: React.FC<ArticleCardProps> = ({ article, index }) => {
       transition={{ delay: index * 0.1, duration: 0.5 }}
       whileHover={{ y: -4 }}
       className="card group cursor-pointer"
+      onClick={toggleAbstract}
     >
       <div className="space-y-4">
         {/* Header */}
@@ -49,7 +70,7 @@ const ArticleCard: React.FC<ArticleCardProps> = ({ article, index }) => {
         <div className="flex gap-3">
           <FileText className="w-5 h-5 text-muted mt-1 flex-shrink-0" />
           <p className="text-secondary leading-relaxed">
-            {truncateText(article.abstract, 300)}
+            {expanded && fullAbstract ? fullAbstract : summary}
           </p>
         </div>
 
@@ -2,9 +2,12 @@ import React, { useState, useEffect } from 'react';
 import { motion, AnimatePresence } from 'framer-motion';
 import { Search, Brain, Filter, Loader, Sparkles, ChevronDown } from 'lucide-react';
 import { searchArticles, getYears } from '../services/api';
-import { SearchRequest, Article } from '../types';
+import { SearchRequest, Article, ArticleField } from '../types';
 import ArticleCard from './ArticleCard';
 
+// The result cards show a snippet; the full abstract is loaded when a card is expanded
+const LIST_FIELDS: ArticleField[] = ['id', 'title', 'published', 'categories', 'authors', 'score', 'snippet'];
+
 const SearchInterface: React.FC = () => {
   const [query, setQuery] = useState('');
   const [filters, setFilters] = useState({
@@ -41,6 +44,7 @@ const SearchInterface: React.FC = () => {
       const request: SearchRequest = {
         query,
         search_type: searchType,
+        fields: LIST_FIELDS,
         ...filters
       };
 
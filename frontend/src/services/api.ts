@@ -1,5 +1,5 @@
 import axios from 'axios';
-import { SearchRequest, SearchResponse, Stats } from '../types';
+import { Article, SearchRequest, SearchResponse, Stats } from '../types';
 
 const API_BASE_URL = 'http://localhost:8000/api/v1';
 
@@ -22,6 +22,18 @@ export const searchArticles = async (request: SearchRequest): Promise<SearchResp
   }
 };
 
+export const getArticle = async (id: number): Promise<Article> => {
+  try {
+    const response = await api.get(`/articles/${id}`);
+    return response.data as Article;
+  } catch (error: any) {
+    if (error.response) {
+      throw new Error(`Failed to fetch article: ${error.response.data?.detail || error.message}`);
+    }
+    throw new Error('Article request failed');
+  }
+};
+
 export const getStats = async (): Promise<Stats> => {
   try {
     const response = await api.get('/stats');
@@ -1,12 +1,17 @@
 export interface Article {
   id: number;
   title: string;
-  abstract: string;
+  abstract?: string;
   published: string;
   categories: string;
   authors?: string;
+  score?: number | null;
+  snippet?: string;
 }
 
+export type ArticleField =
+  'id' | 'title' | 'abstract' | 'published' | 'categories' | 'authors' | 'score' | 'snippet';
+
 export interface SearchRequest {
   query: string;
   year_filter?: string;
@@ -16,6 +21,9 @@ export interface SearchRequest {
   abstract_filter?: string;
   search_type: 'manual' | 'ai';
   limit?: number;
+  offset?: number;
+  cursor?: string;
+  fields?: ArticleField[];
 }
 
 export interface SearchResponse {
@@ -23,6 +31,11 @@ export interface SearchResponse {
   total_count: number;
   search_type: string;
   explanation?: string;
+  candidates?: number;
+  offset?: number;
+  next_cursor?: string | null;
+  warming?: boolean;
+  degraded?: boolean;
 }
 
 export interface Stats {
@@ -30,4 +43,6 @@ export interface Stats {
   latest_year: string;
   year_span: number;
   papers_by_year: Record<string, number>;
+  papers_by_category?: Record<string, number>;
+  top_authors?: { name: string; papers: number }[];
 }
\ No newline at end of file